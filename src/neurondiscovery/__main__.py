@@ -8,31 +8,163 @@ that invokes this script."""
 # mdsa_configs = get_algo_configs(algo_spec=mdsa.__dict__)
 # verify_algo_configs(algo_name="MDSA", algo_configs=mdsa_configs)
 
-from typing import Dict, List, Union
-
-# Parse command line interface arguments to determine what this script does.
-# args = parse_cli_args()
-from neurondiscovery.neuron_types.Neuron_type import Neuron_type
-from neurondiscovery.neuron_types.sought_types import get_next_round_type
-from neurondiscovery.search.manage_search import (
-    find_changing_neurons,
-    find_non_changing_neurons,
-)
-
-output_dir: str = "found_neurons"
-
-# neuron_type:Neuron_type=get_selector_type(output_dir=output_dir)
-neuron_type: Neuron_type = get_next_round_type(output_dir=output_dir)
-
-
-static_neurons: List[Dict[str, Union[float, int]]] = find_non_changing_neurons(
-    neuron_type=neuron_type, overwrite=True, verbose=True
-)
-found_neurons: List[Dict[str, Union[int, float, str]]] = find_changing_neurons(
-    max_redundancy=4,
-    neuron_type=neuron_type,
-    print_verified_neurons=True,
-    static_neurons=static_neurons,
-    verify_shift=True,
-    verbose=False,
-)
+import argparse
+from typing import Dict, List, Optional, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.arg_parser import parse_cli_args
+from neurondiscovery.type_checks import set_hot_path_type_checks
+
+
+@typechecked
+def main() -> None:
+    """Runs the neuron search that is specified by the cli arguments."""
+    # Parse command line interface arguments to determine what this script
+    # does.
+    args: argparse.Namespace = parse_cli_args()
+    if args.no_hot_path_typechecks:
+        set_hot_path_type_checks(enabled=False)
+
+    # The search modules are imported after the hot path type checks are
+    # set, because their decorators are applied on import.
+    # pylint: disable=C0415
+    from neurondiscovery.grid_settings.Fixed_point_format import (
+        Fixed_point_format,
+    )
+    from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+    from neurondiscovery.neuron_types.sought_types import (
+        get_next_round_type,
+        get_selector_type,
+    )
+    from neurondiscovery.result_store import Result_store
+    from neurondiscovery.search.manage_search import (
+        create_neuron_type_archive,
+        find_changing_neurons,
+        find_multi_target_non_changing_neurons,
+        find_non_changing_neurons,
+    )
+    from neurondiscovery.search.search_options import Search_options
+    from neurondiscovery.search.shards import merge_shards
+    from neurondiscovery.search.spike_archive import Spike_archive
+
+    output_dir: str = "found_neurons"
+
+    # neuron_type:Neuron_type=get_selector_type(output_dir=output_dir)
+    neuron_type: Neuron_type = get_next_round_type(output_dir=output_dir)
+
+    if args.command == "merge":
+        merged_neurons: List[Dict[str, Union[float, int, str]]] = merge_shards(
+            neuron_type=neuron_type
+        )
+        print(
+            f"Merged {len(merged_neurons)} static neurons into:"
+            + f"{neuron_type.type_dir}/static.jsonl"
+        )
+        return
+    if args.command == "archive":
+        archive: Spike_archive = create_neuron_type_archive(
+            neuron_type=neuron_type,
+            archive_dir=args.archive,
+            nr_of_timesteps=args.archive_timesteps,
+            extremes=args.archive_extremes,
+            progress=args.progress,
+        )
+        print(
+            f"Archived {archive.nr_of_timesteps} timesteps of the grid of:"
+            + f"{neuron_type.name} in:{args.archive}"
+        )
+        return
+
+    store: Optional[Result_store] = (
+        None if args.store is None else Result_store(filepath=args.store)
+    )
+    try:
+        if args.command == "import" and store is not None:
+            print(
+                f"Imported {store.import_json_files(neuron_type=neuron_type)}"
+                + f" neurons of:{neuron_type.name} into:{args.store}"
+            )
+            return
+        if args.multi_target:
+            neuron_types: List[Neuron_type] = [
+                get_selector_type(output_dir=output_dir),
+                neuron_type,
+            ]
+            static_neurons_per_type: Dict[
+                str, List[Dict[str, Union[float, int]]]
+            ] = find_multi_target_non_changing_neurons(
+                neuron_types=neuron_types,
+                verbose=True,
+                progress=args.progress,
+                store=store,
+            )
+            for some_type in neuron_types:
+                find_changing_neurons(
+                    max_redundancy=4,
+                    neuron_type=some_type,
+                    print_verified_neurons=True,
+                    static_neurons=static_neurons_per_type[some_type.name],
+                    verify_shift=True,
+                    verbose=False,
+                    progress=args.progress,
+                    store=store,
+                )
+            return
+        static_neurons: List[
+            Dict[str, Union[float, int]]
+        ] = find_non_changing_neurons(
+            neuron_type=neuron_type,
+            overwrite=True,
+            verbose=True,
+            options=Search_options(
+                engine=args.engine,
+                workers=args.workers,
+                validation=args.validation,
+                detect_cycles=args.detect_cycles,
+                fixed_point_format=Fixed_point_format(
+                    bit_widths=args.fixed_point_bits,
+                    fraction_bits=args.fraction_bits,
+                )
+                if args.engine == "fixed_point"
+                else None,
+                canonicalize=args.canonicalize,
+            ),
+            resume=args.resume,
+            export_metrics=args.metrics,
+            trace_allocations=args.trace_allocations,
+            refine_depth=args.refine_depth,
+            refine_boundary_only=args.refine_boundary,
+            shard=args.shard,
+            progress=args.progress,
+            store=store,
+            archive=None
+            if args.archive is None
+            else Spike_archive(archive_dir=args.archive),
+        )
+        if args.shard is not None:
+            # The changing neuron search needs the static neurons of all
+            # shards.
+            print(
+                f"Stored shard:{args.shard[0]}/{args.shard[1]}, run merge "
+                + "once all shards are complete."
+            )
+            return
+        find_changing_neurons(
+            max_redundancy=4,
+            neuron_type=neuron_type,
+            print_verified_neurons=True,
+            static_neurons=static_neurons,
+            verify_shift=True,
+            verbose=False,
+            resume=args.resume,
+            progress=args.progress,
+            store=store,
+        )
+    finally:
+        if store is not None:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Parses the command line interface arguments of this project."""
+
+import argparse
+from typing import Dict, Tuple
+
+from typeguard import typechecked
+
+
+@typechecked
+def parse_cli_args() -> argparse.Namespace:
+    """Reads the command line arguments and converts them into Python
+    arguments."""
+    parser = argparse.ArgumentParser(
+        description="Finds neurons of a specific type using a grid search."
+    )
+
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["search", "merge", "import", "archive"],
+        default="search",
+        help="Search for neurons, merge the static neurons of all shards "
+        + "into static.jsonl, import the static.jsonl and changing.json "
+        + "files into the result store, or simulate the whole grid once "
+        + "into a spike archive.",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Nr of processes that simulate the grid chunks in parallel, 1 "
+        + "by default.",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        choices=["networkx", "numpy", "tree", "fixed_point"],
+        default=None,
+        help="Simulate one networkx snn per candidate (the default), all "
+        + "candidates of a chunk at once with numpy, shared trajectory "
+        + "prefixes once with tree, or all candidates of a chunk at once in "
+        + "integer arithmetic with fixed_point.",
+    )
+    parser.add_argument(
+        "--fixed-point-bits",
+        type=get_bit_widths_arg,
+        default=None,
+        help="Bit widths of the fixed_point engine, e.g. u=16,v=16,vth=16, "
+        + "by default u=24,v=24,du=12,dv=12,vth=24.",
+    )
+    parser.add_argument(
+        "--fraction-bits",
+        type=int,
+        default=8,
+        help="Nr of fraction bits of u, v, vth, bias, weight and a_in in the "
+        + "fixed_point engine.",
+    )
+    parser.add_argument(
+        "-v",
+        "--validation",
+        choices=["every_step", "once", "sample"],
+        default="once",
+        help="Verify the snn specification of each networkx candidate at "
+        + "every timestep, once after its creation, or at every timestep "
+        + "for a sample of the candidates.",
+    )
+    parser.add_argument(
+        "-r",
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Continue an interrupted search from its checkpoint.",
+    )
+    parser.add_argument(
+        "-m",
+        "--metrics",
+        action="store_true",
+        default=False,
+        help="Export the per-stage time and the rejected candidates of the "
+        + "static search as JSON and as a Prometheus textfile.",
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        default=False,
+        help="Also record the allocation peak per stage, with tracemalloc.",
+    )
+    parser.add_argument(
+        "-d",
+        "--refine-depth",
+        type=int,
+        default=None,
+        help="Search the grid coarse-to-fine with the numpy engine: start "
+        + "from every 2**depth-th du, dv, bias and vth value, and halve the "
+        + "cells around the hits this many times. Only du, dv, bias and vth "
+        + "are refined, all weight and a_in values are simulated.",
+    )
+    parser.add_argument(
+        "-s",
+        "--shard",
+        type=get_shard_arg,
+        default=None,
+        help="Only search shard i of N (0<=i<N) of the static grid, e.g. 0/4, "
+        + "and store it in static.shard-i.jsonl.",
+    )
+    parser.add_argument(
+        "-p",
+        "--progress",
+        choices=["bar", "log", "silent"],
+        default="bar",
+        help="Draw a progress bar, write the progress and events as JSON "
+        + "lines to stderr, or report nothing.",
+    )
+    parser.add_argument(
+        "--no-hot-path-typechecks",
+        action="store_true",
+        default=False,
+        help="Skip the runtime type checks of the functions that are called "
+        + "per candidate or per timestep, for production runs.",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="SQLite file in which the found neurons of all neuron types and "
+        + "runs are stored, e.g. found_neurons/results.db.",
+    )
+    parser.add_argument(
+        "--multi-target",
+        action="store_true",
+        default=False,
+        help="Search the static neurons of the selector and next_round types "
+        + "in one pass over their shared grid, with the numpy engine.",
+    )
+    parser.add_argument(
+        "-a",
+        "--archive",
+        default=None,
+        help="Directory of a spike archive, which the archive command creates "
+        + "and which the static search scans instead of simulating.",
+    )
+    parser.add_argument(
+        "--archive-timesteps",
+        type=int,
+        default=None,
+        help="Nr of timesteps of the archived spike trains, by default the "
+        + "length of the expected spikes.",
+    )
+    parser.add_argument(
+        "--archive-extremes",
+        action="store_true",
+        default=False,
+        help="Also archive the extremes of u and v, to check other neuron "
+        + "property bounds on them.",
+    )
+    parser.add_argument(
+        "--detect-cycles",
+        action="store_true",
+        default=False,
+        help="Stop simulating a candidate of the static search once its "
+        + "state repeats, and store the period of the periodic neurons.",
+    )
+    parser.add_argument(
+        "--canonicalize",
+        action="store_true",
+        default=False,
+        help="Simulate one candidate per group of equivalent candidates of "
+        + "the static search, and copy its outcome to the others. "
+        + "Candidates are equivalent if they have equal properties, or only "
+        + "differ in an a_in or weight that is never used.",
+    )
+    parser.add_argument(
+        "--refine-boundary",
+        action="store_true",
+        default=False,
+        help="Only refine the cells at the boundary between hits and misses.",
+    )
+
+    args = parser.parse_args()
+    if args.multi_target and (
+        args.engine is not None or args.workers is not None
+    ):
+        parser.error(
+            "Error, a multi-target search always uses the numpy engine in "
+            + "one process, so it does not take --engine or --workers."
+        )
+    # The defaults are set after the check, to detect whether they were
+    # passed.
+    if args.engine is None:
+        args.engine = "networkx"
+    if args.workers is None:
+        args.workers = 1
+    if args.workers < 1:
+        parser.error(
+            f"Error, workers should be positive, found:{args.workers}"
+        )
+    if args.trace_allocations and not args.metrics:
+        parser.error("Error, --trace-allocations requires --metrics.")
+    if args.refine_depth is not None:
+        if args.refine_depth < 0:
+            parser.error(
+                "Error, refine depth should be non-negative, found:"
+                + f"{args.refine_depth}"
+            )
+        if args.resume:
+            parser.error("Error, a refinement search can not be resumed.")
+        if args.shard is not None:
+            parser.error("Error, a refinement search can not be sharded.")
+    elif args.refine_boundary:
+        parser.error("Error, --refine-boundary requires --refine-depth.")
+    if args.multi_target and (
+        args.resume or args.shard is not None or args.refine_depth is not None
+    ):
+        parser.error(
+            "Error, a multi-target search can not be resumed, sharded or "
+            + "refined."
+        )
+    if args.command == "import" and args.store is None:
+        parser.error("Error, the import command requires --store.")
+    if args.command == "archive" and args.archive is None:
+        parser.error("Error, the archive command requires --archive.")
+    if (
+        args.command == "search"
+        and args.archive is not None
+        and (
+            args.multi_target
+            or args.shard is not None
+            or args.refine_depth is not None
+        )
+    ):
+        parser.error(
+            "Error, an archive search can not be multi-target, sharded or "
+            + "refined."
+        )
+    if args.engine != "fixed_point" and (
+        args.fixed_point_bits is not None or args.fraction_bits != 8
+    ):
+        parser.error(
+            "Error, --fixed-point-bits and --fraction-bits require the "
+            + "fixed_point engine."
+        )
+    if args.engine == "fixed_point" and (
+        args.archive is not None or args.refine_depth is not None
+    ):
+        parser.error(
+            "Error, the fixed_point engine can not be combined with an "
+            + "archive or refinement search."
+        )
+    if args.detect_cycles and (
+        args.engine == "tree"
+        or args.multi_target
+        or args.archive is not None
+        or args.refine_depth is not None
+    ):
+        parser.error(
+            "Error, --detect-cycles requires the networkx, numpy or "
+            + "fixed_point engine, "
+            + "and can not be combined with a multi-target, archive or "
+            + "refinement search."
+        )
+    if args.canonicalize and (
+        args.multi_target
+        or args.archive is not None
+        or args.refine_depth is not None
+    ):
+        parser.error(
+            "Error, --canonicalize can not be combined with a multi-target, "
+            + "archive or refinement search."
+        )
+    return args
+
+
+@typechecked
+def get_bit_widths_arg(bit_widths: str) -> Dict[str, int]:
+    """Converts a u=16,v=16 bit widths argument into {"u": 16, "v": 16}."""
+    try:
+        return {
+            attr: int(bit_width)
+            for attr, bit_width in (
+                part.split("=") for part in bit_widths.split(",")
+            )
+        }
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(
+            f"Error, expected bit widths as u=16,v=16, found:{bit_widths}"
+        ) from error
+
+
+@typechecked
+def get_shard_arg(shard: str) -> Tuple[int, int]:
+    """Converts an i/N shard argument into (i, N)."""
+    try:
+        index, nr_of_shards = (int(part) for part in shard.split("/"))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(
+            f"Error, expected a shard as i/N, found:{shard}"
+        ) from error
+    if not 0 <= index < nr_of_shards:
+        raise argparse.ArgumentTypeError(
+            f"Error, shard i/N requires 0<=i<N, found:{shard}"
+        )
+    return index, nr_of_shards
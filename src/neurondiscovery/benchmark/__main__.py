@@ -0,0 +1,60 @@
+"""Entry point of the benchmark suite.
+
+Example usage:
+python -m neurondiscovery.benchmark run --output baseline.json
+python -m neurondiscovery.benchmark compare baseline.json current.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from typeguard import typechecked
+
+from neurondiscovery.benchmark.arg_parser import parse_benchmark_args
+from neurondiscovery.benchmark.compare_benchmarks import compare_benchmarks
+from neurondiscovery.benchmark.run_benchmarks import run_benchmarks
+
+
+@typechecked
+def main() -> None:
+    """Runs or compares the benchmarks, and exits with 1 if the compared
+    results regressed."""
+    args: argparse.Namespace = parse_benchmark_args()
+    if args.command == "run":
+        results: Dict[str, Any] = run_benchmarks(
+            engine=args.engine,
+            grid_names=args.grids,
+            nr_of_values=args.nr_of_values,
+            type_names=args.types,
+            type_check_speedup=args.type_check_speedup,
+        )
+        with open(args.output, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+        for case_name, speedups in results.get(
+            "type_check_speedups", {}
+        ).items():
+            for stage, speedup in speedups.items():
+                print(
+                    f"Speedup without hot path type checks: {case_name}/"
+                    + f"{stage}: {speedup:.2f}x"
+                )
+        print(f"Stored the benchmark results in:{args.output}")
+    else:
+        with open(args.baseline, encoding="utf-8") as json_file:
+            baseline: Dict[str, Any] = json.load(json_file)
+        with open(args.current, encoding="utf-8") as json_file:
+            current: Dict[str, Any] = json.load(json_file)
+        regressions: List[str] = compare_benchmarks(
+            baseline=baseline, current=current, threshold=args.threshold
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Parses the command line interface arguments of the benchmark suite."""
+
+import argparse
+
+from typeguard import typechecked
+
+
+@typechecked
+def parse_benchmark_args() -> argparse.Namespace:
+    """Reads the command line arguments of the run and compare commands and
+    converts them into Python arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput of the neuron discovery stages."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run the benchmarks and store the results as JSON."
+    )
+    run_parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="JSON file in which the benchmark results are stored.",
+    )
+    run_parser.add_argument(
+        "-e",
+        "--engine",
+        choices=["networkx", "numpy", "tree"],
+        default="networkx",
+        help="Engine of the static neuron search.",
+    )
+    run_parser.add_argument(
+        "-g",
+        "--grids",
+        nargs="+",
+        choices=["Discovery", "DiscoveryRanges", "Specific_range"],
+        default=["Discovery", "DiscoveryRanges", "Specific_range"],
+        help="Grid specifications of which a slice is searched.",
+    )
+    run_parser.add_argument(
+        "-t",
+        "--types",
+        nargs="+",
+        choices=["selector", "next_round"],
+        default=["selector", "next_round"],
+        help="Neuron types that are searched.",
+    )
+    run_parser.add_argument(
+        "-n",
+        "--nr-of-values",
+        type=int,
+        default=4,
+        help="Max nr of values per grid property in the grid slice.",
+    )
+    run_parser.add_argument(
+        "--type-check-speedup",
+        action="store_true",
+        default=False,
+        help="Also run the cases without the hot path type checks, and "
+        + "report the speedup per stage.",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare benchmark results against a baseline."
+    )
+    compare_parser.add_argument(
+        "baseline", help="JSON file with the baseline results."
+    )
+    compare_parser.add_argument(
+        "current", help="JSON file with the current results."
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fraction by which a measurement may be worse than the baseline.",
+    )
+
+    return parser.parse_args()
@@ -0,0 +1,76 @@
+"""Compares benchmark results against a baseline, and flags the stages whose
+performance regressed beyond a threshold."""
+
+from typing import Any, Dict, List
+
+from typeguard import typechecked
+
+# The measurements that are compared, and whether higher values are better.
+compared_measurements: Dict[str, bool] = {
+    "candidates_per_s": True,
+    "candidate_timesteps_per_s": True,
+    "wall_time_s": False,
+    "peak_rss_mb": False,
+}
+
+
+@typechecked
+def compare_benchmarks(
+    *,
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    """Returns a description of each measurement of the current results that
+    is more than threshold (as a fraction) worse than the baseline.
+
+    Cases and stages that did not complete in both results are not
+    compared, a stage that completed in the baseline but not in the
+    current results is a regression. Measurements that the baseline does
+    not contain, e.g. as it was created by an older version, are not
+    compared.
+    """
+    if baseline["settings"] != current["settings"]:
+        raise ValueError(
+            f"Error, the baseline settings:{baseline['settings']} differ from "
+            + f"the current settings:{current['settings']}."
+        )
+    regressions: List[str] = []
+    for case_name, stages in baseline["cases"].items():
+        for stage, measurements in stages.items():
+            if measurements["status"] != "completed":
+                continue
+            current_measurements: Dict[str, Any] = (
+                current["cases"].get(case_name, {}).get(stage, {})
+            )
+            if current_measurements.get("status") != "completed":
+                regressions.append(
+                    f"{case_name}/{stage}: did not complete, status="
+                    + f"{current_measurements.get('status')}"
+                )
+                continue
+            for measurement, higher_is_better in compared_measurements.items():
+                if measurement not in measurements:
+                    continue
+                change: float = get_relative_change(
+                    baseline_value=measurements[measurement],
+                    current_value=current_measurements[measurement],
+                )
+                if (-change if higher_is_better else change) > threshold:
+                    regressions.append(
+                        f"{case_name}/{stage}: {measurement} changed "
+                        + f"{change * 100:+.1f}% from "
+                        + f"{measurements[measurement]:.4g} to "
+                        + f"{current_measurements[measurement]:.4g}"
+                    )
+    return regressions
+
+
+@typechecked
+def get_relative_change(
+    *, baseline_value: float, current_value: float
+) -> float:
+    """Returns the change from the baseline value as a fraction of it."""
+    if baseline_value == 0:
+        return 0.0 if current_value == 0 else float("inf")
+    return (current_value - baseline_value) / baseline_value
@@ -0,0 +1,307 @@
+"""Measures the throughput of the discovery stages on fixed slices of the
+built-in grid specifications, and stores the results as a JSON baseline."""
+
+import contextlib
+import io
+import multiprocessing
+import platform
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Custom_range import Custom_range
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Explicit_ranges import DiscoveryRanges
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.grid_settings.Specific_range import Specific_range
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.neuron_types.sought_types import (
+    get_next_round_type,
+    get_selector_type,
+)
+from neurondiscovery.requirements.checker import (
+    default_max_neuron_props,
+    default_min_neuron_props,
+)
+from neurondiscovery.search.discover import get_satisfactory_neurons
+from neurondiscovery.search.find_changing_neurons import (
+    explored_properties,
+    spike_one_timestep_later_per_property,
+)
+from neurondiscovery.search.manage_search import verify_changing_neuron
+from neurondiscovery.search.search_options import Search_options
+from neurondiscovery.type_checks import child_process_hot_path_type_checks
+
+# The grid specifications and neuron types that are benchmarked.
+benchmark_grids: Dict[str, Callable[[], Discovery]] = {
+    "Discovery": Discovery,
+    "DiscoveryRanges": DiscoveryRanges,
+    "Specific_range": Specific_range,
+}
+benchmark_types: Dict[str, Callable[..., Neuron_type]] = {
+    "selector": get_selector_type,
+    "next_round": get_next_round_type,
+}
+benchmark_stages: List[str] = ["static", "changing", "verify_shift"]
+
+
+@typechecked
+def get_grid_slice(*, disco: Discovery, nr_of_values: int) -> Custom_range:
+    """Returns a grid with at most nr_of_values evenly spaced values of each
+    range of the grid specification, such that the slice does not change
+    between runs."""
+    ranges: Dict[str, List] = {}
+    for the_property, values in Parameter_grid(disco=disco).ranges.items():
+        positions: np.ndarray = np.unique(
+            np.linspace(0, len(values) - 1, min(nr_of_values, len(values)))
+            .round()
+            .astype(int)
+        )
+        ranges[f"{the_property}_range"] = [values[i] for i in positions]
+    return Custom_range(**ranges, name=f"{disco.name}_slice")
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def run_benchmark_case(
+    *,
+    engine: str,
+    grid_name: str,
+    max_redundancy: int,
+    max_static_neurons: int,
+    nr_of_values: int,
+    shift: int,
+    type_name: str,
+) -> Dict[str, Dict[str, Any]]:
+    """Runs the stages of one (grid, neuron type) case and returns their
+    measurements.
+
+    The static stage searches the grid slice, the changing stage
+    explores the first max_static_neurons static neurons, and the
+    verify_shift stage verifies the first changing neuron, if any. The
+    printed output of the stages is discarded.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        sought_type: Neuron_type = benchmark_types[type_name](
+            output_dir=output_dir
+        )
+        grid_slice: Custom_range = get_grid_slice(
+            disco=benchmark_grids[grid_name](), nr_of_values=nr_of_values
+        )
+        neuron_type: Neuron_type = Neuron_type(
+            a_in_time=sought_type.a_in_time,
+            grid_spec=grid_slice,
+            max_time=sought_type.max_time,
+            name=f"{type_name}_{grid_name}",
+            spike_input_type=sought_type.spike_input_type,
+            spike_output_type=sought_type.spike_output_type,
+            output_dir=output_dir,
+            wait_after_input=sought_type.wait_after_input,
+        )
+        nr_of_timesteps: int = len(neuron_type.expected_spikes)
+
+        static_neurons, results["static"] = measure_stage(
+            nr_of_candidates=len(Parameter_grid(disco=grid_slice)),
+            nr_of_timesteps=nr_of_timesteps,
+            stage=lambda: get_satisfactory_neurons(
+                a_in_time=neuron_type.a_in_time,
+                disco=grid_slice,
+                expected_spikes=neuron_type.expected_spikes,
+                max_neuron_props=default_max_neuron_props,
+                min_neuron_props=default_min_neuron_props,
+                verbose=False,
+                options=Search_options(engine=engine),
+            ),
+        )
+
+        explored_neurons = static_neurons[:max_static_neurons]
+        changing_neurons, results["changing"] = measure_stage(
+            nr_of_candidates=len(explored_neurons)
+            * len(explored_properties)
+            * max_redundancy,
+            nr_of_timesteps=nr_of_timesteps,
+            stage=lambda: spike_one_timestep_later_per_property(
+                neuron_dicts=explored_neurons,
+                max_redundancy=max_redundancy,
+                neuron_type=neuron_type,
+                wait_after_input=neuron_type.wait_after_input,
+            ),
+        )
+
+        if changing_neurons:
+            _, results["verify_shift"] = measure_stage(
+                nr_of_candidates=shift - 1,
+                nr_of_timesteps=nr_of_timesteps,
+                stage=lambda: verify_changing_neuron(
+                    found_neuron=changing_neurons[0],
+                    neuron_type=neuron_type,
+                    shift=shift,
+                    verbose=False,
+                ),
+            )
+        else:
+            results["verify_shift"] = {"status": "skipped"}
+    return results
+
+
+@typechecked
+def measure_stage(
+    *,
+    nr_of_candidates: int,
+    nr_of_timesteps: int,
+    stage: Callable[[], Any],
+) -> Tuple[Any, Dict[str, Any]]:
+    """Runs a stage and returns its output and measurements.
+
+    The candidate-timesteps/sec count all nr_of_timesteps of each
+    candidate, also when a candidate is rejected before the end of the
+    spike pattern, so they measure how fast the grid is covered, not how
+    many timesteps are simulated. The peak RSS is the peak of the
+    benchmark process up to the end of the stage. A stage that raises an
+    exception or exits is reported as failed, without throughput.
+    """
+    output: Any = []
+    status: str = "completed"
+    start: float = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = stage()
+    except (Exception, SystemExit) as error:  # pylint: disable=W0703
+        status = f"failed: {type(error).__name__}: {error}"
+    wall_time: float = time.perf_counter() - start
+    completed: bool = status == "completed"
+    return output, {
+        "status": status,
+        "wall_time_s": wall_time,
+        "candidates": nr_of_candidates,
+        "candidates_per_s": nr_of_candidates / wall_time
+        if completed
+        else None,
+        "candidate_timesteps_per_s": nr_of_candidates
+        * nr_of_timesteps
+        / wall_time
+        if completed
+        else None,
+        # ru_maxrss is in kilobytes on Linux.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / 1024,
+        "nr_found": len(output)
+        if completed and isinstance(output, list)
+        else None,
+    }
+
+
+# pylint: disable=R0913
+@typechecked
+def run_benchmarks(
+    *,
+    engine: str,
+    grid_names: List[str],
+    max_redundancy: int = 2,
+    max_static_neurons: int = 20,
+    nr_of_values: int = 4,
+    shift: int = 3,
+    type_names: List[str],
+    type_check_speedup: bool = False,
+) -> Dict[str, Any]:
+    """Runs each (grid, neuron type) case and returns the results with the
+    settings that produced them.
+
+    With type_check_speedup, the cases are run again without the hot
+    path type checks, and the speedup of each completed stage is
+    returned as the ratio of the wall times with and without them.
+    """
+    settings: Dict[str, Any] = {
+        "engine": engine,
+        "max_redundancy": max_redundancy,
+        "max_static_neurons": max_static_neurons,
+        "nr_of_values": nr_of_values,
+        "shift": shift,
+    }
+    cases: Dict[str, Dict[str, Dict[str, Any]]] = run_benchmark_cases(
+        grid_names=grid_names,
+        hot_path_type_checks_enabled=True,
+        settings=settings,
+        type_names=type_names,
+    )
+    results: Dict[str, Any] = {
+        "settings": settings,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": cases,
+    }
+    if type_check_speedup:
+        results["type_check_speedups"] = get_type_check_speedups(
+            checked_cases=cases,
+            unchecked_cases=run_benchmark_cases(
+                grid_names=grid_names,
+                hot_path_type_checks_enabled=False,
+                settings=settings,
+                type_names=type_names,
+            ),
+        )
+    return results
+
+
+@typechecked
+def run_benchmark_cases(
+    *,
+    grid_names: List[str],
+    hot_path_type_checks_enabled: bool,
+    settings: Dict[str, Any],
+    type_names: List[str],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Runs each (grid, neuron type) case in a freshly spawned process, such
+    that the peak RSS of a case does not include earlier cases, and the
+    search modules are imported with the hot path type checks enabled or
+    disabled."""
+    cases: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for grid_name in grid_names:
+        for type_name in type_names:
+            with child_process_hot_path_type_checks(
+                enabled=hot_path_type_checks_enabled
+            ), ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                cases[f"{type_name}/{grid_name}"] = executor.submit(
+                    run_benchmark_case,
+                    grid_name=grid_name,
+                    type_name=type_name,
+                    **settings,
+                ).result()
+            print(
+                f"Benchmarked:{type_name}/{grid_name}, hot path type checks:"
+                + f"{hot_path_type_checks_enabled}"
+            )
+    return cases
+
+
+@typechecked
+def get_type_check_speedups(
+    *,
+    checked_cases: Dict[str, Dict[str, Dict[str, Any]]],
+    unchecked_cases: Dict[str, Dict[str, Dict[str, Any]]],
+) -> Dict[str, Dict[str, float]]:
+    """Returns the wall time with the hot path type checks divided by the
+    wall time without them, per stage that completed in both runs."""
+    speedups: Dict[str, Dict[str, float]] = {}
+    for case_name, stages in checked_cases.items():
+        speedups[case_name] = {
+            stage: measurements["wall_time_s"]
+            / unchecked_cases[case_name][stage]["wall_time_s"]
+            for stage, measurements in stages.items()
+            if measurements["status"] == "completed"
+            and unchecked_cases[case_name][stage]["status"] == "completed"
+        }
+    return speedups
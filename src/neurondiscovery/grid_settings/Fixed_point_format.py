@@ -0,0 +1,167 @@
+"""Contains the integer representation of the neuron properties and states for
+a fixed-point simulation, like neuromorphic hardware with integer states."""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# The properties and states with a configurable bit width.
+fixed_point_properties: List[str] = ["u", "v", "du", "dv", "vth"]
+default_bit_widths: Dict[str, int] = {
+    "u": 24,
+    "v": 24,
+    "du": 12,
+    "dv": 12,
+    "vth": 24,
+}
+# The signed integer that limits the values of each quantized property.
+limiting_properties: Dict[str, str] = {
+    "a_in": "u",
+    "bias": "v",
+    "u": "u",
+    "v": "v",
+    "vth": "vth",
+    "weight": "u",
+}
+
+
+class Fixed_point_format:
+    """Bit widths of the integer u, v, du, dv and vth of a fixed-point
+    simulation.
+
+    The u, v and vth, and the bias, weight and a_in that are added to
+    them, are integers with fraction_bits fraction bits, and u, v and
+    vth are signed integers of their bit width. The bias, weight and
+    a_in should fit the width of v, u and u respectively. The bit width
+    of du and dv is their nr of fraction bits, and they lie in [-1, 1].
+    A decayed u or v is rounded to the nearest integer, and u and v
+    saturate at the limits of their bit width. The bit widths of u and
+    du, and of v and dv, sum to at most 62, such that the decay fits an
+    int64.
+
+    Example usage: Fixed_point_format(bit_widths={"u": 16, "v": 16},
+    fraction_bits=6)
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        bit_widths: Optional[Dict[str, int]] = None,
+        fraction_bits: int = 8,
+    ) -> None:
+        self.bit_widths: Dict[str, int] = {
+            **default_bit_widths,
+            **(bit_widths or {}),
+        }
+        for attr, bit_width in self.bit_widths.items():
+            if attr not in fixed_point_properties:
+                raise ValueError(
+                    f"Error, {attr} has no bit width, choose from:"
+                    + f"{fixed_point_properties}"
+                )
+            if not 0 < bit_width <= 32:
+                raise ValueError(
+                    f"Error, the bit width of {attr} should be in [1, 32], "
+                    + f"found:{bit_width}"
+                )
+        for attr in ["u", "v", "vth"]:
+            if not 0 <= fraction_bits < self.bit_widths[attr]:
+                raise ValueError(
+                    f"Error, fraction_bits={fraction_bits} should be in "
+                    + f"[0, {self.bit_widths[attr]}) for {attr}."
+                )
+        self.fraction_bits: int = fraction_bits
+
+        # The decay of u (v) multiplies it with at most two times the scale
+        # of du (dv) before it is rescaled, which should fit an int64.
+        for attr in ["u", "v"]:
+            if self.bit_widths[attr] + self.bit_widths[f"d{attr}"] + 1 > 63:
+                raise ValueError(
+                    f"Error, the bit widths of {attr} and d{attr} should sum "
+                    + "to at most 62, found:"
+                    + f"{self.bit_widths[attr] + self.bit_widths[f'd{attr}']}"
+                )
+        self.dtype: type = (
+            np.int32
+            if max(
+                self.bit_widths["u"] + self.bit_widths["du"],
+                self.bit_widths["v"] + self.bit_widths["dv"],
+            )
+            + 1
+            < 32
+            else np.int64
+        )
+
+    @typechecked
+    def get_scale(self, attr: str) -> int:
+        """Returns the integer that represents 1 for a neuron property."""
+        if attr in ["du", "dv"]:
+            return 1 << self.bit_widths[attr]
+        return 1 << self.fraction_bits
+
+    @hot_path_typechecked
+    def get_limits(self, attr: str) -> Tuple[int, int]:
+        """Returns the smallest and largest integer of a neuron property."""
+        if attr in ["du", "dv"]:
+            return -self.get_scale(attr), self.get_scale(attr)
+        bit_width: int = self.bit_widths[limiting_properties[attr]]
+        return -(1 << bit_width - 1), (1 << bit_width - 1) - 1
+
+    @typechecked
+    def quantize(self, *, attr: str, values: np.ndarray) -> np.ndarray:
+        """Returns the values of a neuron property rounded to its integer
+        representation, raises an error if a value does not fit it."""
+        quantized: np.ndarray = np.rint(
+            np.asarray(values, dtype=np.float64) * self.get_scale(attr)
+        )
+        low, high = self.get_limits(attr)
+        if quantized.size and (
+            quantized.min() < low or quantized.max() > high
+        ):
+            raise ValueError(
+                f"Error, the {attr} values in [{np.min(values)}, "
+                + f"{np.max(values)}] do not fit in the fixed-point format."
+            )
+        return quantized.astype(self.dtype)
+
+    @typechecked
+    def quantize_bounds(
+        self,
+        *,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Returns the neuron property bounds in the integer representation.
+
+        An integer is within a bound if the value it represents is, so
+        the max bounds are rounded down, and the min bounds up.
+        """
+        return (
+            {
+                attr: int(np.floor(bound * self.get_scale(attr)))
+                for attr, bound in max_neuron_props.items()
+            },
+            {
+                attr: int(np.ceil(bound * self.get_scale(attr)))
+                for attr, bound in min_neuron_props.items()
+            },
+        )
+
+    @hot_path_typechecked
+    def decay(
+        self, *, attr: str, decay: np.ndarray, values: np.ndarray
+    ) -> np.ndarray:
+        """Returns the u or v values multiplied with their integer decay
+        factor, scale-du or scale-dv, rounded to the nearest integer."""
+        shift: int = self.bit_widths[f"d{attr}"]
+        return (values * decay + (1 << shift - 1)) >> shift
+
+    @hot_path_typechecked
+    def saturate(self, *, attr: str, values: np.ndarray) -> np.ndarray:
+        """Returns the u or v values clipped to the limits of their bit
+        width."""
+        low, high = self.get_limits(attr)
+        return np.clip(values, low, high)
@@ -0,0 +1,144 @@
+"""Contains a lazy, random-access view on the candidate neurons of a
+Discovery specification."""
+
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# The order in which the grid loops over the properties, the last property
+# changes fastest.
+grid_properties: List[str] = ["du", "dv", "bias", "vth", "weight", "a_in"]
+
+
+# pylint: disable=R0902
+class Parameter_grid:
+    """Maps each candidate of the Cartesian product of the Discovery ranges to
+    an index, and back, without materialising the candidates.
+
+    Example usage: params=Parameter_grid(disco=Discovery()).get_params(3)
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        disco: Discovery,
+    ) -> None:
+        self.name: str = disco.name
+        self.ranges: Dict[str, List[Union[float, int]]] = {
+            the_property: list(getattr(disco, f"{the_property}_range"))
+            for the_property in grid_properties
+        }
+        self.shape: Tuple[int, ...] = tuple(
+            len(self.ranges[the_property]) for the_property in grid_properties
+        )
+
+        # Nr of consecutive indices that share the same value of a property.
+        self.strides: Dict[str, int] = {}
+        stride: int = 1
+        for the_property in reversed(grid_properties):
+            self.strides[the_property] = stride
+            stride *= len(self.ranges[the_property])
+        self.size: int = stride
+
+        # Nr of snns that are created per LIF neuron (weight and a_in).
+        self.fanout_size: int = self.strides["vth"]
+
+    def __len__(self) -> int:
+        return self.size
+
+    @hot_path_typechecked
+    def get_params(self, index: int) -> Tuple[Union[float, int], ...]:
+        """Returns the (du, dv, bias, vth, weight, a_in) of a grid index."""
+        if not 0 <= index < self.size:
+            raise IndexError(
+                f"Error, index:{index} is not in grid of size:{self.size}."
+            )
+        return tuple(
+            self.ranges[the_property][
+                index
+                // self.strides[the_property]
+                % len(self.ranges[the_property])
+            ]
+            for the_property in grid_properties
+        )
+
+    @hot_path_typechecked
+    def get_param_dict(self, index: int) -> Dict[str, Union[float, int]]:
+        """Returns the parameters of a grid index, per property name."""
+        return dict(zip(grid_properties, self.get_params(index)))
+
+    @typechecked
+    def get_index(self, params: Tuple[Union[float, int], ...]) -> int:
+        """Returns the grid index of a (du, dv, bias, vth, weight, a_in)
+        tuple."""
+        if len(params) != len(grid_properties):
+            raise ValueError(
+                f"Error, expected {len(grid_properties)} parameters, found:"
+                + f"{params}"
+            )
+        index: int = 0
+        for the_property, value in zip(grid_properties, params):
+            if value not in self.ranges[the_property]:
+                raise ValueError(
+                    f"Error, {the_property}={value} is not in the grid."
+                )
+            index += (
+                self.ranges[the_property].index(value)
+                * self.strides[the_property]
+            )
+        return index
+
+    @typechecked
+    def get_range_indices(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Returns the index into the range of each property, for an array of
+        grid indices."""
+        return {
+            the_property: indices
+            // self.strides[the_property]
+            % len(self.ranges[the_property])
+            for the_property in grid_properties
+        }
+
+    @typechecked
+    def get_values(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Returns the value of each property as float array, for an array of
+        grid indices."""
+        range_indices: Dict[str, np.ndarray] = self.get_range_indices(
+            indices=indices
+        )
+        return {
+            the_property: np.asarray(
+                self.ranges[the_property], dtype=np.float64
+            )[range_indices[the_property]]
+            for the_property in grid_properties
+        }
+
+    @typechecked
+    def iter_chunks(
+        self, chunk_size: int, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """Yields the [start, stop) grid index ranges of consecutive chunks of
+        at most chunk_size candidates."""
+        if chunk_size < 1:
+            raise ValueError(
+                f"Error, chunk_size should be positive, found:{chunk_size}"
+            )
+        if stop is None:
+            stop = self.size
+        for chunk_start in range(start, stop, chunk_size):
+            yield chunk_start, min(chunk_start + chunk_size, stop)
+
+    @typechecked
+    def sample_indices(self, nr_of_samples: int, seed: int) -> List[int]:
+        """Returns a reproducible, sorted random sample of grid indices."""
+        rng = np.random.default_rng(seed)
+        return sorted(
+            int(index)
+            for index in rng.choice(
+                self.size, size=min(nr_of_samples, self.size), replace=False
+            )
+        )
@@ -1,10 +1,18 @@
 """Imports and exports neuron property dictionaries."""
+import hashlib
 import json
 import os
-from typing import Dict, List, Union
+import queue
+import threading
+import time
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from typeguard import typechecked
 
+# Key of the last line of a streamed file, which closes the stream.
+footer_key: str = "__footer__"
+
 
 @typechecked
 def create_output_dir_if_not_exists(directory: str) -> None:
@@ -16,33 +24,39 @@ def create_output_dir_if_not_exists(directory: str) -> None:
 @typechecked
 def write_dict_to_file(
     filepath: str, neuron_dicts: List[Dict[str, Union[float, int, str]]]
-) -> None:
-    """Writes dict to json file."""
+) -> str:
+    """Writes dict to json file, and returns the sha256 checksum of the
+    written data.
+
+    The data is written to a temporary file that is renamed once it is
+    complete, and the checksum is computed from the data in memory,
+    instead of reading the file back.
+    """
     # Serialize data into file:
-    with open(filepath, "w", encoding="utf-8") as some_file:
-        json.dump(neuron_dicts, some_file)
+    content: bytes = json.dumps(neuron_dicts).encode("utf-8")
+    tmp_filepath: str = f"{filepath}.tmp"
+    with open(tmp_filepath, "wb") as some_file:
+        some_file.write(content)
+        some_file.flush()
+        os.fsync(some_file.fileno())
+    os.replace(tmp_filepath, filepath)
 
     # Assert file exists.
     if not os.path.isfile(filepath):
         raise FileNotFoundError(
             f"Error, {filepath} was not found after exporting data."
         )
-
-    # Assert data can be loaded from file.
-    loaded_data: List[Dict[str, Union[float, int, str]]] = load_dict_from_file(
-        filepath
-    )
-
-    # Assert loaded data equals input data.
-    if loaded_data != neuron_dicts:
-        raise LookupError("Error, loaded data does not equal outputted data.")
+    return hashlib.sha256(content).hexdigest()
 
 
 @typechecked
 def load_dict_from_file(
     filepath: str,
 ) -> List[Dict[str, Union[float, int, str]]]:
-    """Loads json file into list of dicts."""
+    """Loads json file into list of dicts.
+
+    A streamed .jsonl file is read with iter_dicts_from_file.
+    """
 
     # Assert file exists.
     if not os.path.isfile(filepath):
@@ -50,7 +64,183 @@ def load_dict_from_file(
             f"Error, {filepath} was not found after exporting data."
         )
 
+    if filepath.endswith(".jsonl"):
+        return list(iter_dicts_from_file(filepath))
+
     # Read data from file:
     with open(filepath, encoding="utf-8") as some_file:
         neuron_dicts = json.load(some_file)
     return neuron_dicts
+
+
+@typechecked
+def load_dict_and_checksum_from_file(
+    filepath: str,
+) -> Tuple[List[Dict[str, Union[float, int, str]]], str]:
+    """Loads json file into list of dicts, and returns them with the sha256
+    checksum of the file, such that the file is read once.
+
+    Of a streamed .jsonl file, the checksum in its footer is returned,
+    which iter_dicts_from_file verifies.
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"Error, {filepath} was not found.")
+    if filepath.endswith(".jsonl"):
+        footer: Dict[str, Union[int, str]] = {}
+        return (
+            list(iter_dicts_from_file(filepath, footer=footer)),
+            str(footer["sha256"]),
+        )
+    with open(filepath, "rb") as some_file:
+        content: bytes = some_file.read()
+    return json.loads(content), hashlib.sha256(content).hexdigest()
+
+
+@typechecked
+def iter_dicts_from_file(
+    filepath: str,
+    footer: Optional[Dict[str, Union[int, str]]] = None,
+) -> Iterator[Dict[str, Union[float, int, str]]]:
+    """Lazily yields the neuron dicts of a file written by Streaming_writer.
+
+    Raises an error after the last neuron dict if the file is not closed
+    by a footer, or if the checksum or the nr of dicts in the footer do
+    not match the yielded lines. The verified footer is copied into the
+    footer dict, if given.
+    """
+    checksum = hashlib.sha256()
+    nr_of_neuron_dicts: int = 0
+    with open(filepath, "rb") as some_file:
+        for line in some_file:
+            record = json.loads(line)
+            if footer_key in record:
+                if (
+                    record[footer_key]["sha256"] != checksum.hexdigest()
+                    or record[footer_key]["nr_of_neuron_dicts"]
+                    != nr_of_neuron_dicts
+                ):
+                    raise LookupError(
+                        f"Error, the data in {filepath} does not match its "
+                        + "footer."
+                    )
+                if footer is not None:
+                    footer.update(record[footer_key])
+                return
+            checksum.update(line)
+            nr_of_neuron_dicts += 1
+            yield record
+    raise EOFError(f"Error, {filepath} is incomplete, it has no footer.")
+
+
+class Streaming_writer:
+    """Appends neuron dicts to a .jsonl file, one per line, whilst the search
+    is running.
+
+    The lines are written and flushed by a background thread, into a
+    .partial file that can be followed during the run. Closing the
+    writer adds a footer with the checksum and the nr of neuron dicts,
+    and renames the file to its final name.
+
+    Example usage: with Streaming_writer(filepath="static.jsonl") as
+    writer: writer.write(neuron_dict)
+    """
+
+    @typechecked
+    def __init__(self, filepath: str, flush_interval: float = 1.0) -> None:
+        self.filepath: str = filepath
+        self.partial_filepath: str = f"{filepath}.partial"
+        self.flush_interval: float = flush_interval
+        self.nr_of_neuron_dicts: int = 0
+        self.checksum = hashlib.sha256()
+        self.lines: queue.Queue = queue.Queue()
+        self.error: Optional[BaseException] = None
+
+        # pylint: disable=R1732
+        self.partial_file = open(self.partial_filepath, "wb")
+        self.thread = threading.Thread(target=self.write_lines, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "Streaming_writer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # Only complete the file if the search completed.
+        self.close(complete=exc_type is None)
+
+    @typechecked
+    def write(self, neuron_dict: Dict[str, Union[float, int, str]]) -> None:
+        """Queues a neuron dict to be written by the background thread."""
+        if self.error is not None:
+            raise self.error
+        self.lines.put(json.dumps(neuron_dict).encode("utf-8") + b"\n")
+
+    def write_lines(self) -> None:
+        """Writes the queued lines, and flushes them at most once per
+        flush_interval, until it receives None."""
+        last_flush: float = time.monotonic()
+        try:
+            while True:
+                try:
+                    line: Optional[bytes] = self.lines.get(
+                        timeout=self.flush_interval
+                    )
+                except queue.Empty:
+                    line = b""
+                if line is None:
+                    break
+                if line:
+                    self.partial_file.write(line)
+                    self.checksum.update(line)
+                    self.nr_of_neuron_dicts += 1
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    self.partial_file.flush()
+                    last_flush = time.monotonic()
+        # pylint: disable=W0718
+        except BaseException as error:
+            self.error = error
+
+    @typechecked
+    def get_sha256(self) -> str:
+        """Returns the checksum of the written neuron dicts, which close
+        stores in the footer."""
+        return self.checksum.hexdigest()
+
+    @typechecked
+    def close(self, complete: bool = True) -> None:
+        """Writes the remaining lines, and if complete, the footer after
+        which the file is renamed to its final name."""
+        self.lines.put(None)
+        self.thread.join()
+        if self.error is not None:
+            self.partial_file.close()
+            raise self.error
+        if complete:
+            footer: Dict[str, Dict[str, Union[int, str]]] = {
+                footer_key: {
+                    "sha256": self.get_sha256(),
+                    "nr_of_neuron_dicts": self.nr_of_neuron_dicts,
+                }
+            }
+            self.partial_file.write(json.dumps(footer).encode("utf-8") + b"\n")
+            self.partial_file.flush()
+            os.fsync(self.partial_file.fileno())
+        self.partial_file.close()
+        if complete:
+            os.replace(self.partial_filepath, self.filepath)
+
+
+@typechecked
+def write_dicts_to_stream(
+    filepath: str, neuron_dicts: List[Dict[str, Union[float, int, str]]]
+) -> str:
+    """Writes neuron dicts that are already found to a .jsonl file, like the
+    search streams them, and returns the checksum in its footer."""
+    with Streaming_writer(filepath=filepath) as writer:
+        for neuron_dict in neuron_dicts:
+            writer.write(neuron_dict)
+    return writer.get_sha256()
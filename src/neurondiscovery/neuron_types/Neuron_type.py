@@ -13,6 +13,10 @@ from neurondiscovery.spike_patterns.expected_patterns import (
 from neurondiscovery.spike_patterns.input_patterns import (
     get_single_input_spike,
 )
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
+)
 
 
 # pylint: disable=R0902
@@ -71,6 +75,9 @@ class Neuron_type:
             wait_after_input=self.wait_after_input,
             spike_output_type=spike_output_type,
         )
+        self.expected_pattern: Spike_pattern = get_spike_pattern(
+            self.expected_spikes
+        )
 
         # TODO: allow for customisation.
         expected_spikes_without_input = [False] * max_time
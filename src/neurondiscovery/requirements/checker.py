@@ -3,36 +3,51 @@ settings."""
 # pylint: disable=R0903
 # pylint: disable=R0801
 
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 
 import networkx as nx
 from snnbackends.networkx.LIF_neuron import LIF_neuron
-from typeguard import typechecked
 
+from neurondiscovery.spike_patterns.Spike_pattern import Spike_pattern
+from neurondiscovery.type_checks import hot_path_typechecked
 
-@typechecked
+# The bounds within which the neuron properties of the searched neurons stay.
+# They are part of the fingerprint of a checkpoint or shard, so changing them
+# invalidates those of earlier searches.
+default_max_neuron_props: Dict[str, Union[float, int]] = {"vth": 100}
+default_min_neuron_props: Dict[str, Union[float, int]] = {"vth": -100}
+
+
+@hot_path_typechecked
 def verify_input_spike(
     a_in_time: int,
     input_node_name: str,
     snn_graph: nx.DiGraph,
     t: int,
+    slot: Optional[int] = None,
 ) -> None:
-    """Raises exception if input neuron does not spike once at a_in_time."""
+    """Raises exception if input neuron does not spike once at a_in_time.
+
+    The slot is the position of timestep t in the nx_lif list, if that
+    list does not hold all timesteps.
+    """
+    if slot is None:
+        slot = t
     if input_node_name in snn_graph.nodes():
         if t == a_in_time:
-            if not snn_graph.nodes[input_node_name]["nx_lif"][t].spikes:
+            if not snn_graph.nodes[input_node_name]["nx_lif"][slot].spikes:
                 raise SyntaxError(
                     "Error, the input neuron did not spike, at the "
                     f"a_in_time={a_in_time}. t={t}"
                 )
-        elif snn_graph.nodes[input_node_name]["nx_lif"][t].spikes:
+        elif snn_graph.nodes[input_node_name]["nx_lif"][slot].spikes:
             raise SyntaxError(
                 "Error, the input neuron spiked, at the "
                 f"a_in_time={a_in_time}. t={t}"
             )
 
 
-@typechecked
+@hot_path_typechecked
 def within_neuron_property_bounds(
     lif_neuron: LIF_neuron,
     max_neuron_props: Dict[str, Union[float, int]],
@@ -49,3 +64,17 @@ def within_neuron_property_bounds(
         if getattr(lif_neuron, attr).get() > max_val:
             return False
     return True
+
+
+@hot_path_typechecked
+def verify_spike_train(
+    expected_pattern: Spike_pattern, spike_train: Spike_pattern
+) -> None:
+    """Raises exception if the spike train of a neuron differs from the
+    expected spike pattern."""
+    first_mismatch = expected_pattern.get_first_mismatch(spike_train)
+    if first_mismatch is not None:
+        raise ValueError(
+            f"Error, the spike train:{spike_train} differs from the "
+            + f"expected:{expected_pattern} at t={first_mismatch}."
+        )
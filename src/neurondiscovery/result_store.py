@@ -0,0 +1,220 @@
+"""Stores the found neurons of all neuron types and runs in one SQLite
+database, with an index per queried column, such that they can be queried
+without loading every JSON file into memory."""
+
+import hashlib
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.import_export import load_dict_from_file
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.spike_patterns.Spike_pattern import Spike_pattern
+
+# The neuron dict keys that are stored as columns, in column order.
+parameter_columns: List[str] = [
+    "a_in",
+    "a_in_time",
+    "bias",
+    "du",
+    "dv",
+    "vth",
+    "weight",
+]
+indexed_columns: List[str] = parameter_columns + [
+    "neuron_type",
+    "pattern_hash",
+]
+supported_searches: List[str] = ["static", "changing"]
+# The file of each search in the neuron type directory.
+search_filenames: Dict[str, str] = {
+    "static": "static.jsonl",
+    "changing": "changing.json",
+}
+# The comparison operators of the conditions of a query.
+supported_operators: List[str] = ["<", "<=", "=", "!=", ">=", ">"]
+
+# a_in and weight have no type, such that ints are returned as ints. The
+# changing neurons store the explored property, the static neurons "". The
+# unique index makes re-inserting a neuron, e.g. after a resume, a no-op.
+create_statements: List[str] = (
+    [
+        """CREATE TABLE IF NOT EXISTS neurons (
+        id INTEGER PRIMARY KEY,
+        neuron_type TEXT NOT NULL,
+        search TEXT NOT NULL,
+        pattern_hash TEXT NOT NULL,
+        a_in NOT NULL,
+        a_in_time INTEGER NOT NULL,
+        bias REAL NOT NULL,
+        du REAL NOT NULL,
+        dv REAL NOT NULL,
+        vth REAL NOT NULL,
+        weight NOT NULL,
+        property TEXT NOT NULL DEFAULT ''
+    )""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS neurons_unique ON neurons "
+        + "(neuron_type, search, pattern_hash, "
+        + f"{', '.join(parameter_columns)}, property)",
+    ]
+    + [
+        f"CREATE INDEX IF NOT EXISTS neurons_{column} ON neurons ({column})"
+        for column in indexed_columns
+    ]
+)
+
+
+class Result_store:
+    """SQLite database with the found neurons of any neuron type and search.
+
+    Example usage: with Result_store(filepath="found_neurons/results.db") as
+    store: store.insert(neuron_dicts=neuron_dicts, neuron_type=neuron_type,
+    search="static")
+    """
+
+    @typechecked
+    def __init__(self, filepath: str) -> None:
+        self.filepath: str = filepath
+        self.connection: sqlite3.Connection = sqlite3.connect(filepath)
+        with self.connection:
+            for statement in create_statements:
+                self.connection.execute(statement)
+
+    def __enter__(self) -> "Result_store":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @typechecked
+    def insert(
+        self,
+        *,
+        neuron_dicts: List[Dict[str, Union[float, int, str]]],
+        neuron_type: Neuron_type,
+        search: str,
+    ) -> int:
+        """Inserts the neuron dicts that a search found for a neuron type in
+        one transaction, and returns the nr of newly stored neurons."""
+        if search not in supported_searches:
+            raise NotImplementedError(
+                f"Error, search={search} not yet supported."
+            )
+        pattern_hash: str = get_pattern_hash(
+            pattern=neuron_type.expected_pattern
+        )
+        with self.connection:
+            nr_before: int = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO neurons (neuron_type, search, "
+                + f"pattern_hash, {', '.join(parameter_columns)}, property) "
+                + f"VALUES ({', '.join('?' * (len(parameter_columns) + 4))})",
+                (
+                    (
+                        neuron_type.name,
+                        search,
+                        pattern_hash,
+                        *[neuron_dict[column] for column in parameter_columns],
+                        neuron_dict.get("property", ""),
+                    )
+                    for neuron_dict in neuron_dicts
+                ),
+            )
+            return self.connection.total_changes - nr_before
+
+    @typechecked
+    def import_json_files(self, *, neuron_type: Neuron_type) -> int:
+        """Inserts the static.jsonl and changing.json files of a neuron type,
+        if they exist, and returns the nr of newly stored neurons."""
+        nr_inserted: int = 0
+        for search in supported_searches:
+            filepath: str = (
+                f"{neuron_type.type_dir}/{search_filenames[search]}"
+            )
+            if os.path.isfile(filepath):
+                nr_inserted += self.insert(
+                    neuron_dicts=load_dict_from_file(filepath),
+                    neuron_type=neuron_type,
+                    search=search,
+                )
+        return nr_inserted
+
+    # pylint: disable=R0913
+    @typechecked
+    def iter_neuron_dicts(
+        self,
+        *,
+        neuron_type_name: Optional[str] = None,
+        search: Optional[str] = None,
+        pattern_hash: Optional[str] = None,
+        max_neuron_props: Optional[Dict[str, Union[float, int]]] = None,
+        min_neuron_props: Optional[Dict[str, Union[float, int]]] = None,
+        conditions: Optional[List[Tuple[str, str, Union[float, int]]]] = None,
+    ) -> Iterator[Dict[str, Union[float, int, str]]]:
+        """Lazily yields the stored neuron dicts that match all given filters,
+        in insertion order.
+
+        The max and min neuron props are inclusive bounds per parameter,
+        like the bounds of the search, e.g. max_neuron_props={"vth": 5}
+        yields the neurons with vth<=5. Other comparisons are given as
+        (parameter, operator, value) conditions, with an operator out of
+        supported_operators, e.g. conditions=[("vth", "<", 5)].
+        """
+        where: List[str] = []
+        values: List[Union[float, int, str]] = []
+        for column, value in [
+            ("neuron_type", neuron_type_name),
+            ("search", search),
+            ("pattern_hash", pattern_hash),
+        ]:
+            if value is not None:
+                where.append(f"{column} = ?")
+                values.append(value)
+        bounds: List[Tuple[str, str, Union[float, int]]] = [
+            (column, operator, value)
+            for operator, neuron_props in [
+                ("<=", max_neuron_props),
+                (">=", min_neuron_props),
+            ]
+            for column, value in (neuron_props or {}).items()
+        ]
+        for column, operator, value in bounds + (conditions or []):
+            if column not in parameter_columns:
+                raise ValueError(
+                    f"Error, {column} is not a parameter, choose from:"
+                    + f"{parameter_columns}"
+                )
+            if operator not in supported_operators:
+                raise NotImplementedError(
+                    f"Error, operator={operator} not yet supported."
+                )
+            where.append(f"{column} {operator} ?")
+            values.append(value)
+
+        query: str = (
+            f"SELECT {', '.join(parameter_columns)}, property FROM neurons"
+        )
+        if where:
+            query += f" WHERE {' AND '.join(where)}"
+        row: Tuple
+        for row in self.connection.execute(f"{query} ORDER BY id", values):
+            neuron_dict: Dict[str, Union[float, int, str]] = dict(
+                zip(parameter_columns, row)
+            )
+            if row[-1]:
+                neuron_dict["property"] = row[-1]
+            yield neuron_dict
+
+    @typechecked
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        self.connection.close()
+
+
+@typechecked
+def get_pattern_hash(*, pattern: Spike_pattern) -> str:
+    """Returns a hash of a spike pattern that is stable across runs and
+    Python versions."""
+    return hashlib.sha256(pattern.to_string().encode("utf-8")).hexdigest()[:16]
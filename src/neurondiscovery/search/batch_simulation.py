@@ -0,0 +1,557 @@
+"""Simulates all candidate neurons of a grid at once, with the neuron
+properties and states stored as NumPy arrays instead of one networkx graph per
+candidate."""
+# pylint: disable=R0801
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
+)
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# Marks a candidate that shows the expected spikes at every timestep.
+no_mismatch: int = -1
+
+
+# pylint: disable=R0913
+@typechecked
+def simulate_batch(
+    *,
+    a_in: np.ndarray,
+    a_in_time: int,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    expected_spikes: List[bool],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+) -> np.ndarray:
+    """Simulates all candidates one timestep per vectorised operation, and
+    returns a boolean mask with the candidates that show the expected spikes.
+
+    The update follows the networkx LIF_neuron: the input spike reaches
+    the neuron one timestep after a_in_time, and the recurrent synapse
+    one timestep after the neuron spiked.
+    """
+    return (
+        get_batch_first_mismatches(
+            a_in=a_in,
+            a_in_time=a_in_time,
+            bias=bias,
+            du=du,
+            dv=dv,
+            vth=vth,
+            weight=weight,
+            expected_spikes=expected_spikes,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        )
+        == no_mismatch
+    )
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def get_batch_first_mismatches(
+    *,
+    a_in: np.ndarray,
+    a_in_time: int,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    expected_spikes: Union[List[bool], np.ndarray],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    pattern_lengths: Optional[np.ndarray] = None,
+    out_of_bounds: Optional[np.ndarray] = None,
+    periods: Optional[np.ndarray] = None,
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> np.ndarray:
+    """Returns per candidate the first timestep at which it deviates from the
+    expected spikes, or leaves the neuron property bounds, and no_mismatch
+    for the candidates that show the expected behaviour.
+
+    The expected spikes are either one pattern for all candidates, or a
+    2D array with one (padded) row per candidate, of which the first
+    pattern_lengths timesteps are verified. Candidates are removed from
+    the batch as soon as they deviate, or their pattern ends. If an
+    out_of_bounds boolean array is given, the candidates that show the
+    expected spike but leave the neuron property bounds are marked in it.
+
+    If a periods integer array is given, the state cycles are detected,
+    see is_cycle_save_time. A candidate whose state repeats is removed
+    from the batch, its remaining spikes are the repetition of its
+    cycle, and the period of the accepted ones is stored in periods.
+
+    With a fixed_point_format, the neuron properties are its integers,
+    see Fixed_point_format.quantize, and the candidates are simulated
+    in its integer arithmetic. The neuron property bounds remain those
+    of the values that the integers represent.
+    """
+    nr_of_candidates: int = len(du)
+    first_mismatches: np.ndarray = np.full(nr_of_candidates, no_mismatch)
+    expected: np.ndarray = np.broadcast_to(
+        np.asarray(expected_spikes, dtype=bool),
+        (nr_of_candidates, np.shape(expected_spikes)[-1]),
+    )
+    if pattern_lengths is None:
+        pattern_lengths = np.full(nr_of_candidates, expected.shape[1])
+    if fixed_point_format is not None:
+        (
+            max_neuron_props,
+            min_neuron_props,
+        ) = fixed_point_format.quantize_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        )
+    candidates: Dict[str, np.ndarray] = get_batch_candidates(
+        a_in=a_in,
+        bias=bias,
+        du=du,
+        dv=dv,
+        vth=vth,
+        weight=weight,
+        fixed_point_format=fixed_point_format,
+    )
+    # The (u, v, spikes) state of the candidates at the last save time.
+    saved_t: Optional[int] = None
+    saved: Tuple[np.ndarray, ...] = ()
+
+    for t in range(expected.shape[1]):
+        # Remove the candidates that do not behave as desired.
+        active: np.ndarray = candidates["index"]
+        matches: np.ndarray = candidates["spikes"] == expected[active, t]
+        within_bounds: np.ndarray = within_batch_property_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            neuron_props=candidates,
+        )
+        behaves: np.ndarray = matches & within_bounds
+        first_mismatches[active[~behaves]] = t
+        if out_of_bounds is not None:
+            out_of_bounds[active[matches & ~within_bounds]] = True
+        # Candidates whose pattern ends at t are accepted.
+        remains: np.ndarray = behaves & (pattern_lengths[active] > t + 1)
+        if periods is not None and saved_t is not None:
+            # Most steps have no equal v, which skips the other comparisons.
+            cycled: np.ndarray = candidates["v"] == saved[1]
+            if cycled.any():
+                cycled &= (
+                    remains
+                    & (candidates["u"] == saved[0])
+                    & (candidates["spikes"] == saved[2])
+                )
+            if cycled.any():
+                cycled_indices: np.ndarray = active[cycled]
+                first_mismatches[
+                    cycled_indices
+                ] = get_periodic_first_mismatches(
+                    cycle_start=saved_t,
+                    expected=expected[cycled_indices],
+                    pattern_lengths=pattern_lengths[cycled_indices],
+                    t=t,
+                )
+                periods[cycled_indices] = np.where(
+                    first_mismatches[cycled_indices] == no_mismatch,
+                    t - saved_t,
+                    0,
+                )
+                remains &= ~cycled
+        if not remains.all():
+            candidates = select_candidates(
+                candidates=candidates, selection=remains
+            )
+            saved = tuple(state[remains] for state in saved)
+        if candidates["index"].size == 0:
+            break
+        if periods is not None and is_cycle_save_time(
+            a_in_time=a_in_time, t=t
+        ):
+            saved_t, saved = t, (
+                candidates["u"],
+                candidates["v"],
+                candidates["spikes"],
+            )
+
+        # Simulate the candidates for timestep t+1.
+        simulate_batch_candidates(
+            a_in_time=a_in_time,
+            candidates=candidates,
+            t=t,
+            fixed_point_format=fixed_point_format,
+        )
+
+    return first_mismatches
+
+
+# pylint: disable=R0913
+@hot_path_typechecked
+def get_batch_candidates(
+    *,
+    a_in: np.ndarray,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> Dict[str, np.ndarray]:
+    """Returns the properties, decays and initial (u, v, spikes) state of the
+    candidates of a batch, with the index of each candidate in the batch.
+
+    With a fixed_point_format, u and v are stored in its integer dtype.
+    """
+    nr_of_candidates: int = len(du)
+    u_decay, v_decay = get_batch_decays(
+        du=du, dv=dv, fixed_point_format=fixed_point_format
+    )
+    state_dtype: type = (
+        np.float64 if fixed_point_format is None else fixed_point_format.dtype
+    )
+    return {
+        "index": np.arange(nr_of_candidates),
+        "a_in": a_in,
+        "bias": bias,
+        "du": du,
+        "dv": dv,
+        "vth": vth,
+        "weight": weight,
+        "u_decay": u_decay,
+        "v_decay": v_decay,
+        "u": np.zeros(nr_of_candidates, dtype=state_dtype),
+        "v": np.zeros(nr_of_candidates, dtype=state_dtype),
+        "spikes": np.zeros(nr_of_candidates, dtype=bool),
+    }
+
+
+@hot_path_typechecked
+def select_candidates(
+    *, candidates: Dict[str, np.ndarray], selection: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Returns the selected candidates of a batch, like select_branches."""
+    return {key: values[selection] for key, values in candidates.items()}
+
+
+@hot_path_typechecked
+def simulate_batch_candidates(
+    *,
+    a_in_time: int,
+    candidates: Dict[str, np.ndarray],
+    t: int,
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> None:
+    """Updates the (u, v, spikes) state of the candidates of a batch from
+    timestep t to t+1, see simulate_batch_timestep."""
+    (
+        candidates["u"],
+        candidates["v"],
+        candidates["spikes"],
+    ) = simulate_batch_timestep(
+        a_in=candidates["a_in"] if a_in_time > 0 and t == a_in_time else None,
+        bias=candidates["bias"],
+        spikes=candidates["spikes"],
+        u=candidates["u"],
+        u_decay=candidates["u_decay"],
+        v=candidates["v"],
+        v_decay=candidates["v_decay"],
+        vth=candidates["vth"],
+        weight=candidates["weight"],
+        fixed_point_format=fixed_point_format,
+    )
+
+
+@hot_path_typechecked
+def get_batch_decays(
+    *,
+    du: np.ndarray,
+    dv: np.ndarray,
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the factors with which u and v decay per timestep, 1-du and
+    1-dv, in the integer representation of the fixed_point_format if
+    given."""
+    if fixed_point_format is None:
+        return 1 - du, 1 - dv
+    return (
+        fixed_point_format.get_scale("du") - du,
+        fixed_point_format.get_scale("dv") - dv,
+    )
+
+
+# pylint: disable=R0913
+@hot_path_typechecked
+def simulate_batch_timestep(
+    *,
+    a_in: Optional[np.ndarray],
+    bias: np.ndarray,
+    spikes: np.ndarray,
+    u: np.ndarray,
+    u_decay: np.ndarray,
+    v: np.ndarray,
+    v_decay: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the u, v and spikes of the candidates at the next timestep.
+
+    The candidates that spiked receive their weight, and all receive the
+    input spike a_in, if given, in u. The v of the candidates that spike
+    is reset to 0. With a fixed_point_format, the decays are rounded and
+    u and v saturate, see Fixed_point_format.
+    """
+    synaptic_input: np.ndarray = np.where(spikes, weight, 0)
+    if a_in is not None:
+        synaptic_input = synaptic_input + a_in
+    if fixed_point_format is None:
+        u = u * u_decay + synaptic_input
+        v = v * v_decay + u + bias
+    else:
+        u = fixed_point_format.saturate(
+            attr="u",
+            values=fixed_point_format.decay(attr="u", decay=u_decay, values=u)
+            + synaptic_input,
+        )
+        v = fixed_point_format.saturate(
+            attr="v",
+            values=fixed_point_format.decay(attr="v", decay=v_decay, values=v)
+            + u
+            + bias,
+        )
+    spikes = v > vth
+    v[spikes] = 0
+    return u, v, spikes
+
+
+@hot_path_typechecked
+def is_cycle_save_time(*, a_in_time: int, t: int) -> bool:
+    """Returns True if the state of a neuron at timestep t is saved to
+    detect a state cycle, as in Brent's cycle detection.
+
+    Two timesteps after the input spike, the (u, v, spikes) state of a
+    neuron determines all its later states. From then on, the state is
+    saved at offsets 0, 1, 3, 7, 15, ..., and compared to the states
+    after it. A repeated state is found within two times the cycle start
+    plus period timesteps, and the first repetition of the saved state
+    is one period later.
+    """
+    offset: int = t - (a_in_time + 2 if a_in_time > 0 else 0)
+    return offset >= 0 and (offset + 1) & offset == 0
+
+
+@hot_path_typechecked
+def get_periodic_first_mismatches(
+    *,
+    cycle_start: int,
+    expected: np.ndarray,
+    pattern_lengths: np.ndarray,
+    t: int,
+) -> np.ndarray:
+    """Returns per row of expected spikes the first timestep from t onwards
+    that differs from the repetition of its timesteps [cycle_start, t), or
+    no_mismatch if the row repeats them until its pattern length."""
+    timesteps: np.ndarray = np.arange(t, expected.shape[1])
+    deviates: np.ndarray = (
+        expected[:, timesteps]
+        != expected[
+            :, cycle_start + (timesteps - cycle_start) % (t - cycle_start)
+        ]
+    ) & (timesteps < pattern_lengths[:, None])
+    return np.where(
+        deviates.any(axis=1), t + deviates.argmax(axis=1), no_mismatch
+    )
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def get_batch_target_first_mismatches(
+    *,
+    a_in: np.ndarray,
+    a_in_time: int,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    target_spikes: List[List[bool]],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+) -> np.ndarray:
+    """Returns per target and candidate the first timestep at which the
+    candidate deviates from the expected spikes of the target, or leaves the
+    neuron property bounds, and no_mismatch if it shows the expected
+    behaviour of the target.
+
+    Each candidate is simulated once, and checked against the expected
+    spikes of every target. A candidate is removed from the batch once
+    it deviated from every target, or the patterns of the targets it
+    still matches end.
+    """
+    nr_of_candidates: int = len(du)
+    first_mismatches: np.ndarray = np.full(
+        (len(target_spikes), nr_of_candidates), no_mismatch
+    )
+    expected, pattern_lengths = get_pattern_matrix(
+        patterns=[get_spike_pattern(spikes) for spikes in target_spikes]
+    )
+    # Whether an active candidate still matches each target.
+    matching: np.ndarray = np.ones(
+        (len(target_spikes), nr_of_candidates), dtype=bool
+    )
+    candidates: Dict[str, np.ndarray] = get_batch_candidates(
+        a_in=a_in, bias=bias, du=du, dv=dv, vth=vth, weight=weight
+    )
+
+    for t in range(expected.shape[1]):
+        # Remove the candidates that do not behave as any target.
+        within_bounds: np.ndarray = within_batch_property_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            neuron_props=candidates,
+        )
+        verified: np.ndarray = matching & (pattern_lengths > t)[:, None]
+        deviates: np.ndarray = verified & (
+            (candidates["spikes"] != expected[:, t, None]) | ~within_bounds
+        )
+        target_indices, positions = np.nonzero(deviates)
+        first_mismatches[target_indices, candidates["index"][positions]] = t
+        matching &= ~deviates
+        # Candidates whose matched patterns all end at t are accepted.
+        remains: np.ndarray = (
+            matching & (pattern_lengths > t + 1)[:, None]
+        ).any(axis=0)
+        if not remains.all():
+            candidates = select_candidates(
+                candidates=candidates, selection=remains
+            )
+            matching = matching[:, remains]
+        if candidates["index"].size == 0:
+            break
+
+        # Simulate the candidates for timestep t+1.
+        simulate_batch_candidates(
+            a_in_time=a_in_time, candidates=candidates, t=t
+        )
+
+    return first_mismatches
+
+
+# pylint: disable=R0913
+@typechecked
+def get_batch_spike_trains(
+    *,
+    a_in: np.ndarray,
+    a_in_time: int,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    vth: np.ndarray,
+    weight: np.ndarray,
+    nr_of_timesteps: int,
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulates all candidates for nr_of_timesteps without early exit, and
+    returns their spike trains, their first timestep outside the neuron
+    property bounds, and the extremes of their u and v.
+
+    The spike trains are a 2D boolean array with one row per candidate.
+    The first timestep outside the bounds is no_mismatch for candidates
+    that stay within them. The extremes are the (min u, max u, min v,
+    max v) per candidate, over the same timesteps at which the bounds
+    are checked.
+    """
+    nr_of_candidates: int = len(du)
+    spike_trains: np.ndarray = np.zeros(
+        (nr_of_candidates, nr_of_timesteps), dtype=bool
+    )
+    first_out_of_bounds: np.ndarray = np.full(nr_of_candidates, no_mismatch)
+    extremes: np.ndarray = np.zeros((nr_of_candidates, 4))
+    candidates: Dict[str, np.ndarray] = get_batch_candidates(
+        a_in=a_in, bias=bias, du=du, dv=dv, vth=vth, weight=weight
+    )
+
+    for t in range(nr_of_timesteps):
+        spike_trains[:, t] = candidates["spikes"]
+        within_bounds: np.ndarray = within_batch_property_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            neuron_props=candidates,
+        )
+        first_out_of_bounds[
+            ~within_bounds & (first_out_of_bounds == no_mismatch)
+        ] = t
+        np.minimum(extremes[:, 0], candidates["u"], out=extremes[:, 0])
+        np.maximum(extremes[:, 1], candidates["u"], out=extremes[:, 1])
+        np.minimum(extremes[:, 2], candidates["v"], out=extremes[:, 2])
+        np.maximum(extremes[:, 3], candidates["v"], out=extremes[:, 3])
+
+        # Simulate the candidates for timestep t+1.
+        simulate_batch_candidates(
+            a_in_time=a_in_time, candidates=candidates, t=t
+        )
+
+    return spike_trains, first_out_of_bounds, extremes
+
+
+@hot_path_typechecked
+def within_batch_property_bounds(
+    *,
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    neuron_props: Dict[str, np.ndarray],
+) -> np.ndarray:
+    """Returns a boolean mask with the candidates whose properties are within
+    the specified bounds, like within_neuron_property_bounds."""
+    within_bounds: np.ndarray = np.ones(len(neuron_props["u"]), dtype=bool)
+    for attr, min_val in min_neuron_props.items():
+        within_bounds &= (
+            get_batch_property(attr=attr, neuron_props=neuron_props) >= min_val
+        )
+    for attr, max_val in max_neuron_props.items():
+        within_bounds &= (
+            get_batch_property(attr=attr, neuron_props=neuron_props) <= max_val
+        )
+    return within_bounds
+
+
+@hot_path_typechecked
+def get_batch_property(
+    *, attr: str, neuron_props: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """Returns the values of a neuron property for all candidates."""
+    if attr not in neuron_props:
+        raise NotImplementedError(
+            f"Error, neuron property:{attr} not yet supported by the batch "
+            + "engine."
+        )
+    return neuron_props[attr]
+
+
+@typechecked
+def get_pattern_matrix(
+    *, patterns: List[Spike_pattern]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the spike patterns as rows of a 2D array, padded with False to
+    the longest pattern, and the length of each pattern."""
+    pattern_lengths: np.ndarray = np.asarray(
+        [len(pattern) for pattern in patterns], dtype=np.int64
+    )
+    matrix: np.ndarray = np.zeros(
+        (len(patterns), int(pattern_lengths.max(initial=0))), dtype=bool
+    )
+    for row, pattern in enumerate(patterns):
+        matrix[row, : len(pattern)] = pattern.to_array()
+    return matrix, pattern_lengths
@@ -0,0 +1,126 @@
+"""Maps the grid candidates that provably behave identically onto one canonical
+candidate, such that only the canonical candidates are simulated, and their
+outcome is expanded back to the others."""
+
+from typing import Dict, List, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import (
+    Parameter_grid,
+    grid_properties,
+)
+from neurondiscovery.search.prefilter import get_provably_silent_mask
+
+
+@typechecked
+def get_canonical_indices(
+    *,
+    a_in_time: int,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    indices: np.ndarray,
+    merge_silent: bool = True,
+) -> np.ndarray:
+    """Returns per grid index the smallest grid index of an equivalent
+    candidate.
+
+    A range that contains a value twice, e.g. 0 and 0.0, creates
+    identical candidates. Without input spike (a_in_time=0), the a_in of
+    a candidate is never used, so its a_in is irrelevant. If
+    merge_silent, the weight of a candidate that provably does not spike
+    up to and including the first expected spike is irrelevant too, as
+    the candidate is rejected before its weight is used.
+    """
+    range_indices: Dict[str, np.ndarray] = grid.get_range_indices(
+        indices=indices
+    )
+    silent: np.ndarray = np.zeros(len(indices), dtype=bool)
+    if merge_silent and True in expected_spikes and len(indices) > 0:
+        silent = get_silent_candidates(
+            a_in_time=a_in_time,
+            grid=grid,
+            indices=indices,
+            prefix_length=expected_spikes.index(True) + 1,
+            range_indices=range_indices,
+        )
+
+    canonical_indices: np.ndarray = np.zeros(len(indices), dtype=np.int64)
+    for the_property in grid_properties:
+        values: List[Union[float, int]] = grid.ranges[the_property]
+        first_occurrences: np.ndarray = (
+            np.zeros(len(values), dtype=np.int64)
+            if the_property == "a_in" and a_in_time == 0
+            else np.asarray(
+                [values.index(value) for value in values], dtype=np.int64
+            )
+        )
+        canonical_range_indices: np.ndarray = first_occurrences[
+            range_indices[the_property]
+        ]
+        if the_property == "weight":
+            canonical_range_indices[silent] = 0
+        canonical_indices += (
+            canonical_range_indices * grid.strides[the_property]
+        )
+    return canonical_indices
+
+
+@typechecked
+def get_silent_candidates(
+    *,
+    a_in_time: int,
+    grid: Parameter_grid,
+    indices: np.ndarray,
+    prefix_length: int,
+    range_indices: Dict[str, np.ndarray],
+) -> np.ndarray:
+    """Returns a boolean mask with the candidates at the sorted grid indices
+    that provably do not spike in the first prefix_length timesteps.
+
+    Whether a candidate spikes before its weight is used only depends on
+    its LIF neuron and a_in, so it is evaluated once per pair of them.
+    """
+    neuron_indices: np.ndarray = indices // grid.fanout_size
+    first_neuron: int = int(neuron_indices[0])
+    neuron_props: Dict[str, np.ndarray] = grid.get_values(
+        indices=np.arange(first_neuron, int(neuron_indices[-1]) + 1)
+        * grid.fanout_size
+    )
+    silent: np.ndarray = get_provably_silent_mask(
+        a_in=np.asarray(grid.ranges["a_in"], dtype=np.float64)[None, :],
+        a_in_time=a_in_time,
+        bias=neuron_props["bias"][:, None],
+        du=neuron_props["du"][:, None],
+        dv=neuron_props["dv"][:, None],
+        prefix_length=prefix_length,
+        vth=neuron_props["vth"][:, None],
+    )
+    return silent[neuron_indices - first_neuron, range_indices["a_in"]]
+
+
+@typechecked
+def get_near_duplicates(
+    *, grid: Parameter_grid, decimals: int = 9
+) -> Dict[str, List[Union[float, int]]]:
+    """Returns per property the distinct range values that are equal when
+    rounded to decimals, e.g. 0.3 and 0.30000000000000004.
+
+    These candidates are not provably identical, as a rounding error can
+    decide whether v exceeds vth, so they are reported, not merged.
+    """
+    near_duplicates: Dict[str, List[Union[float, int]]] = {}
+    for the_property, values in grid.ranges.items():
+        rounded: Dict[float, List[Union[float, int]]] = {}
+        for value in dict.fromkeys(values):
+            rounded.setdefault(round(value, decimals), []).append(value)
+        duplicates: List[Union[float, int]] = [
+            value
+            for equal_values in rounded.values()
+            if len(equal_values) > 1
+            for value in equal_values
+        ]
+        if duplicates:
+            near_duplicates[the_property] = duplicates
+    return near_duplicates
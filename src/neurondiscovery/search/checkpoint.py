@@ -0,0 +1,124 @@
+"""Stores the progress of a long-running search periodically, such that it
+can be resumed after a crash."""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+
+
+class Search_checkpoint:
+    """Checkpoint of a search that completes its work in order.
+
+    It stores the position up to which all work is completed, together
+    with the results found so far, and a fingerprint of the search
+    settings that a resumed search should match.
+
+    Example usage: checkpoint=Search_checkpoint(
+    filepath="found_neurons/next_round/static.checkpoint.json",
+    fingerprint={"a_in_time":6}, interval=60)
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        filepath: str,
+        fingerprint: Dict[str, Any],
+        interval: float = 60.0,
+    ) -> None:
+        self.filepath: str = filepath
+        # Round trip through json, to compare it with a loaded fingerprint.
+        self.fingerprint: Dict[str, Any] = json.loads(json.dumps(fingerprint))
+        self.interval: float = interval
+        self.last_write: float = time.monotonic()
+
+    @typechecked
+    def load(self) -> Tuple[int, List[Any]]:
+        """Returns the position of the first unfinished work, and the results
+        found before it.
+
+        Returns (0, []) if there is no checkpoint.
+        """
+        if not os.path.isfile(self.filepath):
+            return 0, []
+        with open(self.filepath, encoding="utf-8") as checkpoint_file:
+            checkpoint: Dict[str, Any] = json.load(checkpoint_file)
+        if checkpoint["fingerprint"] != self.fingerprint:
+            raise ValueError(
+                f"Error, the checkpoint:{self.filepath} belongs to a "
+                + "different search, remove it or run without resume."
+            )
+        return checkpoint["next_position"], checkpoint["found"]
+
+    @typechecked
+    def update(
+        self, next_position: int, found: List[Any], force: bool = False
+    ) -> None:
+        """Writes the checkpoint if the interval has passed since the last
+        write.
+
+        The checkpoint is written to a temporary file first, such that a
+        crash during the write does not corrupt the previous checkpoint.
+        """
+        if not force and time.monotonic() - self.last_write < self.interval:
+            return
+        tmp_filepath: str = f"{self.filepath}.tmp"
+        with open(tmp_filepath, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint,
+                    "next_position": next_position,
+                    "found": found,
+                },
+                checkpoint_file,
+            )
+        os.replace(tmp_filepath, self.filepath)
+        self.last_write = time.monotonic()
+
+    @typechecked
+    def remove(self) -> None:
+        """Removes the checkpoint once the search results are stored."""
+        if os.path.isfile(self.filepath):
+            os.remove(self.filepath)
+
+
+# pylint: disable=R0913
+@typechecked
+def get_search_fingerprint(
+    *,
+    a_in_time: int,
+    disco: Discovery,
+    engine: str,
+    expected_spikes: List[bool],
+    fixed_point_format: Optional[Fixed_point_format],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    min_nr_of_neurons: Optional[int],
+) -> Dict[str, Any]:
+    """Returns the settings that determine the outcome of a grid search.
+
+    The fixed_point engine accepts other candidates than the float
+    engines, so the engine and the bit widths and fraction bits of the
+    fixed_point_format are part of the settings.
+    """
+    return {
+        "a_in_time": a_in_time,
+        "engine": engine,
+        "expected_spikes": expected_spikes,
+        "fixed_point_format": None
+        if fixed_point_format is None
+        else {
+            "bit_widths": fixed_point_format.bit_widths,
+            "fraction_bits": fixed_point_format.fraction_bits,
+        },
+        "grid_ranges": Parameter_grid(disco=disco).ranges,
+        "max_neuron_props": max_neuron_props,
+        "min_neuron_props": min_neuron_props,
+        "min_nr_of_neurons": min_nr_of_neurons,
+    }
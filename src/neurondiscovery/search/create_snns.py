@@ -3,20 +3,22 @@ settings."""
 # pylint: disable=R0903
 # pylint: disable=R0801
 
-from typing import List
+from typing import Iterator, List, Optional, Union
 
 import networkx as nx
 from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
 from typeguard import typechecked
 
-from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.search_metrics import Search_metrics, measure
+from neurondiscovery.type_checks import hot_path_typechecked
 
 
 # pylint: disable=R0913
-@typechecked
+@hot_path_typechecked
 def create_input_spike_neuron(
     a_in_time: int,
-    a_in: float,
+    a_in: Union[float, int],
     input_node_name: str,
     node_name: str,
     snn_graph: nx.DiGraph,
@@ -62,73 +64,47 @@ def create_input_spike_neuron(
     )
 
 
-@typechecked
-def create_neurons(*, disco: Discovery, verbose: bool) -> List[LIF_neuron]:
-    """Create a particular configuration for the neuron Discovery algorithm."""
-    if verbose:
-        print("")
-        print(f"du:{disco.du_range}")
-        print(f"dv:{disco.dv_range}")
-        print(f"bias:{disco.bias_range}")
-        print(f"vth:{disco.vth_range}")
-        print(f"weight:{disco.weight_range}")
-
-    neurons: List[LIF_neuron] = []
-    # pylint: disable=R1702
-    for du in disco.du_range:
-        for dv in disco.dv_range:
-            for bias in disco.bias_range:
-                for vth in disco.vth_range:
-                    # Create neuron.
-                    neurons.append(
-                        LIF_neuron(
-                            name="",
-                            bias=float(bias),
-                            du=float(du),
-                            dv=float(dv),
-                            vth=float(vth),
-                        )
-                    )
-
-    return neurons
-
-
 @typechecked
 def create_snns(
     *,
     a_in_time: int,
-    disco: Discovery,
+    grid: Parameter_grid,
     input_node_name: str,
-    neurons: List[LIF_neuron],
+    indices: List[int],
     node_name: str,
-) -> List[nx.DiGraph]:
-    """Creates a list of snns that are to be simulated."""
-    snns: List[nx.DiGraph] = []
-    for neuron in neurons:
-        for weight in disco.weight_range:
-            for a_in in disco.a_in_range:
-                snns.append(
-                    create_snn(
-                        a_in=a_in,
-                        a_in_time=a_in_time,
-                        lif_neuron=neuron,
-                        input_node_name=input_node_name,
-                        node_name=node_name,
-                        weight=weight,
-                    )
-                )
-    return snns
+    metrics: Optional[Search_metrics] = None,
+) -> Iterator[nx.DiGraph]:
+    """Lazily creates the snns of the grid candidates with the given grid
+    indices, that are to be simulated."""
+    for index in indices:
+        du, dv, bias, vth, weight, a_in = grid.get_params(index)
+        with measure(metrics=metrics, stage="create_snn"):
+            snn_graph: nx.DiGraph = create_snn(
+                a_in=a_in,
+                a_in_time=a_in_time,
+                lif_neuron=LIF_neuron(
+                    name="",
+                    bias=float(bias),
+                    du=float(du),
+                    dv=float(dv),
+                    vth=float(vth),
+                ),
+                input_node_name=input_node_name,
+                node_name=node_name,
+                weight=weight,
+            )
+        yield snn_graph
 
 
-@typechecked
+@hot_path_typechecked
 def create_snn(
     *,
-    a_in: float,
+    a_in: Union[float, int],
     a_in_time: int,
     node_name: str,
     input_node_name: str,
     lif_neuron: LIF_neuron,
-    weight: int,
+    weight: Union[float, int],
 ) -> nx.DiGraph:
     """Determines whether a neuron is of type I.
 
@@ -3,13 +3,12 @@ settings."""
 # pylint: disable=R0903
 # pylint: disable=R0801
 
-from typing import Dict, List, Optional, Union
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import networkx as nx
-from snnbackends.networkx.LIF_neuron import (
-    LIF_neuron,
-    print_neuron_properties_per_graph,
-)
+import numpy as np
+from snnbackends.networkx.LIF_neuron import LIF_neuron
 from snnbackends.networkx.run_on_networkx import (
     create_neuron_for_next_timestep,
     run_simulation_with_networkx_for_1_timestep,
@@ -18,16 +17,48 @@ from snnbackends.verify_graph_is_snn import verify_networkx_snn_spec
 from typeguard import typechecked
 
 from neurondiscovery.grid_settings.Discovery import Discovery
-from neurondiscovery.search.create_snns import create_neurons, create_snns
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.import_export import Streaming_writer
+from neurondiscovery.requirements.checker import (
+    verify_input_spike,
+    verify_spike_train,
+    within_neuron_property_bounds,
+)
+from neurondiscovery.search.batch_simulation import (
+    get_batch_first_mismatches,
+    get_periodic_first_mismatches,
+    is_cycle_save_time,
+    no_mismatch,
+)
+from neurondiscovery.search.canonical_grid import (
+    get_canonical_indices,
+    get_near_duplicates,
+)
+from neurondiscovery.search.checkpoint import Search_checkpoint
+from neurondiscovery.search.create_snns import create_snn, create_snns
+from neurondiscovery.search.fixed_point import (
+    get_fixed_point_values,
+    get_quantized_ranges,
+)
+from neurondiscovery.search.parallel_search import (
+    manage_parallel_simulation,
+    stop_requested,
+)
+from neurondiscovery.search.prefilter import get_prefiltered_indices
+from neurondiscovery.search.prefix_tree import simulate_prefix_tree
 from neurondiscovery.search.print_behaviour import (
-    drawProgressBar,
-    get_node_name_neuron_dicts,
+    get_parameter_neuron_dict,
     manage_printing,
 )
-from src.neurondiscovery.requirements.checker import (
-    verify_input_spike,
-    within_neuron_property_bounds,
+from neurondiscovery.search.progress_reporter import Progress_reporter
+from neurondiscovery.search.search_metrics import Search_metrics, measure
+from neurondiscovery.search.search_options import Search_options
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
 )
+from neurondiscovery.type_checks import hot_path_typechecked
 
 
 @typechecked
@@ -40,50 +71,108 @@ def get_satisfactory_neurons(
     min_neuron_props: Dict[str, Union[float, int]],
     verbose: bool,
     print_behaviour: Optional[bool] = None,
-    min_nr_of_neurons: Optional[int] = None,
+    options: Optional[Search_options] = None,
+    checkpoint: Optional[Search_checkpoint] = None,
+    resume: bool = False,
+    writer: Optional[Streaming_writer] = None,
+    metrics: Optional[Search_metrics] = None,
+    grid_range: Optional[Tuple[int, int]] = None,
+    reporter: Optional[Progress_reporter] = None,
 ) -> List[Dict[str, Union[float, int]]]:
-    """Performs a run."""
+    """Performs a run with the options, by default Search_options().
+
+    The engine is either "networkx", which simulates one snn graph per
+    candidate, "numpy", which simulates all candidates of a chunk at
+    once, "tree", which simulates trajectory prefixes that candidates
+    share only once, or "fixed_point", which simulates all candidates of
+    a chunk at once in the integer arithmetic of the fixed_point_format,
+    without prefilter. The candidates are created lazily from the grid,
+    chunk_size at a time, and the chunks are divided over workers
+    processes. The search stops once more than min_nr_of_neurons are
+    found. The prefilter
+    discards LIF neurons that spike too early in closed form, before
+    their snns are created. If a checkpoint is given, the progress is
+    stored periodically, and with resume the search continues from the
+    checkpoint. The found neurons are streamed to the writer whilst the
+    search runs.
+
+    The validation determines how often the networkx engine verifies the
+    snn specification of a candidate: at "every_step", "once" after its
+    snn is created, or at every step for a "sample" of
+    validation_sample_rate of the candidates (and never for the others).
+    If metrics are given, the time and allocations per stage, and the
+    rejected candidates are recorded in it. If a grid_range is given,
+    only the candidates with a grid index in [start, stop) are searched.
+    The progress is reported by the reporter, which by default draws a
+    progress bar if verbose. With detect_cycles, the networkx, numpy and
+    fixed_point engines stop simulating a candidate once its state
+    repeats, and the neuron dicts of those candidates store the period
+    of their spikes, see get_found_neuron_dicts. With canonicalize, one
+    candidate per group of equivalent candidates is simulated, see
+    simulate_chunk, and the range values that are nearly, but not
+    exactly, equal are printed if verbose.
+    """
+    if options is None:
+        options = Search_options()
 
     # Initialise properties.
     node_name: str = "0"
     input_node_name: str = "input_spike"
 
-    # Create neurons.
-    neurons: List[LIF_neuron] = create_neurons(disco=disco, verbose=verbose)
+    grid: Parameter_grid = Parameter_grid(disco=disco)
     if verbose:
-        print(f"Created {len(neurons)} neurons")
+        print("")
+        for the_property, values in grid.ranges.items():
+            print(f"{the_property}:{values}")
+        print(f"Created grid with {len(grid)} candidates.")
+        if options.canonicalize:
+            for the_property, values in get_near_duplicates(grid=grid).items():
+                print(
+                    f"Not deduplicated, nearly equal {the_property}:{values}"
+                )
+    if options.fixed_point_format is not None:
+        # Raise an error before the search if the grid does not fit.
+        get_quantized_ranges(
+            fixed_point_format=options.fixed_point_format, grid=grid
+        )
+    if reporter is None:
+        reporter = Progress_reporter(
+            name="static",
+            total=len(grid) if grid_range is None else grid_range[1],
+            mode="bar" if verbose else "silent",
+            start=0 if grid_range is None else grid_range[0],
+        )
 
-    # Create snns.
-    snns: List[nx.DiGraph] = create_snns(
-        a_in_time=a_in_time,
-        disco=disco,
-        input_node_name=input_node_name,
-        neurons=neurons,
-        node_name=node_name,
-    )
-    if verbose:
-        print(f"Created {len(snns)} snns.")
+    with measure(metrics=metrics, stage="manage_simulation"):
+        found_indices: List[int] = manage_simulation(
+            a_in_time=a_in_time,
+            expected_spikes=expected_spikes,
+            grid=grid,
+            input_node_name=input_node_name,
+            node_name=node_name,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            options=options,
+            verbose=verbose,
+            checkpoint=checkpoint,
+            resume=resume,
+            writer=writer,
+            metrics=metrics,
+            grid_range=grid_range,
+            reporter=reporter,
+        )
+    reporter.close()
 
-    working_snns: List[nx.DiGraph] = manage_simulation(
+    # Get neuron properties
+    neuron_dicts: List[Dict[str, Union[float, int]]] = get_found_neuron_dicts(
         a_in_time=a_in_time,
+        detect_cycles=options.detect_cycles,
+        fixed_point_format=options.fixed_point_format,
         expected_spikes=expected_spikes,
-        input_node_name=input_node_name,
-        node_name=node_name,
+        grid=grid,
+        indices=found_indices,
         max_neuron_props=max_neuron_props,
         min_neuron_props=min_neuron_props,
-        snns=snns,
-        verbose=verbose,
-        min_nr_of_neurons=min_nr_of_neurons,
-    )
-
-    # Get neuron properties
-    neuron_dicts: List[
-        Dict[str, Union[float, int]]
-    ] = get_node_name_neuron_dicts(
-        a_in_time=a_in_time,
-        input_node_name=input_node_name,
-        node_name=node_name,
-        snns=working_snns,
     )
 
     if verbose:
@@ -91,68 +180,436 @@ def get_satisfactory_neurons(
             expected_spikes=expected_spikes,
             neuron_dicts=neuron_dicts,
             node_name=node_name,
-            working_snns=working_snns,
+            working_snns=[
+                resimulate_snn(
+                    expected_spikes=expected_spikes,
+                    input_node_name=input_node_name,
+                    neuron_dict=neuron_dict,
+                    node_name=node_name,
+                    verify=options.fixed_point_format is None,
+                )
+                for neuron_dict in neuron_dicts
+            ]
+            if print_behaviour
+            else [],
             print_behaviour=print_behaviour,
         )
     return neuron_dicts
 
 
+@typechecked
+def resimulate_snn(
+    *,
+    expected_spikes: List[bool],
+    input_node_name: str,
+    neuron_dict: Dict[str, Union[float, int]],
+    node_name: str,
+    verify: bool = True,
+) -> nx.DiGraph:
+    """Recreates and simulates the snn of a found neuron dict, to obtain the
+    behaviour of the neuron over time.
+
+    If verify, an error is raised if the snn does not show the expected
+    spikes. The float snn of a neuron that was found in fixed-point
+    arithmetic may deviate from them, so it is not verified.
+    """
+    snn_graph: nx.DiGraph = create_snn(
+        a_in=neuron_dict["a_in"],
+        a_in_time=int(neuron_dict["a_in_time"]),
+        input_node_name=input_node_name,
+        lif_neuron=LIF_neuron(
+            name="",
+            bias=float(neuron_dict["bias"]),
+            du=float(neuron_dict["du"]),
+            dv=float(neuron_dict["dv"]),
+            vth=float(neuron_dict["vth"]),
+        ),
+        node_name=node_name,
+        weight=neuron_dict["weight"],
+    )
+    simulate_neuron(
+        a_in_time=int(neuron_dict["a_in_time"]),
+        expected_spikes=expected_spikes,
+        input_node_name=input_node_name,
+        max_neuron_props={},
+        min_neuron_props={},
+        node_name=node_name,
+        snn_graph=snn_graph,
+        verbose=False,
+    )
+    if verify:
+        verify_spike_train(
+            expected_pattern=get_spike_pattern(expected_spikes),
+            spike_train=snn_graph.graph["spike_train"],
+        )
+    return snn_graph
+
+
 # pylint: disable = R0913
+# pylint: disable = R0914
 @typechecked
 def manage_simulation(
     a_in_time: int,
     expected_spikes: List[bool],
+    grid: Parameter_grid,
     input_node_name: str,
     node_name: str,
     max_neuron_props: Dict[str, Union[float, int]],
     min_neuron_props: Dict[str, Union[float, int]],
-    snns: List[nx.DiGraph],
+    options: Search_options,
+    verbose: bool,
+    checkpoint: Optional[Search_checkpoint] = None,
+    resume: bool = False,
+    writer: Optional[Streaming_writer] = None,
+    metrics: Optional[Search_metrics] = None,
+    grid_range: Optional[Tuple[int, int]] = None,
+    reporter: Optional[Progress_reporter] = None,
+) -> List[int]:
+    """Performs the neuron simulations for the grid candidates, and returns
+    the grid indices of the candidates that show the expected behaviour.
+
+    The search stops once more than options.min_nr_of_neurons are
+    found. After
+    each chunk, the checkpoint stores the grid index at which the first
+    unfinished chunk starts, and the indices found before it. The neuron
+    dicts of the found candidates are streamed to the writer in grid
+    order, as soon as their chunk completes. The metrics, if given, are
+    exported periodically after a chunk completes. Only the candidates
+    in the grid_range are simulated, the whole grid by default. The
+    reporter, if given, is updated after each chunk, and in a single
+    process also after each candidate. The chunks are simulated as
+    specified by the options, see simulate_chunk.
+    """
+    start_index, stop_index = (
+        (0, len(grid)) if grid_range is None else grid_range
+    )
+    found_indices: List[int] = []
+    if checkpoint is not None and resume:
+        next_position, found_indices = checkpoint.load()
+        start_index = max(start_index, next_position)
+        if verbose:
+            print(
+                f"Resuming at grid index:{start_index} with "
+                + f"{len(found_indices)} found neurons."
+            )
+    found_kwargs: Dict[str, Any] = {
+        "a_in_time": a_in_time,
+        "detect_cycles": options.detect_cycles,
+        "expected_spikes": expected_spikes,
+        "fixed_point_format": options.fixed_point_format,
+        "grid": grid,
+        "max_neuron_props": max_neuron_props,
+        "min_neuron_props": min_neuron_props,
+    }
+    if writer is not None:
+        for neuron_dict in get_found_neuron_dicts(
+            **found_kwargs, indices=found_indices
+        ):
+            writer.write(neuron_dict)
+    max_nr_of_hits: Optional[int] = (
+        None
+        if options.min_nr_of_neurons is None
+        else options.min_nr_of_neurons + 1
+    )
+
+    def complete_chunk(stop: int, chunk_indices: List[int]) -> bool:
+        """Stores the indices found in a completed chunk, and returns True
+        once more than min_nr_of_neurons are found."""
+        if max_nr_of_hits is not None:
+            chunk_indices = chunk_indices[
+                : max(0, max_nr_of_hits - len(found_indices))
+            ]
+        found_indices.extend(chunk_indices)
+        if reporter is not None:
+            reporter.update(position=stop, nr_found=len(found_indices))
+        if writer is not None:
+            with measure(metrics=metrics, stage="Streaming_writer.write"):
+                for neuron_dict in get_found_neuron_dicts(
+                    **found_kwargs, indices=chunk_indices
+                ):
+                    writer.write(neuron_dict)
+        if metrics is not None:
+            metrics.maybe_export()
+        if max_nr_of_hits is not None and len(found_indices) >= max_nr_of_hits:
+            return True
+        if checkpoint is not None:
+            with measure(metrics=metrics, stage="Search_checkpoint.update"):
+                checkpoint.update(next_position=stop, found=found_indices)
+        return False
+
+    chunk_kwargs: Dict[str, Any] = {
+        "a_in_time": a_in_time,
+        "expected_spikes": expected_spikes,
+        "grid": grid,
+        "input_node_name": input_node_name,
+        "max_neuron_props": max_neuron_props,
+        "min_neuron_props": min_neuron_props,
+        "node_name": node_name,
+        "max_nr_of_hits": max_nr_of_hits,
+        "options": options,
+    }
+
+    if options.workers > 1:
+        # Give each worker multiple chunks to balance the load.
+        manage_parallel_simulation(
+            chunk_kwargs={**chunk_kwargs, "verbose": False},
+            chunks=list(
+                grid.iter_chunks(
+                    chunk_size=min(
+                        options.chunk_size,
+                        max(
+                            1,
+                            math.ceil(
+                                (stop_index - start_index)
+                                / (4 * options.workers)
+                            ),
+                        ),
+                    ),
+                    start=start_index,
+                    stop=stop_index,
+                )
+            ),
+            complete_chunk=complete_chunk,
+            simulate_chunk=simulate_chunk,
+            workers=options.workers,
+            metrics=metrics,
+        )
+        return found_indices
+
+    for start, stop in grid.iter_chunks(
+        chunk_size=options.chunk_size, start=start_index, stop=stop_index
+    ):
+        if complete_chunk(
+            stop,
+            simulate_chunk(
+                **chunk_kwargs,
+                nr_found=len(found_indices),
+                start=start,
+                stop=stop,
+                verbose=verbose,
+                metrics=metrics,
+                reporter=reporter,
+            ),
+        ):
+            break
+    return found_indices
+
+
+# pylint: disable = R0913
+@typechecked
+def simulate_chunk(
+    *,
+    a_in_time: int,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    input_node_name: str,
+    max_neuron_props: Dict[str, Union[float, int]],
+    max_nr_of_hits: Optional[int],
+    min_neuron_props: Dict[str, Union[float, int]],
+    node_name: str,
+    options: Search_options,
+    start: int,
+    stop: int,
     verbose: bool,
-    min_nr_of_neurons: Optional[int] = None,
-) -> List[nx.DiGraph]:
-    """Performs the neuron simulations for the snns."""
+    nr_found: int = 0,
+    metrics: Optional[Search_metrics] = None,
+    reporter: Optional[Progress_reporter] = None,
+) -> List[int]:
+    """Simulates the grid candidates in [start, stop) and returns the grid
+    indices of the candidates that show the expected behaviour.
+
+    If options.prefilter, the candidates whose LIF neuron spikes before
+    the input spike, where the expected spikes require silence, are
+    discarded without simulating them. Stops after max_nr_of_hits
+    satisfactory candidates are found. The tree engine prunes branches
+    instead of candidates, so its rejections are not recorded in the
+    metrics. The reporter, if given, is updated after each networkx
+    candidate with the nr_found before the chunk plus those in it. With
+    detect_cycles, a candidate is no longer simulated once its state
+    repeats.
+
+    With canonicalize, the candidates with equal properties, or that
+    only differ in an a_in or weight that is never used, are simulated
+    once, see get_canonical_indices. The weights of silent candidates
+    are not merged in fixed-point arithmetic, as their silence is proven
+    in floats. The found candidates are those whose equivalent candidate
+    is found, so the chunk is simulated completely before its first
+    max_nr_of_hits are returned.
+    """
+    indices: np.ndarray = np.arange(start, stop, dtype=np.int64)
+    if options.prefilter:
+        with measure(metrics=metrics, stage="get_prefiltered_indices"):
+            indices = get_prefiltered_indices(
+                a_in_time=a_in_time,
+                expected_spikes=expected_spikes,
+                grid=grid,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                start=start,
+                stop=stop,
+            )
+        if metrics is not None:
+            metrics.add_prefiltered(stop - start - len(indices))
 
-    working_snns: List[nx.DiGraph] = []
+    candidate_kwargs: Dict[str, Any] = {
+        "a_in_time": a_in_time,
+        "expected_spikes": expected_spikes,
+        "grid": grid,
+        "input_node_name": input_node_name,
+        "max_neuron_props": max_neuron_props,
+        "min_neuron_props": min_neuron_props,
+        "node_name": node_name,
+        "options": options,
+        "verbose": verbose,
+        "metrics": metrics,
+    }
+    if not options.canonicalize:
+        return simulate_candidates(
+            **candidate_kwargs,
+            indices=indices,
+            max_nr_of_hits=max_nr_of_hits,
+            nr_found=nr_found,
+            reporter=reporter,
+        )
 
-    # Simulate snns.
-    for count, snn in enumerate(snns):
-        if simulate_neuron(
+    with measure(metrics=metrics, stage="get_canonical_indices"):
+        canonical_indices: np.ndarray = get_canonical_indices(
             a_in_time=a_in_time,
             expected_spikes=expected_spikes,
+            grid=grid,
+            indices=indices,
+            merge_silent=options.fixed_point_format is None,
+        )
+        unique_indices: np.ndarray = np.unique(canonical_indices)
+    if metrics is not None:
+        metrics.add_deduplicated(len(indices) - len(unique_indices))
+    found_indices: List[int] = simulate_candidates(
+        **candidate_kwargs,
+        indices=unique_indices,
+        max_nr_of_hits=None,
+    )
+    return indices[np.isin(canonical_indices, found_indices)].tolist()[
+        :max_nr_of_hits
+    ]
+
+
+# pylint: disable = R0913
+# pylint: disable = R0914
+@typechecked
+def simulate_candidates(
+    *,
+    a_in_time: int,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    indices: np.ndarray,
+    input_node_name: str,
+    max_neuron_props: Dict[str, Union[float, int]],
+    max_nr_of_hits: Optional[int],
+    min_neuron_props: Dict[str, Union[float, int]],
+    node_name: str,
+    options: Search_options,
+    verbose: bool,
+    nr_found: int = 0,
+    metrics: Optional[Search_metrics] = None,
+    reporter: Optional[Progress_reporter] = None,
+) -> List[int]:
+    """Simulates the grid candidates at the sorted indices with the engine
+    of the options, and returns the grid indices of the candidates that
+    show the expected behaviour, see simulate_chunk."""
+    if options.engine in ["numpy", "fixed_point"]:
+        out_of_bounds: np.ndarray = np.zeros(len(indices), dtype=bool)
+        with measure(metrics=metrics, stage="simulate_batch"):
+            first_mismatches: np.ndarray = get_batch_first_mismatches(
+                a_in_time=a_in_time,
+                expected_spikes=expected_spikes,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                out_of_bounds=out_of_bounds,
+                periods=np.zeros(len(indices), dtype=np.int64)
+                if options.detect_cycles
+                else None,
+                fixed_point_format=options.fixed_point_format,
+                **(
+                    grid.get_values(indices=indices)
+                    if options.fixed_point_format is None
+                    else get_fixed_point_values(
+                        fixed_point_format=options.fixed_point_format,
+                        grid=grid,
+                        indices=indices,
+                    )
+                ),
+            )
+        if metrics is not None:
+            metrics.add_batch_outcomes(
+                first_mismatches=first_mismatches, out_of_bounds=out_of_bounds
+            )
+        return indices[first_mismatches == no_mismatch].tolist()[
+            :max_nr_of_hits
+        ]
+    if options.engine == "tree":
+        with measure(metrics=metrics, stage="simulate_prefix_tree"):
+            accepted_indices: np.ndarray = simulate_prefix_tree(
+                a_in_time=a_in_time,
+                expected_spikes=expected_spikes,
+                grid=grid,
+                indices=indices,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+            )
+        if metrics is not None:
+            metrics.accept(len(accepted_indices))
+        return accepted_indices.tolist()[:max_nr_of_hits]
+
+    found_indices: List[int] = []
+    for index, validate_steps, snn in zip(
+        indices.tolist(),
+        get_step_validation_mask(
+            indices=indices,
+            validation=options.validation,
+            validation_sample_rate=options.validation_sample_rate,
+        ).tolist(),
+        create_snns(
+            a_in_time=a_in_time,
+            grid=grid,
+            indices=indices.tolist(),
             input_node_name=input_node_name,
-            max_neuron_props=max_neuron_props,
-            min_neuron_props=min_neuron_props,
             node_name=node_name,
-            snn_graph=snn,
-            verbose=verbose,
-        ):
-            working_snns.append(snn)
-            print(
-                get_node_name_neuron_dicts(
-                    a_in_time=a_in_time,
-                    input_node_name=input_node_name,
-                    node_name=node_name,
-                    snns=[snn],
-                )
+            metrics=metrics,
+        ),
+    ):
+        if options.validation == "once":
+            with measure(metrics=metrics, stage="verify_networkx_snn_spec"):
+                verify_networkx_snn_spec(snn_graph=snn, t=0, backend="nx")
+        with measure(metrics=metrics, stage="simulate_neuron"):
+            behaves: bool = simulate_neuron(
+                a_in_time=a_in_time,
+                expected_spikes=expected_spikes,
+                input_node_name=input_node_name,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                node_name=node_name,
+                snn_graph=snn,
+                verbose=verbose,
+                validate_steps=validate_steps,
+                keep_history=False,
+                metrics=metrics,
+                detect_cycles=options.detect_cycles,
             )
-
-        count = count + 1
-        if verbose:
-            drawProgressBar(
-                percent=count / len(snns),
-                barLen=100,
-                n_found=len(working_snns),
+        if behaves:
+            found_indices.append(index)
+        if reporter is not None:
+            reporter.update(
+                position=index + 1, nr_found=nr_found + len(found_indices)
             )
         if (
-            min_nr_of_neurons is not None
-            and len(working_snns) > min_nr_of_neurons
-        ):
+            max_nr_of_hits is not None and len(found_indices) >= max_nr_of_hits
+        ) or stop_requested():
             break
-    return working_snns
+    return found_indices
 
 
 # pylint: disable=R0913
-@typechecked
+@hot_path_typechecked
 def simulate_neuron(
     a_in_time: int,
     expected_spikes: List[bool],
@@ -162,17 +619,54 @@ def simulate_neuron(
     node_name: str,
     snn_graph: nx.DiGraph,
     verbose: bool,
+    validate_steps: bool = True,
+    keep_history: bool = True,
+    metrics: Optional[Search_metrics] = None,
+    detect_cycles: bool = False,
 ) -> bool:
-    """Simulates the neuron."""
+    """Simulates the neuron.
+
+    If validate_steps is False, the snn specification and the input
+    spike are not verified per timestep. If keep_history is False, the
+    nx_lif list of each node only holds the current and the next
+    timestep, and the older timestep is dropped after each step. The
+    spikes of the simulated timesteps are recorded as a Spike_pattern in
+    snn_graph.graph["spike_train"]. If metrics are given, the checks are
+    measured, and the outcome of the neuron is recorded.
+
+    With detect_cycles, the simulation stops once the (u, v, spikes)
+    state of the neuron repeats, see is_cycle_save_time. Its remaining
+    spikes repeat those of the cycle, and are compared to the expected
+    spikes at once. The repeated spikes are added to the spike train,
+    and the period of a neuron that behaves is stored in
+    snn_graph.graph["period"].
+    """
+    spike_train: int = 0
+    nr_of_timesteps: int = 0
+    behaves: bool = True
+    # The state of the neuron at the last save time.
+    saved_t: Optional[int] = None
+    saved_state: Tuple[float, float, bool] = (0.0, 0.0, False)
     # Simulate neuron for at most max_time timesteps, as long as it behaves
     # as desired.
     for t, expected_spike in enumerate(expected_spikes):
+        # The position of timestep t in the nx_lif lists.
+        slot: int = t if keep_history else 0
+
         # Copy the neurons into the new timestep.
-        verify_networkx_snn_spec(snn_graph=snn_graph, t=t, backend="nx")
-        create_neuron_for_next_timestep(snn_graph=snn_graph, t=t)
-        verify_networkx_snn_spec(snn_graph=snn_graph, t=t + 1, backend="nx")
+        if validate_steps:
+            with measure(metrics=metrics, stage="verify_networkx_snn_spec"):
+                verify_networkx_snn_spec(
+                    snn_graph=snn_graph, t=slot, backend="nx"
+                )
+        create_neuron_for_next_timestep(snn_graph=snn_graph, t=slot)
+        if validate_steps:
+            with measure(metrics=metrics, stage="verify_networkx_snn_spec"):
+                verify_networkx_snn_spec(
+                    snn_graph=snn_graph, t=slot + 1, backend="nx"
+                )
 
-        neuron = snn_graph.nodes[node_name]["nx_lif"][t]
+        neuron = snn_graph.nodes[node_name]["nx_lif"][slot]
         if verbose:
             print(
                 f"{t}:{neuron.spikes}, bias={neuron.bias.get()}, u="
@@ -182,33 +676,181 @@ def simulate_neuron(
 
         # Simulate neuron.
         run_simulation_with_networkx_for_1_timestep(
-            snn_graph=snn_graph, t=t + 1
+            snn_graph=snn_graph, t=slot + 1
         )
 
         # If an input spike is used, verify it behaves accordingly.
         # TODO: facilitate continuously spiking input.
-        verify_input_spike(
-            a_in_time=a_in_time,
-            input_node_name=input_node_name,
-            snn_graph=snn_graph,
-            t=t,
-        )
+        if validate_steps:
+            with measure(metrics=metrics, stage="verify_input_spike"):
+                verify_input_spike(
+                    a_in_time=a_in_time,
+                    input_node_name=input_node_name,
+                    snn_graph=snn_graph,
+                    t=t,
+                    slot=slot,
+                )
+
+        if neuron.spikes:
+            spike_train |= 1 << t
+        nr_of_timesteps = t + 1
 
         # If neuron behaves, continue, otherwise move zon to next neuron.
-        if snn_graph.nodes[node_name]["nx_lif"][t].spikes != expected_spike:
-            return False
-        if not within_neuron_property_bounds(
-            lif_neuron=snn_graph.nodes[node_name]["nx_lif"][t],
+        if neuron.spikes != expected_spike:
+            behaves = False
+            if metrics is not None:
+                metrics.reject(reason="spike_mismatch", t=t)
+            break
+        with measure(metrics=metrics, stage="within_neuron_property_bounds"):
+            behaves = within_neuron_property_bounds(
+                lif_neuron=neuron,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+            )
+        if not behaves:
+            if metrics is not None:
+                metrics.reject(reason="property_bounds", t=t)
+            break
+
+        if detect_cycles:
+            state: Tuple[float, float, bool] = (
+                neuron.u.get(),
+                neuron.v.get(),
+                neuron.spikes,
+            )
+            if saved_t is not None and state == saved_state:
+                behaves, spike_train, nr_of_timesteps = extrapolate_cycle(
+                    cycle_start=saved_t,
+                    expected_spikes=expected_spikes,
+                    spike_train=spike_train,
+                    t=t,
+                )
+                if behaves:
+                    snn_graph.graph["period"] = t - saved_t
+                elif metrics is not None:
+                    metrics.reject(
+                        reason="spike_mismatch", t=nr_of_timesteps - 1
+                    )
+                break
+            if is_cycle_save_time(a_in_time=a_in_time, t=t):
+                saved_t, saved_state = t, state
+
+        if not keep_history:
+            for node in snn_graph.nodes:
+                del snn_graph.nodes[node]["nx_lif"][0]
+
+    snn_graph.graph["spike_train"] = Spike_pattern(
+        bits=spike_train, length=nr_of_timesteps
+    )
+    if behaves and metrics is not None:
+        metrics.accept()
+    return behaves
+
+
+@hot_path_typechecked
+def extrapolate_cycle(
+    *, cycle_start: int, expected_spikes: List[bool], spike_train: int, t: int
+) -> Tuple[bool, int, int]:
+    """Returns whether a neuron whose state at t equals its state at the
+    cycle_start shows the expected spikes, and its spike train and nr of
+    timesteps until its first mismatch, or the end of the expected spikes.
+
+    The spikes of the neuron in [cycle_start, t) match the expected
+    spikes, and repeat from t onwards.
+    """
+    first_mismatch: int = int(
+        get_periodic_first_mismatches(
+            cycle_start=cycle_start,
+            expected=np.asarray([expected_spikes], dtype=bool),
+            pattern_lengths=np.asarray([len(expected_spikes)]),
+            t=t,
+        )[0]
+    )
+    nr_of_timesteps: int = (
+        len(expected_spikes)
+        if first_mismatch == no_mismatch
+        else first_mismatch + 1
+    )
+    for later in range(t + 1, nr_of_timesteps):
+        if expected_spikes[
+            cycle_start + (later - cycle_start) % (t - cycle_start)
+        ]:
+            spike_train |= 1 << later
+    return first_mismatch == no_mismatch, spike_train, nr_of_timesteps
+
+
+# pylint: disable=R0913
+@typechecked
+def get_found_neuron_dicts(
+    *,
+    a_in_time: int,
+    detect_cycles: bool,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    indices: List[int],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    fixed_point_format: Optional[Fixed_point_format] = None,
+) -> List[Dict[str, Union[float, int]]]:
+    """Returns the neuron dicts of the found grid candidates.
+
+    With detect_cycles, the neuron dicts of the candidates whose state
+    repeats within the expected spikes also store the "period" of their
+    spikes. The periods of the few found candidates are determined with
+    the numpy engine, which detects the same cycles as the others, or in
+    the integer arithmetic of the fixed_point_format, if given.
+    """
+    neuron_dicts: List[Dict[str, Union[float, int]]] = [
+        get_parameter_neuron_dict(
+            a_in_time=a_in_time, **grid.get_param_dict(index)
+        )
+        for index in indices
+    ]
+    if detect_cycles and indices:
+        periods: np.ndarray = np.zeros(len(indices), dtype=np.int64)
+        get_batch_first_mismatches(
+            a_in_time=a_in_time,
+            expected_spikes=expected_spikes,
             max_neuron_props=max_neuron_props,
             min_neuron_props=min_neuron_props,
-        ):
-            return False
+            periods=periods,
+            fixed_point_format=fixed_point_format,
+            **(
+                grid.get_values(indices=np.asarray(indices, dtype=np.int64))
+                if fixed_point_format is None
+                else get_fixed_point_values(
+                    fixed_point_format=fixed_point_format,
+                    grid=grid,
+                    indices=np.asarray(indices, dtype=np.int64),
+                )
+            ),
+        )
+        for neuron_dict, period in zip(neuron_dicts, periods.tolist()):
+            if period:
+                neuron_dict["period"] = period
+    return neuron_dicts
 
-        # If a neuron shows the expected behaviour for more than 100
-        # timesteps, print its behaviour.
-        if 100 < t < 150:
-            print_neuron_properties_per_graph(
-                G=snn_graph, static=False, t=t, neuron_type="nx_lif"
-            )
 
-    return True
+@typechecked
+def get_step_validation_mask(
+    *, indices: np.ndarray, validation: str, validation_sample_rate: float
+) -> np.ndarray:
+    """Returns a boolean mask with the candidates whose snn is verified at
+    every timestep.
+
+    The sample is drawn from a hash of the grid index, such that a
+    candidate is sampled regardless of its chunk, worker or resume.
+    """
+    if validation == "every_step":
+        return np.ones(len(indices), dtype=bool)
+    if validation == "once":
+        return np.zeros(len(indices), dtype=bool)
+    if validation == "sample":
+        # Knuth's multiplicative hash, mapped onto [0, 1).
+        hashed: np.ndarray = (indices.astype(np.uint64) * 2654435761) % (
+            2**32
+        )
+        return hashed / 2**32 < validation_sample_rate
+    raise NotImplementedError(
+        f"Error, validation={validation} not yet supported."
+    )
@@ -1,136 +1,184 @@
 """Finds neurons that change over time, whilst still satisfying some pattern
 (that may also change over time)."""
-import copy
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from typeguard import typechecked
 
 from neurondiscovery.grid_settings.Discovery import Discovery
 from neurondiscovery.grid_settings.Specific_range import Specific_range
 from neurondiscovery.neuron_types import Neuron_type
 from neurondiscovery.neuron_types.Neuron_type import get_output_spike_pattern
-from neurondiscovery.search.discover import get_satisfactory_neurons
-from neurondiscovery.search.print_behaviour import drawProgressBar
+from neurondiscovery.requirements.checker import (
+    default_max_neuron_props,
+    default_min_neuron_props,
+)
+from neurondiscovery.search.batch_simulation import no_mismatch
+from neurondiscovery.search.checkpoint import Search_checkpoint
+from neurondiscovery.search.progress_reporter import Progress_reporter
+from neurondiscovery.search.simulation_cache import (
+    Simulation_cache,
+    simulated_properties,
+)
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
+)
+
+# Properties that are increased by 1 per redundancy level.
+explored_properties: List[str] = [
+    "a_in",
+    "a_in_time",
+    "bias",
+    "du",
+    "dv",
+    "vth",
+    "weight",
+]
 
 
+# pylint: disable=R0913
 @typechecked
 def spike_one_timestep_later_per_property(
     neuron_dicts: List[Dict[str, Union[float, int, str]]],
     max_redundancy: int,
     neuron_type: Neuron_type,
     wait_after_input: int,
+    checkpoint: Optional[Search_checkpoint] = None,
+    resume: bool = False,
+    cache: Optional[Simulation_cache] = None,
+    batch_size: int = 10000,
+    reporter: Optional[Progress_reporter] = None,
 ) -> List[Dict[str, Union[int, float, str]]]:
     """Perform secondary loop on property increase/decreases per satisfactory.
 
     # neuron.
+
+    The (neuron, property) pairs are evaluated batch_size pairs at a
+    time, all redundancy levels of all pairs in a batch in one batched
+    simulation. The checkpoint stores the nr of evaluated pairs and the
+    neurons found so far, with resume the pairs that were evaluated
+    before are skipped. The cache is shared by all batches. The reporter
+    reports the found neurons and the progress after each batch, with a
+    progress bar by default.
     """
-    #
-    count: int = 0
-    explored_properties: List[str] = [
-        "a_in",
-        "a_in_time",
-        "bias",
-        "du",
-        "dv",
-        "vth",
-        "weight",
+    if cache is None:
+        cache = Simulation_cache()
+    pairs: List[Tuple[Dict[str, Union[float, int, str]], str]] = [
+        (neuron_dict, the_property)
+        for neuron_dict in neuron_dicts
+        for the_property in explored_properties
     ]
+    nr_evaluated: int = 0
     found_neurons: List[Dict[str, Union[int, float, str]]] = []
-    for neuron_dict in neuron_dicts:
-        for the_property in explored_properties:
-            # print("neuron_dict")
-            # pprint(neuron_dict)
-            count += 1
-            # specify disco.
-            original_disco: Discovery = Specific_range()
-            original_disco.du_range = [neuron_dict["du"]]
-            original_disco.dv_range = [neuron_dict["dv"]]
-            original_disco.bias_range = [neuron_dict["bias"]]
-            original_disco.vth_range = [neuron_dict["vth"]]
-            original_disco.weight_range = [neuron_dict["weight"]]
-            original_disco.a_in_range = [int(neuron_dict["a_in"])]
-            # print("original_disco")
-            # pprint(original_disco.__dict__)
-            if original_disco.bias_range[0] != neuron_dict["bias"]:
-                raise ValueError("du not equal")
-            if original_disco.du_range[0] != neuron_dict["du"]:
-                raise ValueError("du not equal")
-            if original_disco.dv_range[0] != neuron_dict["dv"]:
-                raise ValueError("du not equal")
-            if original_disco.vth_range[0] != neuron_dict["vth"]:
-                raise ValueError("du not equal")
-            if original_disco.weight_range[0] != neuron_dict["weight"]:
-                raise ValueError("du not equal")
-            if original_disco.a_in_range[0] != neuron_dict["a_in"]:
-                raise ValueError("du not equal")
-
-            if count / (len(neuron_dicts) * len(explored_properties)) > 0.5470:
-                if changes_over_time_correctly(
-                    disco=copy.deepcopy(original_disco),
+    if checkpoint is not None and resume:
+        nr_evaluated, found_neurons = checkpoint.load()
+    if reporter is None:
+        reporter = Progress_reporter(name="changing", total=len(pairs))
+
+    for start in range(nr_evaluated, len(pairs), batch_size):
+        batch = pairs[start : start + batch_size]
+        for (neuron_dict, the_property), changes in zip(
+            batch,
+            changes_over_time_correctly(
+                cache=cache,
+                max_redundancy=max_redundancy,
+                neuron_dicts=[neuron_dict for neuron_dict, _ in batch],
+                neuron_type=neuron_type,
+                the_properties=[the_property for _, the_property in batch],
+                wait_after_input=wait_after_input,
+            ).tolist(),
+        ):
+            if changes:
+                reporter.event(
+                    "changing_neuron",
+                    property=the_property,
                     max_redundancy=max_redundancy,
-                    neuron_type=neuron_type,
-                    the_property=the_property,
-                    wait_after_input=copy.deepcopy(wait_after_input),
-                ):
-                    found_neurons.append(neuron_dict)
-                    found_neurons[-1]["property"] = the_property
-                    return found_neurons  # TODO: remove.
-                drawProgressBar(
-                    percent=count
-                    / (len(neuron_dicts) * len(explored_properties)),
-                    barLen=100,
-                    n_found=len(found_neurons),
                 )
+                found_neurons.append({**neuron_dict, "property": the_property})
+        reporter.update(
+            position=start + len(batch), nr_found=len(found_neurons)
+        )
+        if checkpoint is not None:
+            checkpoint.update(
+                next_position=start + len(batch), found=found_neurons
+            )
+    reporter.close()
     return found_neurons
 
 
 # pylint: disable=R0913
+# pylint: disable=R0914
 @typechecked
 def changes_over_time_correctly(
-    disco: Discovery,
+    *,
+    cache: Simulation_cache,
     max_redundancy: int,
+    neuron_dicts: List[Dict[str, Union[float, int, str]]],
     neuron_type: Neuron_type,
-    the_property: str,
+    the_properties: List[str],
     wait_after_input: int,
-) -> bool:
-    """Perform secondary loop on property increase/decreases per satisfactory.
-
-    # neuron.
+) -> np.ndarray:
+    """Returns a boolean mask with the (neuron, property) pairs that show the
+    expected spikes at every redundancy level.
+
+    At redundancy level r, the property of the neuron is increased by r
+    and the expected spikes start r timesteps later. All levels of all
+    pairs are simulated as one batch, with one expected spike pattern
+    per row.
     """
-    for red_level in range(1, max_redundancy + 1):
-        # Update discovery object.
-        update_neuron_property(disco=disco, the_property=the_property)
-
-        # Update wait_after_input (because redundant neurons should spike
-        # one timestep later.).
-        wait_after_input = wait_after_input + 1
-
-        # specify spike pattern.
-        expected_spikes: List[bool] = get_output_spike_pattern(
-            a_in_time=neuron_type.a_in_time,
-            max_time=neuron_type.max_time,
-            wait_after_input=wait_after_input,
-            spike_output_type=neuron_type.spike_output_type,
+    if max_redundancy < 1:
+        return np.zeros(len(neuron_dicts), dtype=bool)
+
+    # The spike pattern per redundancy level.
+    patterns: List[Spike_pattern] = [
+        get_spike_pattern(
+            get_output_spike_pattern(
+                a_in_time=neuron_type.a_in_time,
+                max_time=neuron_type.max_time,
+                wait_after_input=wait_after_input + red_level,
+                spike_output_type=neuron_type.spike_output_type,
+            )
         )
+        for red_level in range(1, max_redundancy + 1)
+    ]
 
-        # simulate snn.
-        neuron_dicts = get_satisfactory_neurons(
-            a_in_time=neuron_type.a_in_time,
-            disco=disco,
-            expected_spikes=expected_spikes,
-            max_neuron_props={"vth": 100},
-            min_neuron_props={"vth": -100},
-            verbose=False,
-            min_nr_of_neurons=10,
+    # Create one row per pair per redundancy level. The properties are
+    # increased with repeated additions, like update_neuron_property.
+    neuron_props: Dict[str, np.ndarray] = {
+        attr: np.asarray(
+            [float(neuron_dict[attr]) for neuron_dict in neuron_dicts]
         )
-
-        # if not empty list, proceed.
-        if len(neuron_dicts) == 0:
-            return False
-        if red_level == max_redundancy:
-            print(f"Changing: {the_property}, red_level{red_level}")
-            return True
-    return False
+        for attr in simulated_properties
+    }
+    neuron_props["a_in"] = np.trunc(neuron_props["a_in"])
+    the_property_array: np.ndarray = np.asarray(the_properties)
+    levels: List[Dict[str, np.ndarray]] = []
+    for _ in range(max_redundancy):
+        neuron_props = {
+            attr: np.where(the_property_array == attr, values + 1, values)
+            for attr, values in neuron_props.items()
+        }
+        levels.append(neuron_props)
+
+    first_mismatches: np.ndarray = cache.get_first_mismatches(
+        a_in_time=neuron_type.a_in_time,
+        max_neuron_props=default_max_neuron_props,
+        min_neuron_props=default_min_neuron_props,
+        neuron_props={
+            attr: np.concatenate([level[attr] for level in levels])
+            for attr in simulated_properties
+        },
+        pattern_indices=np.repeat(
+            np.arange(max_redundancy, dtype=np.int64), len(neuron_dicts)
+        ),
+        patterns=patterns,
+    )
+    return (
+        (first_mismatches == no_mismatch)
+        .reshape(max_redundancy, len(neuron_dicts))
+        .all(axis=0)
+    )
 
 
 @typechecked
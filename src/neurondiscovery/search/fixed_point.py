@@ -0,0 +1,88 @@
+"""Converts the candidates of a grid to the integer arithmetic of a
+fixed-point format, and finds the candidates whose outcome differs from the
+float simulation."""
+
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.grid_settings.Parameter_grid import (
+    Parameter_grid,
+    grid_properties,
+)
+
+
+@typechecked
+def get_quantized_ranges(
+    *, fixed_point_format: Fixed_point_format, grid: Parameter_grid
+) -> Dict[str, np.ndarray]:
+    """Returns the range of each grid property in the integer representation
+    of the fixed-point format, raises an error if a value does not fit it."""
+    return {
+        the_property: fixed_point_format.quantize(
+            attr=the_property,
+            values=np.asarray(grid.ranges[the_property], dtype=np.float64),
+        )
+        for the_property in grid_properties
+    }
+
+
+@typechecked
+def get_fixed_point_values(
+    *,
+    fixed_point_format: Fixed_point_format,
+    grid: Parameter_grid,
+    indices: np.ndarray,
+    quantized_ranges: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """Returns the integer value of each property, for an array of grid
+    indices, like Parameter_grid.get_values."""
+    if quantized_ranges is None:
+        quantized_ranges = get_quantized_ranges(
+            fixed_point_format=fixed_point_format, grid=grid
+        )
+    range_indices: Dict[str, np.ndarray] = grid.get_range_indices(
+        indices=indices
+    )
+    return {
+        the_property: quantized_ranges[the_property][
+            range_indices[the_property]
+        ]
+        for the_property in grid_properties
+    }
+
+
+@typechecked
+def get_fixed_point_discrepancies(
+    *,
+    fixed_point_neuron_dicts: List[Dict[str, Union[float, int]]],
+    float_neuron_dicts: List[Dict[str, Union[float, int]]],
+    grid: Parameter_grid,
+) -> List[Dict[str, Union[float, int]]]:
+    """Returns the neuron dicts that only the fixed-point search or only the
+    float search found, in grid order, with whether the fixed-point search
+    found them."""
+    found: Dict[bool, Dict[int, Dict[str, Union[float, int]]]] = {
+        fixed_point_accepted: {
+            grid.get_index(
+                tuple(
+                    neuron_dict[the_property]
+                    for the_property in grid_properties
+                )
+            ): neuron_dict
+            for neuron_dict in neuron_dicts
+        }
+        for fixed_point_accepted, neuron_dicts in [
+            (True, fixed_point_neuron_dicts),
+            (False, float_neuron_dicts),
+        ]
+    }
+    return [
+        {
+            **found[index in found[True]][index],
+            "fixed_point_accepted": index in found[True],
+        }
+        for index in sorted(found[True].keys() ^ found[False].keys())
+    ]
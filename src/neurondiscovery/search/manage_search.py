@@ -4,55 +4,404 @@ properties, and one for changing neuron properties."""
 # TODO: support storing different neuron types under different names.
 import os
 import sys
+from dataclasses import replace
 from pprint import pprint
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from typeguard import typechecked
 
 from neurondiscovery.grid_settings.Custom_range import Custom_range
 from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
 from neurondiscovery.import_export import (
+    Streaming_writer,
     load_dict_from_file,
     write_dict_to_file,
+    write_dicts_to_stream,
 )
 from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.requirements.checker import (
+    default_max_neuron_props,
+    default_min_neuron_props,
+)
+from neurondiscovery.result_store import Result_store
+from neurondiscovery.search.checkpoint import (
+    Search_checkpoint,
+    get_search_fingerprint,
+)
 from neurondiscovery.search.discover import get_satisfactory_neurons
 from neurondiscovery.search.find_changing_neurons import (
+    explored_properties,
     print_changing_neuron,
     spike_one_timestep_later_per_property,
 )
+from neurondiscovery.search.fixed_point import get_fixed_point_discrepancies
+from neurondiscovery.search.multi_target import (
+    get_multi_target_neurons,
+    get_shared_grid,
+)
+from neurondiscovery.search.progress_reporter import Progress_reporter
+from neurondiscovery.search.refine_grid import get_refined_neurons
+from neurondiscovery.search.search_metrics import Search_metrics, measure
+from neurondiscovery.search.search_options import Search_options
+from neurondiscovery.search.shards import get_shard_range, write_shard_manifest
+from neurondiscovery.search.simulation_cache import Simulation_cache
+from neurondiscovery.search.spike_archive import (
+    Spike_archive,
+    create_spike_archive,
+    get_archived_neurons,
+)
+from neurondiscovery.search.spike_index import Spike_index
 
 
 @typechecked
 def find_non_changing_neurons(
-    neuron_type: Neuron_type, overwrite: bool, verbose: bool
+    neuron_type: Neuron_type,
+    overwrite: bool,
+    verbose: bool,
+    options: Optional[Search_options] = None,
+    resume: bool = False,
+    export_metrics: bool = False,
+    trace_allocations: bool = False,
+    refine_depth: Optional[int] = None,
+    refine_boundary_only: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    progress: str = "bar",
+    store: Optional[Result_store] = None,
+    archive: Optional[Spike_archive] = None,
 ) -> List[Dict[str, Union[float, int]]]:
     """Finds neurons with static properties that show some spike pattern with
     and/or without input spikes.
 
+    The grid is simulated with the options, by default Search_options(),
+    see get_satisfactory_neurons. The search progress is checkpointed in
+    the neuron type directory, with resume, an interrupted search
+    continues from its checkpoint. The found neurons are streamed to
+    static.jsonl during the search, which is read back instead of
+    searching again, unless overwrite. With export_metrics, the search
+    metrics are written to metrics.json and metrics.prom in the neuron
+    type directory, during and after the search. With a refine_depth, the
+    grid specification is searched coarse-to-fine instead, see
+    get_refined_neurons. A shard (i, N) only searches the i-th of N
+    consecutive parts of the grid, and stores its neuron dicts in
+    static.shard-i.jsonl, with a manifest that merge_shards verifies. If
+    verbose, the progress is reported in the progress mode, see
+    Progress_reporter. The found neurons are also inserted into the
+    store, if given. With an archive, the neurons are found by scanning
+    its spike trains instead of simulating the grid. With the
+    fixed_point engine, the candidates whose outcome differs from the
+    float simulation are written to fixed_point_discrepancies.json, see
+    write_fixed_point_discrepancies.
+
     TODO: also verify pattern without input spike.
     """
-    non_changing_filename: str = "static.json"
-    output_filename: str = f"{neuron_type.type_dir}/{non_changing_filename}"
+    if shard is not None and refine_depth is not None:
+        raise NotImplementedError(
+            "Error, sharding a refinement search is not yet supported."
+        )
+    if archive is not None and (shard is not None or refine_depth is not None):
+        raise NotImplementedError(
+            "Error, sharding or refining an archive search is not yet "
+            + "supported."
+        )
+    if options is None:
+        options = Search_options()
+    if options.detect_cycles and (
+        archive is not None or refine_depth is not None
+    ):
+        raise NotImplementedError(
+            "Error, detecting state cycles in an archive or refinement "
+            + "search is not yet supported."
+        )
+    if options.canonicalize and (
+        archive is not None or refine_depth is not None
+    ):
+        raise NotImplementedError(
+            "Error, canonicalizing the grid of an archive or refinement "
+            + "search is not yet supported."
+        )
+    shard_suffix: str = "" if shard is None else f".shard-{shard[0]}"
+    output_filename: str = f"{neuron_type.type_dir}/static{shard_suffix}.jsonl"
     print(f"output_filename={output_filename}")
     if os.path.isfile(output_filename) and not overwrite:
         neuron_dicts = load_dict_from_file(output_filename)
     else:
-        # if True:
-        neuron_dicts = get_satisfactory_neurons(
+        max_neuron_props: Dict[
+            str, Union[float, int]
+        ] = default_max_neuron_props
+        min_neuron_props: Dict[
+            str, Union[float, int]
+        ] = default_min_neuron_props
+        fingerprint: Dict[str, Any] = get_search_fingerprint(
             a_in_time=neuron_type.a_in_time,
             disco=neuron_type.grid_spec,
+            engine=options.engine,
             expected_spikes=neuron_type.expected_spikes,
-            # TODO: parameterise.
-            max_neuron_props={"vth": 100},
-            min_neuron_props={"vth": -100},
+            fixed_point_format=options.fixed_point_format,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
             min_nr_of_neurons=None,
-            verbose=verbose,
         )
+        grid_size: int = len(Parameter_grid(disco=neuron_type.grid_spec))
+        grid_range: Optional[Tuple[int, int]] = (
+            None
+            if shard is None
+            else get_shard_range(
+                grid_size=grid_size, nr_of_shards=shard[1], shard=shard[0]
+            )
+        )
+        checkpoint: Search_checkpoint = Search_checkpoint(
+            filepath=f"{neuron_type.type_dir}/static{shard_suffix}"
+            + ".checkpoint.json",
+            fingerprint=fingerprint
+            if grid_range is None
+            else {**fingerprint, "grid_range": list(grid_range)},
+        )
+        metrics: Optional[Search_metrics] = (
+            Search_metrics(
+                json_filepath=f"{neuron_type.type_dir}/metrics{shard_suffix}"
+                + ".json",
+                prometheus_filepath=f"{neuron_type.type_dir}/metrics"
+                + f"{shard_suffix}.prom",
+                trace_allocations=trace_allocations,
+            )
+            if export_metrics
+            else None
+        )
+        with Streaming_writer(filepath=output_filename) as writer:
+            if archive is not None:
+                with measure(metrics=metrics, stage="get_archived_neurons"):
+                    neuron_dicts = get_archived_neurons(
+                        a_in_time=neuron_type.a_in_time,
+                        archive=archive,
+                        disco=neuron_type.grid_spec,
+                        expected_spikes=neuron_type.expected_spikes,
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props=min_neuron_props,
+                    )
+                if verbose and not neuron_dicts:
+                    print_nearest_archived_neurons(
+                        archive=archive, neuron_type=neuron_type
+                    )
+                for neuron_dict in neuron_dicts:
+                    writer.write(neuron_dict)
+            elif refine_depth is None:
+                neuron_dicts = get_satisfactory_neurons(
+                    a_in_time=neuron_type.a_in_time,
+                    disco=neuron_type.grid_spec,
+                    expected_spikes=neuron_type.expected_spikes,
+                    max_neuron_props=max_neuron_props,
+                    min_neuron_props=min_neuron_props,
+                    verbose=verbose,
+                    options=options,
+                    checkpoint=checkpoint,
+                    resume=resume,
+                    writer=writer,
+                    metrics=metrics,
+                    grid_range=grid_range,
+                    reporter=Progress_reporter(
+                        name=f"static{shard_suffix}",
+                        total=grid_size
+                        if grid_range is None
+                        else grid_range[1],
+                        mode=progress if verbose else "silent",
+                        start=0 if grid_range is None else grid_range[0],
+                    ),
+                )
+                if options.fixed_point_format is not None:
+                    write_fixed_point_discrepancies(
+                        filepath=f"{neuron_type.type_dir}/fixed_point_"
+                        + f"discrepancies{shard_suffix}.json",
+                        fixed_point_neuron_dicts=neuron_dicts,
+                        grid_range=grid_range,
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props=min_neuron_props,
+                        neuron_type=neuron_type,
+                        options=options,
+                        verbose=verbose,
+                    )
+            else:
+                neuron_dicts = get_refined_neurons(
+                    a_in_time=neuron_type.a_in_time,
+                    depth=refine_depth,
+                    disco=neuron_type.grid_spec,
+                    expected_spikes=neuron_type.expected_spikes,
+                    max_neuron_props=max_neuron_props,
+                    min_neuron_props=min_neuron_props,
+                    verbose=verbose,
+                    boundary_only=refine_boundary_only,
+                    metrics=metrics,
+                )
+                for neuron_dict in neuron_dicts:
+                    writer.write(neuron_dict)
+
+        if shard is not None and grid_range is not None:
+            write_shard_manifest(
+                fingerprint=fingerprint,
+                grid_range=grid_range,
+                neuron_type=neuron_type,
+                nr_of_neuron_dicts=len(neuron_dicts),
+                nr_of_shards=shard[1],
+                sha256=writer.get_sha256(),
+                shard=shard[0],
+            )
+        checkpoint.remove()
+        if metrics is not None:
+            metrics.export()
+
+    if store is not None:
+        store.insert(
+            neuron_dicts=neuron_dicts, neuron_type=neuron_type, search="static"
+        )
+    return neuron_dicts
+
+
+# pylint: disable=R0913
+@typechecked
+def write_fixed_point_discrepancies(
+    *,
+    filepath: str,
+    fixed_point_neuron_dicts: List[Dict[str, Union[float, int]]],
+    grid_range: Optional[Tuple[int, int]],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    neuron_type: Neuron_type,
+    options: Search_options,
+    verbose: bool,
+) -> None:
+    """Writes the neuron dicts of the candidates whose accept or reject
+    outcome in the fixed-point format differs from the float simulation,
+    with whether the fixed-point simulation accepts them.
+
+    The fixed_point_neuron_dicts are those that the fixed-point search
+    found. The float outcomes come from one search with the numpy
+    engine and the prefilter, over the same grid_range, with the other
+    options of the fixed-point search.
+    """
+    float_neuron_dicts: List[
+        Dict[str, Union[float, int]]
+    ] = get_satisfactory_neurons(
+        a_in_time=neuron_type.a_in_time,
+        disco=neuron_type.grid_spec,
+        expected_spikes=neuron_type.expected_spikes,
+        max_neuron_props=max_neuron_props,
+        min_neuron_props=min_neuron_props,
+        verbose=False,
+        options=replace(
+            options, engine="numpy", fixed_point_format=None, prefilter=True
+        ),
+        grid_range=grid_range,
+    )
+    discrepancies: List[
+        Dict[str, Union[float, int]]
+    ] = get_fixed_point_discrepancies(
+        fixed_point_neuron_dicts=fixed_point_neuron_dicts,
+        float_neuron_dicts=float_neuron_dicts,
+        grid=Parameter_grid(disco=neuron_type.grid_spec),
+    )
+    write_dict_to_file(filepath=filepath, neuron_dicts=discrepancies)
+    if verbose:
+        print(
+            f"{len(discrepancies)} candidates have another outcome in the "
+            + f"fixed-point format than in float, see:{filepath}"
+        )
+
+
+@typechecked
+def print_nearest_archived_neurons(
+    *, archive: Spike_archive, neuron_type: Neuron_type, k: int = 5
+) -> None:
+    """Prints the k archived neurons whose spike train is nearest to the
+    expected spikes of the neuron type, and their Hamming distance."""
+    index: Spike_index = Spike_index(
+        archive=archive,
+        disco=neuron_type.grid_spec,
+        nr_of_timesteps=len(neuron_type.expected_spikes),
+    )
+    print(f"No archived neuron shows the spikes of:{neuron_type.name}, the")
+    print(f"{k} nearest archived neurons are:")
+    for distance, neuron_dict in index.get_nearest(
+        k=k, spikes=neuron_type.expected_spikes
+    ):
+        print(f"Hamming distance:{distance}, {neuron_dict}")
+
+
+@typechecked
+def create_neuron_type_archive(
+    neuron_type: Neuron_type,
+    archive_dir: str,
+    nr_of_timesteps: Optional[int] = None,
+    extremes: bool = False,
+    progress: str = "bar",
+) -> Spike_archive:
+    """Creates a spike archive of the grid of the neuron type, with its
+    a_in_time, that answers the static search of any neuron type with the
+    same grid and a_in_time, see Spike_archive.
 
-        # Write neuron properties to file.
-        write_dict_to_file(filepath=output_filename, neuron_dicts=neuron_dicts)
+    The spike trains are nr_of_timesteps long, by default as long as the
+    expected spikes of the neuron type.
+    """
+    return create_spike_archive(
+        a_in_time=neuron_type.a_in_time,
+        archive_dir=archive_dir,
+        disco=neuron_type.grid_spec,
+        max_neuron_props=default_max_neuron_props,
+        min_neuron_props=default_min_neuron_props,
+        nr_of_timesteps=len(neuron_type.expected_spikes)
+        if nr_of_timesteps is None
+        else nr_of_timesteps,
+        extremes=extremes,
+        reporter=Progress_reporter(
+            name="archive",
+            total=len(Parameter_grid(disco=neuron_type.grid_spec)),
+            mode=progress,
+        ),
+    )
+
+
+@typechecked
+def find_multi_target_non_changing_neurons(
+    neuron_types: List[Neuron_type],
+    verbose: bool,
+    progress: str = "bar",
+    store: Optional[Result_store] = None,
+) -> Dict[str, List[Dict[str, Union[float, int]]]]:
+    """Finds the neurons with static properties of several neuron types that
+    share a grid, in one pass over the grid, see get_multi_target_neurons,
+    and returns them per neuron type name.
 
+    The neurons of each neuron type are written to its static.jsonl, and
+    inserted into the store, if given.
+    """
+    neuron_dicts: Dict[
+        str, List[Dict[str, Union[float, int]]]
+    ] = get_multi_target_neurons(
+        neuron_types=neuron_types,
+        max_neuron_props=default_max_neuron_props,
+        min_neuron_props=default_min_neuron_props,
+        reporter=Progress_reporter(
+            name="multi_target",
+            total=len(get_shared_grid(neuron_types=neuron_types))
+            * len({neuron_type.a_in_time for neuron_type in neuron_types}),
+            mode=progress if verbose else "silent",
+        ),
+    )
+    for neuron_type in neuron_types:
+        write_dicts_to_stream(
+            filepath=f"{neuron_type.type_dir}/static.jsonl",
+            neuron_dicts=neuron_dicts[neuron_type.name],
+        )
+        if store is not None:
+            store.insert(
+                neuron_dicts=neuron_dicts[neuron_type.name],
+                neuron_type=neuron_type,
+                search="static",
+            )
+        if verbose:
+            print(
+                f"Found {len(neuron_dicts[neuron_type.name])} static neurons "
+                + f"of:{neuron_type.name}"
+            )
     return neuron_dicts
 
 
@@ -66,10 +415,20 @@ def find_changing_neurons(
     static_neurons: List[Dict[str, Union[float, int]]],
     verify_shift: bool,
     verbose: bool,
+    resume: bool = False,
+    progress: str = "bar",
+    store: Optional[Result_store] = None,
 ) -> List[Dict[str, Union[int, float, str]]]:
     """Finds neurons that show a spike pattern after changing 1 property with a
     delta value of 1, per timestep.
 
+    The search progress is checkpointed in the neuron type directory,
+    with resume, an interrupted search continues from its checkpoint.
+    Simulation outcomes are cached, the cache hits and misses are
+    printed after the search. The progress and the found neurons are
+    reported in the progress mode, see Progress_reporter. The found
+    neurons are also inserted into the store, if given.
+
     In essence it is used to look for neurons that spike one time step later,
     *after/w.r.t. some input spike*, if you add +1 to some property.
 
@@ -80,6 +439,18 @@ def find_changing_neurons(
     print(f"neuron_type={neuron_type}")
     pprint(neuron_type.__dict__)
 
+    checkpoint: Search_checkpoint = Search_checkpoint(
+        filepath=f"{neuron_type.type_dir}/changing.checkpoint.json",
+        fingerprint={
+            "a_in_time": neuron_type.a_in_time,
+            "max_redundancy": max_redundancy,
+            "max_time": neuron_type.max_time,
+            "spike_output_type": neuron_type.spike_output_type,
+            "static_neurons": static_neurons,
+            "wait_after_input": neuron_type.wait_after_input,
+        },
+    )
+    cache: Simulation_cache = Simulation_cache()
     found_neurons: List[
         Dict[str, Union[int, float, str]]
     ] = spike_one_timestep_later_per_property(
@@ -87,7 +458,16 @@ def find_changing_neurons(
         neuron_type=neuron_type,
         max_redundancy=max_redundancy,
         wait_after_input=neuron_type.wait_after_input,
+        checkpoint=checkpoint,
+        resume=resume,
+        cache=cache,
+        reporter=Progress_reporter(
+            name="changing",
+            total=len(static_neurons) * len(explored_properties),
+            mode=progress,
+        ),
     )
+    print(cache.get_summary())
 
     if verify_shift:
         for found_neuron in found_neurons:
@@ -119,6 +499,13 @@ def find_changing_neurons(
     changing_filename: str = "changing.json"
     output_filename: str = f"{neuron_type.type_dir}/{changing_filename}"
     write_dict_to_file(filepath=output_filename, neuron_dicts=found_neurons)
+    checkpoint.remove()
+    if store is not None:
+        store.insert(
+            neuron_dicts=found_neurons,
+            neuron_type=neuron_type,
+            search="changing",
+        )
 
     return found_neurons
 
@@ -0,0 +1,142 @@
+"""Searches a grid for several neuron types at once: each candidate is
+simulated once per input pattern, and its spike train is checked against the
+expected spikes of every neuron type."""
+
+import json
+import warnings
+from functools import reduce
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.search.batch_simulation import (
+    get_batch_target_first_mismatches,
+    no_mismatch,
+)
+from neurondiscovery.search.prefilter import get_prefiltered_indices
+from neurondiscovery.search.print_behaviour import get_parameter_neuron_dict
+from neurondiscovery.search.progress_reporter import Progress_reporter
+from neurondiscovery.search.search_metrics import Search_metrics, measure
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def get_multi_target_neurons(
+    *,
+    neuron_types: List[Neuron_type],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    chunk_size: int = 10000,
+    prefilter: bool = True,
+    metrics: Optional[Search_metrics] = None,
+    reporter: Optional[Progress_reporter] = None,
+) -> Dict[str, List[Dict[str, Union[float, int]]]]:
+    """Returns per neuron type name the neuron dicts of the grid candidates
+    that show its expected spikes, in grid order, with the numpy engine.
+
+    The neuron types should share their grid. The input pattern of a
+    neuron type is its input spike at a_in_time, so the candidates are
+    simulated once per distinct a_in_time, for all neuron types with
+    that a_in_time. A candidate is only discarded, by the prefilter or
+    during the simulation, once it failed every neuron type. The
+    metrics, if given, record the time per stage. A warning is given if
+    no two neuron types share their a_in_time, as their candidates are
+    then simulated once per neuron type, like in separate searches.
+    """
+    grid: Parameter_grid = get_shared_grid(neuron_types=neuron_types)
+    a_in_times: List[int] = sorted(
+        {neuron_type.a_in_time for neuron_type in neuron_types}
+    )
+    if len(neuron_types) > 1 and len(a_in_times) == len(neuron_types):
+        warnings.warn(
+            "No two neuron types share their a_in_time:"
+            + f"{a_in_times}, so the grid is searched once per neuron "
+            + "type, without sharing simulations."
+        )
+    if reporter is None:
+        reporter = Progress_reporter(
+            name="multi_target",
+            total=len(grid) * len(a_in_times),
+            mode="silent",
+        )
+    neuron_dicts: Dict[str, List[Dict[str, Union[float, int]]]] = {
+        neuron_type.name: [] for neuron_type in neuron_types
+    }
+    for pass_index, a_in_time in enumerate(a_in_times):
+        targets: List[Neuron_type] = [
+            neuron_type
+            for neuron_type in neuron_types
+            if neuron_type.a_in_time == a_in_time
+        ]
+        for start, stop in grid.iter_chunks(chunk_size=chunk_size):
+            indices: np.ndarray = np.arange(start, stop, dtype=np.int64)
+            if prefilter:
+                with measure(metrics=metrics, stage="get_prefiltered_indices"):
+                    indices = reduce(
+                        np.union1d,
+                        [
+                            get_prefiltered_indices(
+                                a_in_time=a_in_time,
+                                expected_spikes=target.expected_spikes,
+                                grid=grid,
+                                max_neuron_props=max_neuron_props,
+                                min_neuron_props=min_neuron_props,
+                                start=start,
+                                stop=stop,
+                            )
+                            for target in targets
+                        ],
+                    )
+
+            with measure(metrics=metrics, stage="simulate_batch"):
+                first_mismatches: np.ndarray = (
+                    get_batch_target_first_mismatches(
+                        a_in_time=a_in_time,
+                        target_spikes=[
+                            target.expected_spikes for target in targets
+                        ],
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props=min_neuron_props,
+                        **grid.get_values(indices=indices),
+                    )
+                )
+            for target, target_mismatches in zip(targets, first_mismatches):
+                neuron_dicts[target.name].extend(
+                    get_parameter_neuron_dict(
+                        a_in_time=a_in_time, **grid.get_param_dict(index)
+                    )
+                    for index in indices[
+                        target_mismatches == no_mismatch
+                    ].tolist()
+                )
+            reporter.update(
+                position=pass_index * len(grid) + stop,
+                nr_found=sum(map(len, neuron_dicts.values())),
+            )
+    reporter.close()
+    return neuron_dicts
+
+
+@typechecked
+def get_shared_grid(*, neuron_types: List[Neuron_type]) -> Parameter_grid:
+    """Returns the grid of the neuron types, raises an error if they do not
+    share it or their names are not unique."""
+    if not neuron_types:
+        raise ValueError("Error, expected at least one neuron type.")
+    names: List[str] = [neuron_type.name for neuron_type in neuron_types]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Error, the neuron type names:{names} not unique.")
+    grid: Parameter_grid = Parameter_grid(disco=neuron_types[0].grid_spec)
+    for neuron_type in neuron_types[1:]:
+        if json.dumps(
+            Parameter_grid(disco=neuron_type.grid_spec).ranges
+        ) != json.dumps(grid.ranges):
+            raise ValueError(
+                f"Error, the grid of neuron type:{neuron_type.name} differs "
+                + f"from the grid of:{neuron_types[0].name}."
+            )
+    return grid
@@ -0,0 +1,115 @@
+"""Runs the chunks of a grid search on a pool of worker processes, and merges
+their results in grid order."""
+# pylint: disable=R0801
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from typeguard import typechecked
+
+from neurondiscovery.search.search_metrics import Search_metrics
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# Set in each worker process, tells the workers to stop simulating once
+# enough neurons are found.
+stop_event: Optional[Any] = None
+
+
+@typechecked
+def set_stop_event(event: Any) -> None:
+    """Stores the stop event in the worker process."""
+    # pylint: disable=W0603
+    global stop_event
+    stop_event = event
+
+
+@hot_path_typechecked
+def stop_requested() -> bool:
+    """Returns True if the main process asked the workers to stop."""
+    return stop_event is not None and stop_event.is_set()
+
+
+@typechecked
+def simulate_measured_chunk(
+    *,
+    simulate_chunk: Callable[..., List[int]],
+    trace_allocations: bool,
+    **chunk_kwargs: Any,
+) -> Tuple[List[int], Search_metrics]:
+    """Simulates a chunk in a worker process, and returns the metrics of the
+    worker along with the found grid indices."""
+    metrics: Search_metrics = Search_metrics(
+        trace_allocations=trace_allocations
+    )
+    return simulate_chunk(metrics=metrics, **chunk_kwargs), metrics
+
+
+# pylint: disable=R0913
+@typechecked
+def manage_parallel_simulation(
+    *,
+    chunk_kwargs: Dict[str, Any],
+    chunks: List[Tuple[int, int]],
+    complete_chunk: Callable[[int, List[int]], bool],
+    simulate_chunk: Callable[..., List[int]],
+    workers: int,
+    metrics: Optional[Search_metrics] = None,
+) -> None:
+    """Simulates the chunks on workers processes, and passes the grid indices
+    of the satisfactory candidates of each chunk to complete_chunk, in grid
+    order.
+
+    Each chunk is shipped as its (start, stop) grid index range, the
+    workers create the snns themselves. The results are collected in
+    chunk order, such that the search stops at the same neuron as a
+    single process search would, once complete_chunk returns True. The
+    metrics of each chunk are recorded in its worker, and added to the
+    metrics once the chunk is collected. The workers do not report
+    progress, complete_chunk reports the counts of the collected chunks.
+    """
+    event = multiprocessing.Event()
+    pending: Deque[Future] = deque()
+    next_chunk: int = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=set_stop_event,
+        initargs=(event,),
+    ) as executor:
+        while next_chunk < len(chunks) or pending:
+            # Keep at most two chunks per worker in flight.
+            while next_chunk < len(chunks) and len(pending) < 2 * workers:
+                start, stop = chunks[next_chunk]
+                if metrics is None:
+                    future: Future = executor.submit(
+                        simulate_chunk,
+                        start=start,
+                        stop=stop,
+                        **chunk_kwargs,
+                    )
+                else:
+                    future = executor.submit(
+                        simulate_measured_chunk,
+                        simulate_chunk=simulate_chunk,
+                        trace_allocations=metrics.trace_allocations,
+                        start=start,
+                        stop=stop,
+                        **chunk_kwargs,
+                    )
+                pending.append(future)
+                next_chunk += 1
+
+            chunk_stop: int = chunks[next_chunk - len(pending)][1]
+            chunk_indices: List[int]
+            if metrics is None:
+                chunk_indices = pending.popleft().result()
+            else:
+                chunk_indices, chunk_metrics = pending.popleft().result()
+                metrics.merge(chunk_metrics)
+            if complete_chunk(chunk_stop, chunk_indices):
+                event.set()
+                for future in pending:
+                    future.cancel()
+                return
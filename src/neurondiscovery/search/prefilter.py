@@ -0,0 +1,162 @@
+"""Discards the LIF neurons that spike before the input spike arrives, whilst
+the expected spike pattern requires them to be silent, without simulating
+their snns."""
+# pylint: disable=R0801
+
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+
+# Properties that do not change during a simulation.
+static_properties: List[str] = ["bias", "du", "dv", "vth"]
+
+
+@typechecked
+def get_silent_prefix_length(
+    *, a_in_time: int, expected_spikes: List[bool]
+) -> int:
+    """Returns the nr of timesteps, starting at t=0, in which the neuron
+    should not spike, and in which it does not yet receive the input spike.
+
+    The input spike reaches the neuron at t=a_in_time+1, and the
+    recurrent weight only acts after the first spike. So until then,
+    the trajectory only depends on (du, dv, bias, vth).
+    """
+    prefix_length: int = len(expected_spikes)
+    if a_in_time > 0:
+        prefix_length = min(prefix_length, a_in_time + 1)
+    for t in range(prefix_length):
+        if expected_spikes[t]:
+            return t
+    return prefix_length
+
+
+@typechecked
+def get_silent_prefix_mask(
+    *,
+    bias: np.ndarray,
+    dv: np.ndarray,
+    prefix_length: int,
+    vth: np.ndarray,
+) -> np.ndarray:
+    """Returns a boolean mask with the neurons that do not spike in the first
+    prefix_length timesteps, computed in closed form.
+
+    Without spikes and input u stays 0, so v[t]=v[t-1]*(1-dv)+bias,
+    which is v[t]=bias*(1-(1-dv)**t)/dv (or bias*t for dv=0). Neurons
+    within a rounding margin of vth are kept, such that the pre-filter
+    never discards a neuron that the simulation would accept.
+    """
+    silent: np.ndarray = np.ones(len(bias), dtype=bool)
+    if prefix_length < 2:
+        return silent
+
+    # The neuron can only spike from t=1 onwards.
+    t: np.ndarray = np.arange(1, prefix_length, dtype=np.float64)[None, :]
+    decay: np.ndarray = (1 - dv)[:, None]
+    with np.errstate(all="ignore"):
+        geometric_sum: np.ndarray = np.where(
+            decay == 1, t, (1 - decay**t) / (1 - decay)
+        )
+        abs_decay: np.ndarray = np.abs(decay)
+        abs_geometric_sum: np.ndarray = np.where(
+            abs_decay == 1, t, (1 - abs_decay**t) / (1 - abs_decay)
+        )
+        v: np.ndarray = bias[:, None] * geometric_sum
+        margin: np.ndarray = 1e-9 * (
+            1
+            + np.abs(bias[:, None]) * abs_geometric_sum
+            + np.abs(vth)[:, None]
+        )
+        spikes: np.ndarray = v > vth[:, None] + margin
+    silent &= ~spikes.any(axis=1)
+    return silent
+
+
+# pylint: disable=R0913
+@typechecked
+def get_provably_silent_mask(
+    *,
+    a_in: np.ndarray,
+    a_in_time: int,
+    bias: np.ndarray,
+    du: np.ndarray,
+    dv: np.ndarray,
+    prefix_length: int,
+    vth: np.ndarray,
+) -> np.ndarray:
+    """Returns a boolean mask with the candidates that do not spike in the
+    first prefix_length timesteps, whatever their weight.
+
+    Until the first spike, the weight is not used, so u only holds the
+    decayed input spike from t=a_in_time+1 onwards, and v follows from u
+    and bias as in the prefix of get_silent_prefix_mask. The arrays are
+    broadcast against each other. Unlike get_silent_prefix_mask,
+    candidates within a rounding margin of vth count as spiking, such
+    that no candidate that may spike is returned.
+    """
+    shape: Tuple[int, ...] = np.broadcast(a_in, bias, du, dv, vth).shape
+    u: np.ndarray = np.zeros(shape)
+    v: np.ndarray = np.zeros(shape)
+    # Upper bound of the magnitude of the terms that are summed in v.
+    abs_v: np.ndarray = np.zeros(shape)
+    silent: np.ndarray = np.ones(shape, dtype=bool)
+    for t in range(1, prefix_length):
+        u = u * (1 - du)
+        if a_in_time > 0 and t == a_in_time + 1:
+            u = u + a_in
+        v = v * (1 - dv) + u + bias
+        abs_v = abs_v * np.abs(1 - dv) + np.abs(u) + np.abs(bias)
+        silent &= v <= vth - 1e-9 * (1 + abs_v + np.abs(vth))
+    return silent
+
+
+# pylint: disable=R0913
+@typechecked
+def get_prefiltered_indices(
+    *,
+    a_in_time: int,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    start: int,
+    stop: int,
+) -> np.ndarray:
+    """Returns the grid indices in [start, stop) whose LIF neuron passes the
+    pre-filter, only those go on to the fan-out over weight and a_in.
+
+    A LIF neuron is discarded if it spikes when the expected spike
+    pattern requires silence before the input arrives, or if one of its
+    static properties is outside the neuron property bounds.
+    """
+    indices: np.ndarray = np.arange(start, stop, dtype=np.int64)
+    if start >= stop:
+        return indices
+
+    # Evaluate each LIF neuron once, for all its weight and a_in values.
+    neuron_indices: np.ndarray = indices // grid.fanout_size
+    first_neuron: int = int(neuron_indices[0])
+    neuron_props: Dict[str, np.ndarray] = grid.get_values(
+        indices=np.arange(first_neuron, int(neuron_indices[-1]) + 1)
+        * grid.fanout_size
+    )
+
+    passes: np.ndarray = get_silent_prefix_mask(
+        bias=neuron_props["bias"],
+        dv=neuron_props["dv"],
+        prefix_length=get_silent_prefix_length(
+            a_in_time=a_in_time, expected_spikes=expected_spikes
+        ),
+        vth=neuron_props["vth"],
+    )
+    for attr, min_val in min_neuron_props.items():
+        if attr in static_properties:
+            passes &= neuron_props[attr] >= min_val
+    for attr, max_val in max_neuron_props.items():
+        if attr in static_properties:
+            passes &= neuron_props[attr] <= max_val
+    return indices[passes[neuron_indices - first_neuron]]
@@ -0,0 +1,181 @@
+"""Simulates the grid as a tree over the parameters, ordered by when they
+first influence the neuron state, such that shared trajectory prefixes are
+computed once."""
+# pylint: disable=R0801
+
+from typing import Dict, List, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.batch_simulation import (
+    get_batch_decays,
+    simulate_batch_timestep,
+    within_batch_property_bounds,
+)
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# Marks a tree branch in which the parameter is not yet chosen.
+unresolved: int = -1
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def simulate_prefix_tree(
+    *,
+    a_in_time: int,
+    expected_spikes: List[bool],
+    grid: Parameter_grid,
+    indices: np.ndarray,
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+) -> np.ndarray:
+    """Returns the sorted grid indices, out of indices, of the candidates that
+    show the expected behaviour.
+
+    Each branch of the tree starts as one LIF neuron (du, dv, bias, vth)
+    that is shared by all its weight and a_in values. The branch is
+    forked over the weights once the neuron spikes, because the
+    recurrent synapse acts from the next timestep onwards, and forked
+    over a_in at t=a_in_time, because the input spike arrives at the
+    next timestep. A branch that deviates from the expected spikes, or
+    leaves the neuron property bounds, is pruned with all its
+    candidates.
+    """
+    nr_of_weights: int = len(grid.ranges["weight"])
+    nr_of_a_ins: int = len(grid.ranges["a_in"])
+    weights: np.ndarray = np.asarray(grid.ranges["weight"], dtype=np.float64)
+    a_ins: np.ndarray = np.asarray(grid.ranges["a_in"], dtype=np.float64)
+
+    # Create one branch per LIF neuron.
+    neurons: np.ndarray = np.unique(indices // grid.fanout_size)
+    neuron_props: Dict[str, np.ndarray] = grid.get_values(
+        indices=neurons * grid.fanout_size
+    )
+    branches: Dict[str, np.ndarray] = {
+        "neuron": neurons,
+        "weight_index": np.full(len(neurons), unresolved),
+        "a_in_index": np.full(len(neurons), unresolved),
+        "bias": neuron_props["bias"],
+        "du": neuron_props["du"],
+        "dv": neuron_props["dv"],
+        "vth": neuron_props["vth"],
+        "u": np.zeros(len(neurons)),
+        "v": np.zeros(len(neurons)),
+        "spikes": np.zeros(len(neurons), dtype=bool),
+    }
+
+    for t, expected_spike in enumerate(expected_spikes):
+        # Prune the branches that do not behave as desired.
+        behaves: np.ndarray = branches["spikes"] == expected_spike
+        behaves &= within_batch_property_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            neuron_props=branches,
+        )
+        if not behaves.all():
+            branches = select_branches(branches=branches, selection=behaves)
+        if len(branches["neuron"]) == 0 or t == len(expected_spikes) - 1:
+            break
+
+        # Fork the branches whose next timestep depends on a new parameter.
+        branches = fork_branches(
+            branches=branches,
+            fork=branches["spikes"] & (branches["weight_index"] == unresolved),
+            index_key="weight_index",
+            nr_of_values=nr_of_weights,
+        )
+        if a_in_time > 0 and t == a_in_time:
+            branches = fork_branches(
+                branches=branches,
+                fork=branches["a_in_index"] == unresolved,
+                index_key="a_in_index",
+                nr_of_values=nr_of_a_ins,
+            )
+
+        # Simulate the branches for timestep t+1.
+        u_decay, v_decay = get_batch_decays(
+            du=branches["du"], dv=branches["dv"]
+        )
+        (
+            branches["u"],
+            branches["v"],
+            branches["spikes"],
+        ) = simulate_batch_timestep(
+            a_in=a_ins[branches["a_in_index"]]
+            if a_in_time > 0 and t == a_in_time
+            else None,
+            bias=branches["bias"],
+            spikes=branches["spikes"],
+            u=branches["u"],
+            u_decay=u_decay,
+            v=branches["v"],
+            v_decay=v_decay,
+            vth=branches["vth"],
+            weight=weights[branches["weight_index"]],
+        )
+
+    return np.intersect1d(
+        get_branch_indices(branches=branches, grid=grid), indices
+    )
+
+
+@hot_path_typechecked
+def select_branches(
+    *, branches: Dict[str, np.ndarray], selection: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Returns the selected branches."""
+    return {key: values[selection] for key, values in branches.items()}
+
+
+@hot_path_typechecked
+def fork_branches(
+    *,
+    branches: Dict[str, np.ndarray],
+    fork: np.ndarray,
+    index_key: str,
+    nr_of_values: int,
+) -> Dict[str, np.ndarray]:
+    """Replaces each forked branch by one copy per value of a parameter, all
+    copies start from the shared state of the branch."""
+    if not fork.any():
+        return branches
+    forked: Dict[str, np.ndarray] = {
+        key: np.repeat(values[fork], nr_of_values)
+        for key, values in branches.items()
+    }
+    forked[index_key] = np.tile(np.arange(nr_of_values), int(fork.sum()))
+    return {
+        key: np.concatenate([values[~fork], forked[key]])
+        for key, values in branches.items()
+    }
+
+
+@typechecked
+def get_branch_indices(
+    *, branches: Dict[str, np.ndarray], grid: Parameter_grid
+) -> np.ndarray:
+    """Returns the grid indices of all candidates in the branches.
+
+    A parameter that is unresolved at the end of a branch never
+    influenced its trajectory, so all of its values are included.
+    """
+    branches = fork_branches(
+        branches=branches,
+        fork=branches["weight_index"] == unresolved,
+        index_key="weight_index",
+        nr_of_values=len(grid.ranges["weight"]),
+    )
+    branches = fork_branches(
+        branches=branches,
+        fork=branches["a_in_index"] == unresolved,
+        index_key="a_in_index",
+        nr_of_values=len(grid.ranges["a_in"]),
+    )
+    return (
+        branches["neuron"] * grid.fanout_size
+        + branches["weight_index"] * grid.strides["weight"]
+        + branches["a_in_index"] * grid.strides["a_in"]
+    )
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Union
 import networkx as nx
 from typeguard import typechecked
 
+from neurondiscovery.type_checks import hot_path_typechecked
+
 
 @typechecked
 def manage_printing(
@@ -23,7 +25,7 @@ def manage_printing(
     """Prints relevant simulation data if desired.."""
     # Print found neuron results.
     print("")
-    if len(working_snns) > 0:
+    if len(neuron_dicts) > 0:
         print("Found the following neurons that satisfy the requirements:")
     else:
         print(
@@ -87,7 +89,33 @@ def get_node_name_neuron_dicts(
     return neuron_dicts
 
 
-@typechecked
+# pylint: disable=R0913
+@hot_path_typechecked
+def get_parameter_neuron_dict(
+    *,
+    a_in: Union[float, int],
+    a_in_time: int,
+    bias: Union[float, int],
+    du: Union[float, int],
+    dv: Union[float, int],
+    vth: Union[float, int],
+    weight: Union[float, int],
+) -> Dict[str, Union[float, int]]:
+    """Returns the neuron dict that get_node_name_neuron_dicts returns for the
+    snn that create_snn creates from these parameters."""
+    return {
+        # create_snn does not create an input synapse if a_in is 0.
+        "a_in": a_in if a_in != 0 else 0,
+        "a_in_time": a_in_time,
+        "bias": float(bias),
+        "du": float(du),
+        "dv": float(dv),
+        "vth": float(vth),
+        "weight": weight,
+    }
+
+
+@hot_path_typechecked
 def drawProgressBar(
     percent: float, barLen: int, n_found: Optional[int] = None
 ) -> None:
@@ -109,7 +137,7 @@ def drawProgressBar(
     sys.stdout.flush()
 
 
-@typechecked
+@hot_path_typechecked
 def get_synapse_weight(*, snn: nx.DiGraph, left: str, right: str) -> int:
     """Returns the weight of a synapse if it exists.
 
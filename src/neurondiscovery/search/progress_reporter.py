@@ -0,0 +1,122 @@
+"""Reports the progress of a search at most once per interval, such that the
+simulation loop only updates counters instead of writing to the terminal."""
+
+import json
+import sys
+import time
+from typing import Any, List, Optional, TextIO, Tuple
+
+from typeguard import typechecked
+
+from neurondiscovery.search.print_behaviour import drawProgressBar
+
+supported_progress_modes: List[str] = ["bar", "log", "silent"]
+
+
+# pylint: disable=R0902
+class Progress_reporter:
+    """Keeps the position and the nr of found neurons of a search, and reports
+    them at most once per interval seconds.
+
+    In "bar" mode, the progress is drawn as a progress bar on stdout, and
+    events are printed. In "log" mode, each report and event is written
+    as one JSON line to the log file, stderr by default, for batch jobs.
+    In "silent" mode nothing is reported. close() reports the final
+    counts. The positions are grid indices, the progress is counted from
+    start to total.
+
+    Example usage: reporter=Progress_reporter(name="static", total=100)
+    """
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        name: str,
+        total: int,
+        mode: str = "bar",
+        interval: float = 1.0,
+        log_file: Optional[TextIO] = None,
+        start: int = 0,
+    ) -> None:
+        if mode not in supported_progress_modes:
+            raise NotImplementedError(f"Error, mode={mode} not yet supported.")
+        self.name: str = name
+        self.total: int = total
+        self.mode: str = mode
+        self.interval: float = interval
+        self.log_file: TextIO = sys.stderr if log_file is None else log_file
+        self.start_position: int = start
+        self.position: int = start
+        self.nr_found: int = 0
+        self.start: float = time.monotonic()
+        self.next_report: float = self.start
+        # The (position, nr_found) of the last report.
+        self.reported: Optional[Tuple[int, int]] = None
+
+    # Not typechecked, because it is called for every simulated candidate.
+    def update(self, *, position: int, nr_found: int) -> None:
+        """Stores the position up to which the search completed and the nr of
+        found neurons, and reports them if the interval has passed."""
+        self.position = position
+        self.nr_found = nr_found
+        if self.mode != "silent" and time.monotonic() >= self.next_report:
+            self.report()
+
+    @typechecked
+    def report(self) -> None:
+        """Reports the current position and nr of found neurons."""
+        if self.mode == "bar":
+            drawProgressBar(
+                percent=(self.position - self.start_position)
+                / (self.total - self.start_position)
+                if self.total > self.start_position
+                else 1.0,
+                barLen=100,
+                n_found=self.nr_found,
+            )
+        elif self.mode == "log":
+            self.write_log_line(
+                event="progress",
+                position=self.position,
+                total=self.total,
+                nr_found=self.nr_found,
+            )
+        self.next_report = time.monotonic() + self.interval
+        self.reported = (self.position, self.nr_found)
+
+    @typechecked
+    def event(self, event: str, **fields: Any) -> None:
+        """Reports an event of the search, e.g. a found changing neuron."""
+        if self.mode == "bar":
+            print(f"{event}: {fields}")
+        elif self.mode == "log":
+            self.write_log_line(event=event, **fields)
+
+    @typechecked
+    def write_log_line(self, event: str, **fields: Any) -> None:
+        """Writes an event with its fields and the elapsed time as one JSON
+        line to the log file."""
+        self.log_file.write(
+            json.dumps(
+                {
+                    "search": self.name,
+                    "event": event,
+                    "elapsed_s": round(time.monotonic() - self.start, 3),
+                    **fields,
+                }
+            )
+            + "\n"
+        )
+        self.log_file.flush()
+
+    @typechecked
+    def close(self) -> None:
+        """Reports the final position and nr of found neurons, unless they
+        were reported already."""
+        if self.mode == "silent":
+            return
+        if self.reported != (self.position, self.nr_found):
+            self.report()
+        if self.mode == "bar":
+            print("")
@@ -0,0 +1,249 @@
+"""Searches a Discovery specification coarse-to-fine: the coarse grid is
+simulated first, and only the grid cells around the hits are subdivided, such
+that continuous ranges are covered without simulating a dense grid."""
+
+import itertools
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.batch_simulation import (
+    get_batch_first_mismatches,
+    no_mismatch,
+)
+from neurondiscovery.search.print_behaviour import get_parameter_neuron_dict
+from neurondiscovery.search.search_metrics import Search_metrics, measure
+
+# The continuous properties that are refined, weight and a_in are integer
+# valued, so their values are kept as in the Discovery specification.
+refined_properties: List[str] = ["du", "dv", "bias", "vth"]
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def get_refined_neurons(
+    *,
+    a_in_time: int,
+    depth: int,
+    disco: Discovery,
+    expected_spikes: List[bool],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    verbose: bool,
+    boundary_only: bool = False,
+    chunk_size: int = 10000,
+    coarse_step: Optional[int] = None,
+    metrics: Optional[Search_metrics] = None,
+) -> List[Dict[str, Union[float, int]]]:
+    """Returns the neuron dicts that show the expected spikes, found by
+    refining a coarse grid of the Discovery specification depth times.
+
+    Only du, dv, bias and vth are refined. The coarse grid takes every
+    coarse_step-th value of their ranges, and their last value, by
+    default every 2**depth-th value. A cell is the box between adjacent
+    coarse (du, dv, bias, vth) values, its corners are LIF neurons that
+    are simulated with every weight and a_in value. A corner is a hit if
+    any of its candidates shows the expected spikes. Each refinement
+    halves the cells that have a hit corner, or with boundary_only,
+    only the cells that have both hit and missed corners. So at depth
+    d, the hits lie on a grid that is 2**d times as fine as the coarse
+    grid, which is the grid of the Discovery for evenly spaced ranges
+    and the default coarse_step. The neuron dicts are sorted on (du,
+    dv, bias, vth), like the grid of a Discovery with ascending ranges.
+    """
+    if depth < 0:
+        raise ValueError(f"Error, depth={depth} should be >=0.")
+    if coarse_step is None:
+        coarse_step = 2**depth
+    if coarse_step < 1:
+        raise ValueError(
+            f"Error, coarse_step={coarse_step} should be positive."
+        )
+    grid: Parameter_grid = Parameter_grid(disco=disco)
+    axes: List[List[float]] = [
+        get_coarse_axis(
+            step=coarse_step,
+            values=sorted(
+                {float(value) for value in grid.ranges[the_property]}
+            ),
+        )
+        for the_property in refined_properties
+    ]
+    # The (weight, a_in) values with which each LIF neuron is simulated.
+    fanout: List[Tuple[Union[float, int], Union[float, int]]] = list(
+        itertools.product(grid.ranges["weight"], grid.ranges["a_in"])
+    )
+
+    # The satisfactory (weight, a_in) values per simulated LIF neuron.
+    outcomes: Dict[Tuple[float, ...], List[Tuple]] = {}
+    cells: Set[Tuple[Tuple[float, float], ...]] = set(
+        itertools.product(*[get_intervals(values=axis) for axis in axes])
+    )
+    simulate_lif_neurons(
+        a_in_time=a_in_time,
+        chunk_size=chunk_size,
+        expected_spikes=expected_spikes,
+        fanout=fanout,
+        lif_neurons=list(itertools.product(*axes)),
+        max_neuron_props=max_neuron_props,
+        metrics=metrics,
+        min_neuron_props=min_neuron_props,
+        outcomes=outcomes,
+    )
+    if verbose:
+        print(
+            f"Refinement level:0, simulated:{len(outcomes)} LIF neurons, "
+            + f"hits:{sum(bool(hits) for hits in outcomes.values())}"
+        )
+
+    for level in range(1, depth + 1):
+        refined_cells: Set[Tuple[Tuple[float, float], ...]] = {
+            sub_cell
+            for cell in cells
+            if is_refined(
+                boundary_only=boundary_only,
+                corner_hits=[
+                    bool(outcomes[corner])
+                    for corner in itertools.product(*cell)
+                ],
+            )
+            for sub_cell in get_sub_cells(cell=cell)
+        }
+        simulate_lif_neurons(
+            a_in_time=a_in_time,
+            chunk_size=chunk_size,
+            expected_spikes=expected_spikes,
+            fanout=fanout,
+            lif_neurons=sorted(
+                {
+                    corner
+                    for cell in refined_cells
+                    for corner in itertools.product(*cell)
+                }.difference(outcomes)
+            ),
+            max_neuron_props=max_neuron_props,
+            metrics=metrics,
+            min_neuron_props=min_neuron_props,
+            outcomes=outcomes,
+        )
+        cells = refined_cells
+        if verbose:
+            print(
+                f"Refinement level:{level}, refined cells:{len(cells)}, "
+                + f"simulated:{len(outcomes)} LIF neurons, hits:"
+                + f"{sum(bool(hits) for hits in outcomes.values())}"
+            )
+
+    return [
+        get_parameter_neuron_dict(
+            a_in_time=a_in_time,
+            **dict(zip(refined_properties, lif_neuron)),
+            weight=weight,
+            a_in=a_in,
+        )
+        for lif_neuron in sorted(outcomes)
+        for weight, a_in in outcomes[lif_neuron]
+    ]
+
+
+@typechecked
+def get_coarse_axis(*, step: int, values: List[float]) -> List[float]:
+    """Returns every step-th of the sorted values, and the last value, such
+    that the coarse axis spans the same range."""
+    return values[::step] + ([values[-1]] if (len(values) - 1) % step else [])
+
+
+@typechecked
+def get_intervals(*, values: List[float]) -> List[Tuple[float, float]]:
+    """Returns the intervals between adjacent values, or the single value as
+    interval if there is only one value."""
+    if len(values) == 1:
+        return [(values[0], values[0])]
+    return list(zip(values[:-1], values[1:]))
+
+
+@typechecked
+def get_sub_cells(
+    *, cell: Tuple[Tuple[float, float], ...]
+) -> List[Tuple[Tuple[float, float], ...]]:
+    """Returns the cells that result from halving the cell in each
+    dimension."""
+    return list(
+        itertools.product(
+            *[
+                [(low, (low + high) / 2), ((low + high) / 2, high)]
+                for low, high in cell
+            ]
+        )
+    )
+
+
+@typechecked
+def is_refined(*, boundary_only: bool, corner_hits: List[bool]) -> bool:
+    """Returns True if a corner of a cell is a hit, and if boundary_only,
+    another corner is a miss."""
+    if boundary_only:
+        return any(corner_hits) and not all(corner_hits)
+    return any(corner_hits)
+
+
+# pylint: disable=R0913
+@typechecked
+def simulate_lif_neurons(
+    *,
+    a_in_time: int,
+    chunk_size: int,
+    expected_spikes: List[bool],
+    fanout: List[Tuple[Union[float, int], Union[float, int]]],
+    lif_neurons: List[Tuple[float, ...]],
+    max_neuron_props: Dict[str, Union[float, int]],
+    metrics: Optional[Search_metrics],
+    min_neuron_props: Dict[str, Union[float, int]],
+    outcomes: Dict[Tuple[float, ...], List[Tuple]],
+) -> None:
+    """Simulates each LIF neuron with each (weight, a_in) of the fanout, with
+    the numpy engine, and stores its satisfactory (weight, a_in) values in
+    the outcomes."""
+    fanout_values: np.ndarray = np.asarray(fanout, dtype=np.float64)
+    neurons_per_chunk: int = max(1, chunk_size // len(fanout))
+    for start in range(0, len(lif_neurons), neurons_per_chunk):
+        chunk: np.ndarray = np.asarray(
+            lif_neurons[start : start + neurons_per_chunk], dtype=np.float64
+        )
+        # One candidate per (LIF neuron, weight, a_in), a_in changes fastest.
+        neuron_props: Dict[str, np.ndarray] = {
+            the_property: np.repeat(chunk[:, position], len(fanout))
+            for position, the_property in enumerate(refined_properties)
+        }
+        neuron_props["weight"] = np.tile(fanout_values[:, 0], len(chunk))
+        neuron_props["a_in"] = np.tile(fanout_values[:, 1], len(chunk))
+        out_of_bounds: np.ndarray = np.zeros(
+            len(chunk) * len(fanout), dtype=bool
+        )
+        with measure(metrics=metrics, stage="simulate_batch"):
+            first_mismatches: np.ndarray = get_batch_first_mismatches(
+                a_in_time=a_in_time,
+                expected_spikes=expected_spikes,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                out_of_bounds=out_of_bounds,
+                **neuron_props,
+            )
+        if metrics is not None:
+            metrics.add_batch_outcomes(
+                first_mismatches=first_mismatches, out_of_bounds=out_of_bounds
+            )
+        accepted: np.ndarray = (first_mismatches == no_mismatch).reshape(
+            len(chunk), len(fanout)
+        )
+        for lif_neuron, neuron_accepted in zip(
+            lif_neurons[start : start + neurons_per_chunk], accepted
+        ):
+            outcomes[lif_neuron] = [
+                fanout[position]
+                for position in np.flatnonzero(neuron_accepted).tolist()
+            ]
@@ -0,0 +1,306 @@
+"""Records where the time of a search is spent: the wall time and allocation
+peaks per stage, and at which timestep and why candidates are rejected."""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# Reasons for which a simulated candidate is rejected.
+rejection_reasons: List[str] = ["spike_mismatch", "property_bounds"]
+
+
+class Search_metrics:
+    """Wall time, nr of calls and allocation peak per search stage, and a
+    histogram of the timesteps at which candidates are rejected, per
+    rejection reason.
+
+    Stages are named after the function they measure, and nest: the
+    wall time of a stage includes that of the stages it calls. The
+    allocation peak is the highest traced memory above its level at the
+    start of the stage, it is only recorded with trace_allocations,
+    because tracemalloc slows down the search. If a json and/or
+    prometheus filepath is given, the metrics are written to it at most
+    once per export_interval seconds during the search, and by export().
+
+    Example usage: metrics=Search_metrics(json_filepath="metrics.json")
+    """
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        json_filepath: Optional[str] = None,
+        prometheus_filepath: Optional[str] = None,
+        export_interval: float = 60.0,
+        trace_allocations: bool = False,
+    ) -> None:
+        self.json_filepath: Optional[str] = json_filepath
+        self.prometheus_filepath: Optional[str] = prometheus_filepath
+        self.export_interval: float = export_interval
+        self.trace_allocations: bool = trace_allocations
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.rejections: Dict[str, Dict[int, int]] = {
+            reason: {} for reason in rejection_reasons
+        }
+        self.nr_accepted: int = 0
+        self.nr_prefiltered: int = 0
+        self.nr_deduplicated: int = 0
+        # The traced memory at the start of each open stage, and its peak.
+        self.open_stages: List[List[int]] = []
+        self.last_export: float = time.monotonic()
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # Not typechecked, because it is called at every simulated timestep.
+    @contextlib.contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Records the wall time, and the allocation peak, of the code that
+        runs within the context."""
+        if self.trace_allocations:
+            self.open_stage()
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time: float = time.perf_counter() - start
+            stage_metrics: Dict[str, Any] = self.stages.setdefault(
+                stage,
+                {"calls": 0, "wall_time_s": 0.0, "allocation_peak_bytes": 0},
+            )
+            stage_metrics["calls"] += 1
+            stage_metrics["wall_time_s"] += wall_time
+            if self.trace_allocations:
+                stage_metrics["allocation_peak_bytes"] = max(
+                    stage_metrics["allocation_peak_bytes"], self.close_stage()
+                )
+
+    @typechecked
+    def open_stage(self) -> None:
+        """Passes the traced memory peak so far to the enclosing stage, and
+        starts tracing the peak of a new stage."""
+        current, peak = tracemalloc.get_traced_memory()
+        if self.open_stages:
+            self.open_stages[-1][1] = max(self.open_stages[-1][1], peak)
+        tracemalloc.reset_peak()
+        self.open_stages.append([current, current])
+
+    @typechecked
+    def close_stage(self) -> int:
+        """Returns the traced memory peak of the innermost stage above its
+        start, and passes the peak to the enclosing stage."""
+        start, peak = self.open_stages.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if self.open_stages:
+            self.open_stages[-1][1] = max(self.open_stages[-1][1], peak)
+        tracemalloc.reset_peak()
+        return peak - start
+
+    @hot_path_typechecked
+    def reject(self, *, reason: str, t: int) -> None:
+        """Records a candidate that is rejected at timestep t."""
+        if reason not in rejection_reasons:
+            raise NotImplementedError(
+                f"Error, reason={reason} not yet supported."
+            )
+        self.rejections[reason][t] = self.rejections[reason].get(t, 0) + 1
+
+    @hot_path_typechecked
+    def accept(self, nr_of_candidates: int = 1) -> None:
+        """Records candidates that show the expected behaviour."""
+        self.nr_accepted += nr_of_candidates
+
+    @typechecked
+    def add_prefiltered(self, nr_of_candidates: int) -> None:
+        """Records candidates that the prefilter discarded without
+        simulating them."""
+        self.nr_prefiltered += nr_of_candidates
+
+    @typechecked
+    def add_deduplicated(self, nr_of_candidates: int) -> None:
+        """Records candidates that were not simulated, because an equivalent
+        candidate was."""
+        self.nr_deduplicated += nr_of_candidates
+
+    @typechecked
+    def add_batch_outcomes(
+        self, *, first_mismatches: np.ndarray, out_of_bounds: np.ndarray
+    ) -> None:
+        """Records the outcomes of a batch of candidates, with per candidate
+        its first mismatch (-1 if it is accepted), and whether it left the
+        neuron property bounds."""
+        rejected: np.ndarray = first_mismatches >= 0
+        self.accept(int(np.count_nonzero(~rejected)))
+        for reason, mask in (
+            ("spike_mismatch", rejected & ~out_of_bounds),
+            ("property_bounds", rejected & out_of_bounds),
+        ):
+            timesteps, counts = np.unique(
+                first_mismatches[mask], return_counts=True
+            )
+            for t, count in zip(timesteps.tolist(), counts.tolist()):
+                self.rejections[reason][t] = (
+                    self.rejections[reason].get(t, 0) + count
+                )
+
+    @typechecked
+    def merge(self, other: "Search_metrics") -> None:
+        """Adds the metrics of another search, e.g. of a worker process."""
+        for stage, other_metrics in other.stages.items():
+            stage_metrics: Dict[str, Any] = self.stages.setdefault(
+                stage,
+                {"calls": 0, "wall_time_s": 0.0, "allocation_peak_bytes": 0},
+            )
+            stage_metrics["calls"] += other_metrics["calls"]
+            stage_metrics["wall_time_s"] += other_metrics["wall_time_s"]
+            stage_metrics["allocation_peak_bytes"] = max(
+                stage_metrics["allocation_peak_bytes"],
+                other_metrics["allocation_peak_bytes"],
+            )
+        for reason, histogram in other.rejections.items():
+            for t, count in histogram.items():
+                self.rejections[reason][t] = (
+                    self.rejections[reason].get(t, 0) + count
+                )
+        self.nr_accepted += other.nr_accepted
+        self.nr_prefiltered += other.nr_prefiltered
+        self.nr_deduplicated += other.nr_deduplicated
+
+    @typechecked
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the metrics as a JSON serialisable dict."""
+        return {
+            "stages": self.stages,
+            "rejections": {
+                reason: {str(t): histogram[t] for t in sorted(histogram)}
+                for reason, histogram in self.rejections.items()
+            },
+            "nr_accepted": self.nr_accepted,
+            "nr_prefiltered": self.nr_prefiltered,
+            "nr_deduplicated": self.nr_deduplicated,
+        }
+
+    @typechecked
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format, with
+        the rejection timesteps as a cumulative histogram."""
+        lines: List[str] = [
+            "# HELP neurondiscovery_stage_seconds_total Wall time per stage.",
+            "# TYPE neurondiscovery_stage_seconds_total counter",
+        ]
+        lines += [
+            f'neurondiscovery_stage_seconds_total{{stage="{stage}"}} '
+            + f"{stage_metrics['wall_time_s']}"
+            for stage, stage_metrics in sorted(self.stages.items())
+        ]
+        lines += [
+            "# HELP neurondiscovery_stage_calls_total Nr of calls per stage.",
+            "# TYPE neurondiscovery_stage_calls_total counter",
+        ]
+        lines += [
+            f'neurondiscovery_stage_calls_total{{stage="{stage}"}} '
+            + f"{stage_metrics['calls']}"
+            for stage, stage_metrics in sorted(self.stages.items())
+        ]
+        lines += [
+            "# HELP neurondiscovery_stage_allocation_peak_bytes Peak traced "
+            + "memory per stage.",
+            "# TYPE neurondiscovery_stage_allocation_peak_bytes gauge",
+        ]
+        lines += [
+            f'neurondiscovery_stage_allocation_peak_bytes{{stage="{stage}"}} '
+            + f"{stage_metrics['allocation_peak_bytes']}"
+            for stage, stage_metrics in sorted(self.stages.items())
+        ]
+        lines += [
+            "# HELP neurondiscovery_candidates_total Nr of candidates that "
+            + "were accepted, prefiltered or deduplicated.",
+            "# TYPE neurondiscovery_candidates_total counter",
+            'neurondiscovery_candidates_total{outcome="accepted"} '
+            + f"{self.nr_accepted}",
+            'neurondiscovery_candidates_total{outcome="prefiltered"} '
+            + f"{self.nr_prefiltered}",
+            'neurondiscovery_candidates_total{outcome="deduplicated"} '
+            + f"{self.nr_deduplicated}",
+            "# HELP neurondiscovery_rejection_timestep Timestep at which "
+            + "candidates were rejected.",
+            "# TYPE neurondiscovery_rejection_timestep histogram",
+        ]
+        max_t: int = max(
+            (
+                max(histogram, default=0)
+                for histogram in self.rejections.values()
+            ),
+            default=0,
+        )
+        for reason, histogram in self.rejections.items():
+            nr_rejected: int = 0
+            for t in range(max_t + 1):
+                nr_rejected += histogram.get(t, 0)
+                lines.append(
+                    "neurondiscovery_rejection_timestep_bucket"
+                    + f'{{reason="{reason}",le="{t}"}} {nr_rejected}'
+                )
+            lines += [
+                "neurondiscovery_rejection_timestep_bucket"
+                + f'{{reason="{reason}",le="+Inf"}} {nr_rejected}',
+                f'neurondiscovery_rejection_timestep_sum{{reason="{reason}"}} '
+                + f"{sum(t * count for t, count in histogram.items())}",
+                "neurondiscovery_rejection_timestep_count"
+                + f'{{reason="{reason}"}} {nr_rejected}',
+            ]
+        return "\n".join(lines) + "\n"
+
+    @typechecked
+    def export(self) -> None:
+        """Writes the metrics to the json and prometheus filepaths, if given.
+
+        The files are replaced atomically, such that a reader, e.g. the
+        textfile collector of the Prometheus node exporter, never sees
+        a partially written file.
+        """
+        if self.json_filepath is not None:
+            write_text_atomically(
+                filepath=self.json_filepath,
+                text=json.dumps(self.to_dict(), indent=2),
+            )
+        if self.prometheus_filepath is not None:
+            write_text_atomically(
+                filepath=self.prometheus_filepath, text=self.to_prometheus()
+            )
+        self.last_export = time.monotonic()
+
+    @typechecked
+    def maybe_export(self) -> None:
+        """Exports the metrics if the export interval has passed since the
+        last export."""
+        if time.monotonic() - self.last_export >= self.export_interval:
+            self.export()
+
+
+# Not typechecked, because it is called at every simulated timestep.
+def measure(
+    *, metrics: Optional[Search_metrics], stage: str
+) -> ContextManager[None]:
+    """Returns a context that measures the stage, or does nothing if there
+    are no metrics."""
+    if metrics is None:
+        return contextlib.nullcontext()
+    return metrics.measure(stage)
+
+
+@typechecked
+def write_text_atomically(*, filepath: str, text: str) -> None:
+    """Writes the text to a temporary file, and then replaces the file with
+    it."""
+    tmp_filepath: str = f"{filepath}.tmp"
+    with open(tmp_filepath, "w", encoding="utf-8") as text_file:
+        text_file.write(text)
+    os.replace(tmp_filepath, filepath)
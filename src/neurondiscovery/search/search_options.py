@@ -0,0 +1,61 @@
+"""Contains the options that determine how the static neuron search simulates
+the grid candidates."""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+
+supported_engines: List[str] = ["networkx", "numpy", "tree", "fixed_point"]
+supported_validations: List[str] = ["every_step", "once", "sample"]
+
+
+# pylint: disable=R0902
+@typechecked
+@dataclass
+class Search_options:
+    """Options of get_satisfactory_neurons, which are passed on to each chunk
+    of the search.
+
+    The engine is either "networkx", "numpy", "tree" or "fixed_point",
+    see get_satisfactory_neurons. The fixed_point engine uses the
+    fixed_point_format (by default Fixed_point_format()), and never the
+    prefilter, as the prefilter computes the float trajectories. The
+    other engines ignore the fixed_point_format.
+
+    Example usage: options=Search_options(engine="numpy", workers=4)
+    """
+
+    engine: str = "networkx"
+    chunk_size: int = 10000
+    prefilter: bool = True
+    workers: int = 1
+    min_nr_of_neurons: Optional[int] = None
+    validation: str = "once"
+    validation_sample_rate: float = 0.01
+    detect_cycles: bool = False
+    fixed_point_format: Optional[Fixed_point_format] = None
+    canonicalize: bool = False
+
+    def __post_init__(self) -> None:
+        if self.engine not in supported_engines:
+            raise NotImplementedError(
+                f"Error, engine={self.engine} not yet supported."
+            )
+        if self.detect_cycles and self.engine == "tree":
+            raise NotImplementedError(
+                f"Error, detecting state cycles with engine={self.engine} "
+                + "not yet supported."
+            )
+        if self.validation not in supported_validations:
+            raise NotImplementedError(
+                f"Error, validation={self.validation} not yet supported."
+            )
+        if self.engine == "fixed_point":
+            if self.fixed_point_format is None:
+                self.fixed_point_format = Fixed_point_format()
+            self.prefilter = False
+        else:
+            self.fixed_point_format = None
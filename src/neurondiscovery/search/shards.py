@@ -0,0 +1,192 @@
+"""Divides the grid of a search over shards that run on separate machines, and
+merges the neuron dicts that the shards found."""
+
+import json
+import os
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.import_export import (
+    load_dict_and_checksum_from_file,
+    write_dicts_to_stream,
+)
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+
+
+@typechecked
+def get_shard_range(
+    *, grid_size: int, nr_of_shards: int, shard: int
+) -> Tuple[int, int]:
+    """Returns the [start, stop) grid indices of a shard.
+
+    The shards are consecutive and differ at most 1 in size, such that
+    concatenating the neuron dicts of the shards yields grid order.
+    """
+    if not 0 <= shard < nr_of_shards:
+        raise ValueError(
+            f"Error, shard={shard} should be in [0, {nr_of_shards})."
+        )
+    return (
+        shard * grid_size // nr_of_shards,
+        (shard + 1) * grid_size // nr_of_shards,
+    )
+
+
+@typechecked
+def get_shard_filepath(
+    *, neuron_type: Neuron_type, shard: int, suffix: str
+) -> str:
+    """Returns the filepath of a shard file, e.g. static.shard-0.jsonl."""
+    return f"{neuron_type.type_dir}/static.shard-{shard}.{suffix}"
+
+
+# pylint: disable=R0913
+@typechecked
+def write_shard_manifest(
+    *,
+    fingerprint: Dict[str, Any],
+    grid_range: Tuple[int, int],
+    neuron_type: Neuron_type,
+    nr_of_neuron_dicts: int,
+    nr_of_shards: int,
+    sha256: str,
+    shard: int,
+) -> None:
+    """Marks a shard as complete, by storing its settings and the checksum of
+    its neuron dicts, as in the footer of its .jsonl file, next to them."""
+    filepath: str = get_shard_filepath(
+        neuron_type=neuron_type, shard=shard, suffix="manifest.json"
+    )
+    tmp_filepath: str = f"{filepath}.tmp"
+    with open(tmp_filepath, "w", encoding="utf-8") as manifest_file:
+        json.dump(
+            {
+                "shard": shard,
+                "nr_of_shards": nr_of_shards,
+                "grid_range": list(grid_range),
+                "fingerprint": fingerprint,
+                "nr_of_neuron_dicts": nr_of_neuron_dicts,
+                "sha256": sha256,
+            },
+            manifest_file,
+        )
+    os.replace(tmp_filepath, filepath)
+
+
+@typechecked
+def merge_shards(
+    *, neuron_type: Neuron_type
+) -> List[Dict[str, Union[float, int, str]]]:
+    """Merges the neuron dicts of all shards of a static search, in grid
+    order and without duplicates, into static.jsonl, and returns them.
+
+    Raises an error if a shard is missing or incomplete, or if the
+    shards belong to a different search than the neuron type.
+    """
+    first_manifest: Dict[str, Any] = load_shard_manifest(
+        neuron_type=neuron_type, shard=0
+    )
+    grid_size: int = len(Parameter_grid(disco=neuron_type.grid_spec))
+    neuron_dicts: List[Dict[str, Union[float, int, str]]] = []
+    seen: Set[Tuple] = set()
+    for shard in range(first_manifest["nr_of_shards"]):
+        manifest: Dict[str, Any] = load_shard_manifest(
+            neuron_type=neuron_type, shard=shard
+        )
+        verify_shard_manifest(
+            first_manifest=first_manifest,
+            grid_size=grid_size,
+            manifest=manifest,
+            neuron_type=neuron_type,
+            shard=shard,
+        )
+        shard_filepath: str = get_shard_filepath(
+            neuron_type=neuron_type, shard=shard, suffix="jsonl"
+        )
+        shard_neuron_dicts: List[Dict[str, Union[float, int, str]]]
+        checksum: str
+        shard_neuron_dicts, checksum = load_dict_and_checksum_from_file(
+            shard_filepath
+        )
+        if (
+            checksum != manifest["sha256"]
+            or len(shard_neuron_dicts) != manifest["nr_of_neuron_dicts"]
+        ):
+            raise LookupError(
+                f"Error, {shard_filepath} does not match its manifest."
+            )
+        for neuron_dict in shard_neuron_dicts:
+            key: Tuple = tuple(sorted(neuron_dict.items()))
+            if key not in seen:
+                seen.add(key)
+                neuron_dicts.append(neuron_dict)
+
+    write_dicts_to_stream(
+        filepath=f"{neuron_type.type_dir}/static.jsonl",
+        neuron_dicts=neuron_dicts,
+    )
+    return neuron_dicts
+
+
+@typechecked
+def load_shard_manifest(
+    *, neuron_type: Neuron_type, shard: int
+) -> Dict[str, Any]:
+    """Returns the manifest of a shard, raises an error if the shard did not
+    complete."""
+    filepath: str = get_shard_filepath(
+        neuron_type=neuron_type, shard=shard, suffix="manifest.json"
+    )
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(
+            f"Error, shard:{shard} is missing or incomplete, {filepath} was "
+            + "not found."
+        )
+    with open(filepath, encoding="utf-8") as manifest_file:
+        return json.load(manifest_file)
+
+
+@typechecked
+def verify_shard_manifest(
+    *,
+    first_manifest: Dict[str, Any],
+    grid_size: int,
+    manifest: Dict[str, Any],
+    neuron_type: Neuron_type,
+    shard: int,
+) -> None:
+    """Raises an error if a shard belongs to a different search, or does not
+    cover its part of the grid."""
+    if (
+        manifest["nr_of_shards"] != first_manifest["nr_of_shards"]
+        or manifest["fingerprint"] != first_manifest["fingerprint"]
+    ):
+        raise ValueError(
+            f"Error, shard:{shard} belongs to a different search than shard:0."
+        )
+    if (
+        manifest["fingerprint"]["a_in_time"] != neuron_type.a_in_time
+        or manifest["fingerprint"]["expected_spikes"]
+        != neuron_type.expected_spikes
+        or manifest["fingerprint"]["grid_ranges"]
+        != json.loads(
+            json.dumps(Parameter_grid(disco=neuron_type.grid_spec).ranges)
+        )
+    ):
+        raise ValueError(
+            f"Error, shard:{shard} belongs to a different neuron type than:"
+            + f"{neuron_type.name}."
+        )
+    if manifest["shard"] != shard or tuple(
+        manifest["grid_range"]
+    ) != get_shard_range(
+        grid_size=grid_size,
+        nr_of_shards=manifest["nr_of_shards"],
+        shard=shard,
+    ):
+        raise ValueError(
+            f"Error, shard:{shard} covers grid indices:"
+            + f"{manifest['grid_range']}, which is not its part of the grid."
+        )
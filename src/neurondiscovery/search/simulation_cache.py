@@ -0,0 +1,206 @@
+"""Remembers the simulation outcome of single parameter points, such that
+the changing-neuron search does not re-simulate a point that an earlier static
+neuron already produced."""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.search.batch_simulation import (
+    get_batch_first_mismatches,
+    get_pattern_matrix,
+    no_mismatch,
+)
+from neurondiscovery.spike_patterns.Spike_pattern import Spike_pattern
+from neurondiscovery.type_checks import hot_path_typechecked
+
+# Properties that, together with a_in_time, determine the neuron behaviour.
+simulated_properties: List[str] = [
+    "a_in",
+    "bias",
+    "du",
+    "dv",
+    "vth",
+    "weight",
+]
+
+
+class Simulation_cache:
+    """LRU cache with the outcome of simulating a parameter point against an
+    expected spike pattern.
+
+    The outcome is whether the neuron shows the expected spikes, and the
+    first timestep at which it does not (None if it does). The
+    parameters are rounded to a quantum, such that e.g. bias=0.1+1 and
+    bias=1.1 share an entry. Once max_size entries are stored, the
+    least recently used entry is dropped.
+
+    Example usage: cache=Simulation_cache(max_size=100000)
+    """
+
+    @typechecked
+    def __init__(self, max_size: int = 100000, quantum: float = 1e-9) -> None:
+        if max_size < 1:
+            raise ValueError(f"Error, max_size={max_size} should be >=1.")
+        self.max_size: int = max_size
+        self.quantum: float = quantum
+        self.outcomes: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    # pylint: disable=R0913
+    @hot_path_typechecked
+    def get_key(
+        self,
+        *,
+        a_in_time: int,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        neuron_dict: Dict[str, Union[float, int]],
+        expected_pattern: Spike_pattern,
+    ) -> Tuple:
+        """Returns the quantized parameters, a_in_time, the expected spike
+        pattern and the neuron property bounds of a parameter point."""
+        return (
+            tuple(
+                round(neuron_dict[attr] / self.quantum)
+                for attr in simulated_properties
+            ),
+            a_in_time,
+            expected_pattern,
+            tuple(sorted(max_neuron_props.items())),
+            tuple(sorted(min_neuron_props.items())),
+        )
+
+    # pylint: disable=R0913
+    @hot_path_typechecked
+    def get_outcome(
+        self,
+        *,
+        a_in_time: int,
+        expected_pattern: Spike_pattern,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        neuron_dict: Dict[str, Union[float, int]],
+    ) -> Tuple[bool, Optional[int]]:
+        """Returns whether the parameter point shows the expected spikes, and
+        the first timestep at which it does not, simulating it only if the
+        outcome is not yet cached."""
+        first_mismatch: int = int(
+            self.get_first_mismatches(
+                a_in_time=a_in_time,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                neuron_props={
+                    attr: np.asarray([neuron_dict[attr]], dtype=np.float64)
+                    for attr in simulated_properties
+                },
+                pattern_indices=np.zeros(1, dtype=np.int64),
+                patterns=[expected_pattern],
+            )[0]
+        )
+        if first_mismatch == no_mismatch:
+            return True, None
+        return False, first_mismatch
+
+    # pylint: disable=R0913
+    # pylint: disable=R0914
+    @typechecked
+    def get_first_mismatches(
+        self,
+        *,
+        a_in_time: int,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        neuron_props: Dict[str, np.ndarray],
+        pattern_indices: np.ndarray,
+        patterns: List[Spike_pattern],
+    ) -> np.ndarray:
+        """Returns per parameter point the first timestep at which it deviates
+        from its expected spike pattern, patterns[pattern_indices], or
+        no_mismatch.
+
+        The points that are not yet cached are deduplicated, and simulated
+        together in one batch.
+        """
+        rows: List[Dict[str, Union[float, int]]] = [
+            dict(zip(simulated_properties, values))
+            for values in zip(
+                *(neuron_props[attr].tolist() for attr in simulated_properties)
+            )
+        ]
+        keys: List[Tuple] = [
+            self.get_key(
+                a_in_time=a_in_time,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                neuron_dict=row,
+                expected_pattern=patterns[pattern_index],
+            )
+            for row, pattern_index in zip(rows, pattern_indices.tolist())
+        ]
+
+        # Select the first row of each point that is not yet cached.
+        missing: Dict[Tuple, int] = {}
+        for row_index, key in enumerate(keys):
+            if key in self.outcomes:
+                self.hits += 1
+                self.outcomes.move_to_end(key)
+            elif key in missing:
+                self.hits += 1
+            else:
+                self.misses += 1
+                missing[key] = row_index
+
+        new_outcomes: Dict[Tuple, Tuple[bool, Optional[int]]] = {}
+        if missing:
+            simulated: np.ndarray = np.asarray(list(missing.values()))
+            matrix, pattern_lengths = get_pattern_matrix(patterns=patterns)
+            first_mismatches: np.ndarray = get_batch_first_mismatches(
+                **{
+                    attr: neuron_props[attr][simulated].astype(np.float64)
+                    for attr in simulated_properties
+                },
+                a_in_time=a_in_time,
+                expected_spikes=matrix[pattern_indices[simulated]],
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+                pattern_lengths=pattern_lengths[pattern_indices[simulated]],
+            )
+            for key, first_mismatch in zip(
+                missing.keys(), first_mismatches.tolist()
+            ):
+                new_outcomes[key] = (
+                    (True, None)
+                    if first_mismatch == no_mismatch
+                    else (False, first_mismatch)
+                )
+
+        outcomes: List[Tuple[bool, Optional[int]]] = [
+            new_outcomes[key] if key in new_outcomes else self.outcomes[key]
+            for key in keys
+        ]
+        for key, outcome in new_outcomes.items():
+            self.outcomes[key] = outcome
+            if len(self.outcomes) > self.max_size:
+                self.outcomes.popitem(last=False)
+        return np.asarray(
+            [
+                no_mismatch if satisfies else first_mismatch
+                for satisfies, first_mismatch in outcomes
+            ],
+            dtype=np.int64,
+        )
+
+    @typechecked
+    def get_summary(self) -> str:
+        """Returns the hit and miss counters of the cache."""
+        lookups: int = self.hits + self.misses
+        hit_rate: float = self.hits / lookups if lookups > 0 else 0.0
+        return (
+            f"Simulation cache: hits={self.hits}, misses={self.misses}, "
+            + f"hit rate={hit_rate:.3f}, entries={len(self.outcomes)}/"
+            + f"{self.max_size}"
+        )
@@ -0,0 +1,350 @@
+"""Stores the spike trains of every candidate of a grid in memory-mapped
+files, such that the candidates of a new spike pattern are found by scanning
+the archive instead of simulating the grid again."""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.batch_simulation import (
+    get_batch_spike_trains,
+    no_mismatch,
+)
+from neurondiscovery.search.print_behaviour import get_parameter_neuron_dict
+from neurondiscovery.search.progress_reporter import Progress_reporter
+
+# The neuron properties that the extremes bound, in the order of the columns.
+extreme_properties: List[str] = ["u", "v"]
+# The neuron properties that are bounded with the grid values.
+static_properties: List[str] = ["bias", "du", "dv", "vth"]
+
+
+# pylint: disable=R0902
+class Spike_archive:
+    """Memory-mapped spike trains of all candidates of a grid, simulated for
+    nr_of_timesteps with one input spike at a_in_time.
+
+    The archive directory contains the bit-packed spike trains in
+    spike_trains.npy, the first timestep at which each candidate leaves
+    the neuron property bounds of the archive in first_out_of_bounds.npy,
+    optionally the (min u, max u, min v, max v) per candidate in
+    extremes.npy, and the settings in archive.json, which is written last.
+
+    Example usage: archive=Spike_archive(
+    archive_dir="found_neurons/archives/disco_ranges_a_in_time=6")
+    """
+
+    @typechecked
+    def __init__(self, archive_dir: str) -> None:
+        self.archive_dir: str = archive_dir
+        settings_filepath: str = f"{archive_dir}/archive.json"
+        if not os.path.isfile(settings_filepath):
+            raise FileNotFoundError(
+                f"Error, {archive_dir} is not a complete spike archive, "
+                + f"{settings_filepath} was not found."
+            )
+        with open(settings_filepath, encoding="utf-8") as settings_file:
+            self.settings: Dict[str, Any] = json.load(settings_file)
+        self.a_in_time: int = self.settings["a_in_time"]
+        self.nr_of_timesteps: int = self.settings["nr_of_timesteps"]
+        self.spike_trains: np.ndarray = np.load(
+            f"{archive_dir}/spike_trains.npy", mmap_mode="r"
+        )
+        self.first_out_of_bounds: np.ndarray = np.load(
+            f"{archive_dir}/first_out_of_bounds.npy", mmap_mode="r"
+        )
+        self.extremes: Optional[np.ndarray] = (
+            np.load(f"{archive_dir}/extremes.npy", mmap_mode="r")
+            if self.settings["extremes"]
+            else None
+        )
+
+    # pylint: disable=R0913
+    @typechecked
+    def get_accepted_indices(
+        self,
+        *,
+        a_in_time: int,
+        disco: Discovery,
+        expected_spikes: List[bool],
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        chunk_size: int = 1 << 20,
+    ) -> np.ndarray:
+        """Returns the grid indices of the candidates that show the expected
+        spikes within the neuron property bounds, like the numpy engine.
+
+        The archive answers neuron types with its grid and a_in_time,
+        whose expected spikes are at most nr_of_timesteps long. Neuron
+        property bounds other than those of the archive are answered
+        with the extremes, if the expected spikes span all timesteps of
+        the archive.
+        """
+        self.verify_compatible(
+            a_in_time=a_in_time,
+            disco=disco,
+            expected_spikes=expected_spikes,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        )
+        same_bounds: bool = self.has_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        )
+        grid: Parameter_grid = Parameter_grid(disco=disco)
+
+        # Compare the complete bytes, and the first bits of the last byte.
+        nr_of_bytes: int = (len(expected_spikes) + 7) // 8
+        expected: np.ndarray = np.packbits(
+            np.asarray(expected_spikes, dtype=bool), bitorder="little"
+        )
+        last_byte_mask: np.ndarray = np.full(nr_of_bytes, 0xFF, dtype=np.uint8)
+        if len(expected_spikes) % 8:
+            last_byte_mask[-1] = (1 << len(expected_spikes) % 8) - 1
+
+        accepted: List[np.ndarray] = []
+        for start, stop in grid.iter_chunks(chunk_size=chunk_size):
+            matches: np.ndarray = (
+                (self.spike_trains[start:stop, :nr_of_bytes] & last_byte_mask)
+                == expected
+            ).all(axis=1)
+            if same_bounds:
+                first_out_of_bounds: np.ndarray = self.first_out_of_bounds[
+                    start:stop
+                ]
+                matches &= (first_out_of_bounds == no_mismatch) | (
+                    first_out_of_bounds >= len(expected_spikes)
+                )
+            else:
+                matches &= self.within_extreme_bounds(
+                    grid=grid,
+                    max_neuron_props=max_neuron_props,
+                    min_neuron_props=min_neuron_props,
+                    start=start,
+                    stop=stop,
+                )
+            accepted.append(start + np.flatnonzero(matches))
+        return np.concatenate(accepted) if accepted else np.zeros(0, np.int64)
+
+    # pylint: disable=R0913
+    @typechecked
+    def verify_compatible(
+        self,
+        *,
+        a_in_time: int,
+        disco: Discovery,
+        expected_spikes: List[bool],
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+    ) -> None:
+        """Raises an error if the archive can not answer the search."""
+        if (
+            json.loads(json.dumps(Parameter_grid(disco=disco).ranges))
+            != self.settings["grid_ranges"]
+            or a_in_time != self.a_in_time
+        ):
+            raise ValueError(
+                f"Error, the spike archive in:{self.archive_dir} belongs to "
+                + "a different grid or a_in_time."
+            )
+        if len(expected_spikes) > self.nr_of_timesteps:
+            raise ValueError(
+                f"Error, the spike archive in:{self.archive_dir} holds "
+                + f"{self.nr_of_timesteps} timesteps, the expected spikes "
+                + f"have:{len(expected_spikes)}."
+            )
+        if not self.has_bounds(
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        ) and (
+            self.extremes is None
+            or len(expected_spikes) != self.nr_of_timesteps
+            or not set(max_neuron_props)
+            .union(min_neuron_props)
+            .issubset(extreme_properties + static_properties)
+        ):
+            raise ValueError(
+                "Error, the neuron property bounds differ from those of the "
+                + f"spike archive in:{self.archive_dir}, and can not be "
+                + "checked with its extremes."
+            )
+
+    @typechecked
+    def has_bounds(
+        self,
+        *,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+    ) -> bool:
+        """Returns True if the archive stores the first timestep outside
+        these neuron property bounds."""
+        return json.loads(
+            json.dumps([max_neuron_props, min_neuron_props])
+        ) == [
+            self.settings["max_neuron_props"],
+            self.settings["min_neuron_props"],
+        ]
+
+    # pylint: disable=R0913
+    @typechecked
+    def within_extreme_bounds(
+        self,
+        *,
+        grid: Parameter_grid,
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        start: int,
+        stop: int,
+    ) -> np.ndarray:
+        """Returns a boolean mask with the candidates in [start, stop) whose
+        extremes and static properties are within the bounds."""
+        values: Dict[str, np.ndarray] = grid.get_values(
+            indices=np.arange(start, stop, dtype=np.int64)
+        )
+        if self.extremes is None:
+            raise ValueError("Error, the spike archive has no extremes.")
+        extremes: np.ndarray = self.extremes[start:stop]
+        for position, the_property in enumerate(extreme_properties):
+            values[f"min_{the_property}"] = extremes[:, 2 * position]
+            values[f"max_{the_property}"] = extremes[:, 2 * position + 1]
+        within_bounds: np.ndarray = np.ones(stop - start, dtype=bool)
+        for attr, min_val in min_neuron_props.items():
+            within_bounds &= (
+                values[attr if attr in static_properties else f"min_{attr}"]
+                >= min_val
+            )
+        for attr, max_val in max_neuron_props.items():
+            within_bounds &= (
+                values[attr if attr in static_properties else f"max_{attr}"]
+                <= max_val
+            )
+        return within_bounds
+
+
+# pylint: disable=R0913
+# pylint: disable=R0914
+@typechecked
+def create_spike_archive(
+    *,
+    a_in_time: int,
+    archive_dir: str,
+    disco: Discovery,
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+    nr_of_timesteps: int,
+    chunk_size: int = 100000,
+    extremes: bool = False,
+    reporter: Optional[Progress_reporter] = None,
+) -> Spike_archive:
+    """Simulates every candidate of the grid for nr_of_timesteps, without
+    early exit, stores their spike trains in a Spike_archive and returns
+    it.
+
+    The first timestep at which each candidate leaves the neuron
+    property bounds is stored for these bounds. With extremes, the
+    extremes of u and v are stored too, to check other bounds on them.
+    """
+    grid: Parameter_grid = Parameter_grid(disco=disco)
+    os.makedirs(archive_dir, exist_ok=True)
+    # Remove the settings first, such that an interrupted run is incomplete.
+    if os.path.isfile(f"{archive_dir}/archive.json"):
+        os.remove(f"{archive_dir}/archive.json")
+    if reporter is None:
+        reporter = Progress_reporter(
+            name="archive", total=len(grid), mode="silent"
+        )
+
+    spike_trains: np.ndarray = np.lib.format.open_memmap(
+        f"{archive_dir}/spike_trains.npy",
+        mode="w+",
+        dtype=np.uint8,
+        shape=(len(grid), (nr_of_timesteps + 7) // 8),
+    )
+    first_out_of_bounds: np.ndarray = np.lib.format.open_memmap(
+        f"{archive_dir}/first_out_of_bounds.npy",
+        mode="w+",
+        dtype=np.int32,
+        shape=(len(grid),),
+    )
+    extreme_values: Optional[np.ndarray] = (
+        np.lib.format.open_memmap(
+            f"{archive_dir}/extremes.npy",
+            mode="w+",
+            dtype=np.float64,
+            shape=(len(grid), 2 * len(extreme_properties)),
+        )
+        if extremes
+        else None
+    )
+    for start, stop in grid.iter_chunks(chunk_size=chunk_size):
+        (
+            chunk_spike_trains,
+            chunk_out_of_bounds,
+            chunk_extremes,
+        ) = get_batch_spike_trains(
+            a_in_time=a_in_time,
+            nr_of_timesteps=nr_of_timesteps,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            **grid.get_values(indices=np.arange(start, stop, dtype=np.int64)),
+        )
+        spike_trains[start:stop] = np.packbits(
+            chunk_spike_trains, axis=1, bitorder="little"
+        )
+        first_out_of_bounds[start:stop] = chunk_out_of_bounds
+        if extreme_values is not None:
+            extreme_values[start:stop] = chunk_extremes
+        reporter.update(position=stop, nr_found=0)
+    reporter.close()
+
+    for array in [spike_trains, first_out_of_bounds, extreme_values]:
+        if array is not None:
+            array.flush()
+    with open(
+        f"{archive_dir}/archive.json", "w", encoding="utf-8"
+    ) as settings_file:
+        json.dump(
+            {
+                "a_in_time": a_in_time,
+                "nr_of_timesteps": nr_of_timesteps,
+                "grid_ranges": grid.ranges,
+                "max_neuron_props": max_neuron_props,
+                "min_neuron_props": min_neuron_props,
+                "extremes": extremes,
+            },
+            settings_file,
+        )
+    return Spike_archive(archive_dir=archive_dir)
+
+
+# pylint: disable=R0913
+@typechecked
+def get_archived_neurons(
+    *,
+    a_in_time: int,
+    archive: Spike_archive,
+    disco: Discovery,
+    expected_spikes: List[bool],
+    max_neuron_props: Dict[str, Union[float, int]],
+    min_neuron_props: Dict[str, Union[float, int]],
+) -> List[Dict[str, Union[float, int]]]:
+    """Returns the neuron dicts of the archived candidates that show the
+    expected spikes, in grid order, like get_satisfactory_neurons."""
+    grid: Parameter_grid = Parameter_grid(disco=disco)
+    return [
+        get_parameter_neuron_dict(
+            a_in_time=a_in_time, **grid.get_param_dict(index)
+        )
+        for index in archive.get_accepted_indices(
+            a_in_time=a_in_time,
+            disco=disco,
+            expected_spikes=expected_spikes,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+        ).tolist()
+    ]
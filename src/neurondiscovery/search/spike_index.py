@@ -0,0 +1,329 @@
+"""Indexes the distinct spike trains of a spike archive on their features, such
+that exact, time-shifted and nearest Hamming distance queries only visit a
+few distinct spike trains instead of every candidate of the grid."""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Discovery import Discovery
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.batch_simulation import no_mismatch
+from neurondiscovery.search.print_behaviour import get_parameter_neuron_dict
+from neurondiscovery.search.spike_archive import Spike_archive
+from neurondiscovery.spike_patterns.Spike_pattern import get_spike_pattern
+
+# The features of each distinct spike train, -1 if a train has no such value.
+spike_train_features: List[str] = [
+    "first_spike",
+    "nr_of_spikes",
+    "min_interval",
+    "max_interval",
+    "period",
+]
+# The nr of ones in each byte value.
+byte_popcounts: np.ndarray = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1
+).sum(axis=1)
+
+
+# pylint: disable=R0902
+class Spike_index:
+    """Index of the distinct spike trains of the candidates of a spike
+    archive, over its first nr_of_timesteps.
+
+    The candidates that leave the neuron property bounds of the archive
+    within nr_of_timesteps are not indexed. Each distinct spike train
+    maps to its candidates in grid order, and is keyed on its bits, its
+    features and its nr of spikes. The queries return the neuron dicts
+    of the matching candidates, as get_node_name_neuron_dicts does.
+
+    Example usage: index=Spike_index(archive=archive, disco=disco)
+    index.get_nearest(spikes=[False, True, True], k=5)
+    """
+
+    # pylint: disable=R0914
+    @typechecked
+    def __init__(
+        self,
+        archive: Spike_archive,
+        disco: Discovery,
+        nr_of_timesteps: Optional[int] = None,
+        chunk_size: int = 1 << 20,
+    ) -> None:
+        self.grid: Parameter_grid = Parameter_grid(disco=disco)
+        self.a_in_time: int = archive.a_in_time
+        self.nr_of_timesteps: int = (
+            archive.nr_of_timesteps
+            if nr_of_timesteps is None
+            else nr_of_timesteps
+        )
+        if not 0 < self.nr_of_timesteps <= archive.nr_of_timesteps:
+            raise ValueError(
+                f"Error, nr_of_timesteps={nr_of_timesteps} should be in "
+                + f"[1, {archive.nr_of_timesteps}]."
+            )
+        nr_of_bytes: int = (self.nr_of_timesteps + 7) // 8
+        self.byte_mask: np.ndarray = np.full(nr_of_bytes, 0xFF, np.uint8)
+        if self.nr_of_timesteps % 8:
+            self.byte_mask[-1] = (1 << self.nr_of_timesteps % 8) - 1
+
+        # The id of each distinct spike train, per packed spike train.
+        self.train_ids: Dict[bytes, int] = {}
+        candidate_train_ids: np.ndarray = np.full(
+            len(self.grid), no_mismatch, dtype=np.int64
+        )
+        for start, stop in self.grid.iter_chunks(chunk_size=chunk_size):
+            rows: np.ndarray = np.ascontiguousarray(
+                archive.spike_trains[start:stop, :nr_of_bytes] & self.byte_mask
+            )
+            first_out_of_bounds: np.ndarray = archive.first_out_of_bounds[
+                start:stop
+            ]
+            within_bounds: np.ndarray = (
+                first_out_of_bounds == no_mismatch
+            ) | (first_out_of_bounds >= self.nr_of_timesteps)
+            unique_rows, inverse = np.unique(
+                rows[within_bounds], axis=0, return_inverse=True
+            )
+            chunk_ids: np.ndarray = np.asarray(
+                [
+                    self.train_ids.setdefault(
+                        row.tobytes(), len(self.train_ids)
+                    )
+                    for row in unique_rows
+                ],
+                dtype=np.int64,
+            )
+            candidate_train_ids[
+                start + np.flatnonzero(within_bounds)
+            ] = chunk_ids[inverse.reshape(-1)]
+
+        # The candidates of train i are candidates[offsets[i]:offsets[i+1]].
+        indexed: np.ndarray = np.flatnonzero(
+            candidate_train_ids != no_mismatch
+        )
+        order: np.ndarray = np.argsort(
+            candidate_train_ids[indexed], kind="stable"
+        )
+        self.candidates: np.ndarray = indexed[order]
+        self.offsets: np.ndarray = np.searchsorted(
+            candidate_train_ids[self.candidates],
+            np.arange(len(self.train_ids) + 1),
+        )
+        self.trains: np.ndarray = (
+            np.frombuffer(b"".join(self.train_ids), dtype=np.uint8).reshape(
+                len(self.train_ids), nr_of_bytes
+            )
+            if self.train_ids
+            else np.zeros((0, nr_of_bytes), dtype=np.uint8)
+        )
+        self.features: Dict[str, np.ndarray] = get_spike_train_features(
+            spike_trains=np.unpackbits(
+                self.trains,
+                axis=1,
+                count=self.nr_of_timesteps,
+                bitorder="little",
+            ).astype(bool)
+        )
+        # The trains sorted on their nr of spikes, which bounds the distance.
+        self.count_order: np.ndarray = np.argsort(
+            self.features["nr_of_spikes"], kind="stable"
+        )
+        self.count_offsets: np.ndarray = np.searchsorted(
+            self.features["nr_of_spikes"][self.count_order],
+            np.arange(self.nr_of_timesteps + 2),
+        )
+
+    def __len__(self) -> int:
+        """Returns the nr of distinct spike trains."""
+        return len(self.train_ids)
+
+    @typechecked
+    def get_exact(
+        self, *, spikes: List[bool]
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the neuron dicts of the candidates with these spikes."""
+        train_id: Optional[int] = self.train_ids.get(
+            self.pack(spikes=spikes).tobytes()
+        )
+        if train_id is None:
+            return []
+        return self.get_neuron_dicts(
+            indices=self.get_candidates(train_ids=[train_id])
+        )
+
+    @typechecked
+    def get_shifted(
+        self, *, shift: int, spikes: List[bool]
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the neuron dicts of the candidates that spike like the
+        spikes delayed by shift timesteps (advanced for negative shift),
+        see Spike_pattern.shift."""
+        return self.get_exact(
+            spikes=get_spike_pattern(spikes).shift(shift).to_list()
+        )
+
+    @typechecked
+    def get_by_features(
+        self, **features: int
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the neuron dicts of the candidates whose spike train has
+        these feature values, e.g. first_spike=7, period=2."""
+        matches: np.ndarray = np.ones(len(self), dtype=bool)
+        for feature, value in features.items():
+            if feature not in spike_train_features:
+                raise ValueError(
+                    f"Error, feature:{feature} not in:{spike_train_features}"
+                )
+            matches &= self.features[feature] == value
+        return self.get_neuron_dicts(
+            indices=self.get_candidates(
+                train_ids=np.flatnonzero(matches).tolist()
+            )
+        )
+
+    @typechecked
+    def get_nearest(
+        self, *, k: int, spikes: List[bool]
+    ) -> List[Tuple[int, Dict[str, Union[float, int]]]]:
+        """Returns the Hamming distance and neuron dict of the k candidates
+        whose spike train is nearest to the spikes, nearest first.
+
+        The distance to a train is at least the difference in their nr
+        of spikes, so the trains are visited in order of that difference,
+        until no unvisited train can be nearer than the k-th candidate.
+        The candidates of a spike train are returned in grid order.
+        """
+        query: np.ndarray = self.pack(spikes=spikes)
+        nr_of_spikes: int = sum(spikes)
+        distances: Dict[int, int] = {}
+        for difference in range(self.nr_of_timesteps + 1):
+            for count in {
+                nr_of_spikes - difference,
+                nr_of_spikes + difference,
+            }:
+                if 0 <= count <= self.nr_of_timesteps:
+                    train_ids: np.ndarray = self.count_order[
+                        self.count_offsets[count] : self.count_offsets[
+                            count + 1
+                        ]
+                    ]
+                    distances.update(
+                        zip(
+                            train_ids.tolist(),
+                            byte_popcounts[self.trains[train_ids] ^ query]
+                            .sum(axis=1)
+                            .tolist(),
+                        )
+                    )
+            if (
+                self.get_kth_distance(distances=distances, k=k)
+                <= difference + 1
+            ):
+                break
+
+        train_ids: List[int] = sorted(distances, key=distances.__getitem__)
+        indices: np.ndarray = self.get_candidates(train_ids=train_ids)[:k]
+        return list(
+            zip(
+                np.repeat(
+                    [distances[train_id] for train_id in train_ids],
+                    np.diff(self.offsets)[train_ids],
+                )[:k].tolist(),
+                self.get_neuron_dicts(indices=indices),
+            )
+        )
+
+    @typechecked
+    def get_kth_distance(self, *, distances: Dict[int, int], k: int) -> float:
+        """Returns the distance of the k-th nearest candidate of the visited
+        trains, or infinity if they have fewer than k candidates."""
+        nr_of_candidates: int = 0
+        for train_id in sorted(distances, key=distances.__getitem__):
+            nr_of_candidates += int(
+                self.offsets[train_id + 1] - self.offsets[train_id]
+            )
+            if nr_of_candidates >= k:
+                return distances[train_id]
+        return float("inf")
+
+    @typechecked
+    def get_candidates(self, *, train_ids: List[int]) -> np.ndarray:
+        """Returns the grid indices of the candidates of the trains, per train
+        in grid order."""
+        return np.concatenate(
+            [np.zeros(0, dtype=np.int64)]
+            + [
+                self.candidates[
+                    self.offsets[train_id] : self.offsets[train_id + 1]
+                ]
+                for train_id in train_ids
+            ]
+        )
+
+    @typechecked
+    def get_neuron_dicts(
+        self, *, indices: np.ndarray
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the neuron dicts of the candidates at the grid indices."""
+        return [
+            get_parameter_neuron_dict(
+                a_in_time=self.a_in_time, **self.grid.get_param_dict(index)
+            )
+            for index in indices.tolist()
+        ]
+
+    @typechecked
+    def pack(self, *, spikes: List[bool]) -> np.ndarray:
+        """Returns the spikes as a packed row of the index, raises an error if
+        they do not span the indexed timesteps."""
+        if len(spikes) != self.nr_of_timesteps:
+            raise ValueError(
+                f"Error, the index holds {self.nr_of_timesteps} timesteps, "
+                + f"the spikes have:{len(spikes)}."
+            )
+        return np.packbits(np.asarray(spikes, dtype=bool), bitorder="little")
+
+
+@typechecked
+def get_spike_train_features(
+    *, spike_trains: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Returns per spike train (row) the time of its first spike, its nr of
+    spikes, its shortest and longest inter-spike interval, and its period.
+
+    The period is the smallest p such that the train repeats itself
+    every p timesteps from its first spike onwards, for trains with at
+    least two spikes.
+    """
+    nr_of_trains, nr_of_timesteps = spike_trains.shape
+    nr_of_spikes: np.ndarray = spike_trains.sum(axis=1)
+    first_spike: np.ndarray = np.where(
+        nr_of_spikes > 0, spike_trains.argmax(axis=1), -1
+    )
+    min_interval: np.ndarray = np.full(nr_of_trains, -1)
+    max_interval: np.ndarray = np.full(nr_of_trains, -1)
+    period: np.ndarray = np.full(nr_of_trains, -1)
+    # The timesteps before the first spike are excluded from the period.
+    after_first: np.ndarray = (
+        np.arange(nr_of_timesteps)[None, :] >= first_spike[:, None]
+    )
+    for p in range(1, nr_of_timesteps):
+        repeats: np.ndarray = (
+            (spike_trains[:, :-p] == spike_trains[:, p:])
+            | ~after_first[:, :-p]
+        ).all(axis=1)
+        period[(period == -1) & repeats & (nr_of_spikes > 1)] = p
+    for row in np.flatnonzero(nr_of_spikes > 1).tolist():
+        intervals: np.ndarray = np.diff(np.flatnonzero(spike_trains[row]))
+        min_interval[row] = intervals.min()
+        max_interval[row] = intervals.max()
+    return {
+        "first_spike": first_spike,
+        "nr_of_spikes": nr_of_spikes,
+        "min_interval": min_interval,
+        "max_interval": max_interval,
+        "period": period,
+    }
@@ -0,0 +1,111 @@
+"""Stores a spike train as the bits of an integer, such that spike trains can
+be compared, shifted and hashed without looping over the timesteps."""
+from typing import List, Optional
+
+import numpy as np
+from typeguard import typechecked
+
+
+class Spike_pattern:
+    """Spike train of length timesteps, bit t of bits is the spike at t.
+
+    Example usage: pattern=get_spike_pattern(spikes=[False, True, True])
+    """
+
+    @typechecked
+    def __init__(self, bits: int, length: int) -> None:
+        if length < 0:
+            raise ValueError(f"Error, length={length} should be >=0.")
+        if bits < 0 or bits >= 1 << length:
+            raise ValueError(
+                f"Error, bits={bits} do not fit in length={length}."
+            )
+        self.bits: int = bits
+        self.length: int = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, t: int) -> bool:
+        if not 0 <= t < self.length:
+            raise IndexError(f"Error, t={t} outside length={self.length}.")
+        return bool(self.bits >> t & 1)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Spike_pattern):
+            return NotImplemented
+        return self.bits == other.bits and self.length == other.length
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.length))
+
+    def __repr__(self) -> str:
+        return f"Spike_pattern({self.to_string()})"
+
+    @typechecked
+    def to_list(self) -> List[bool]:
+        """Returns the spike train as a list of booleans."""
+        return self.to_array().tolist()
+
+    @typechecked
+    def to_array(self) -> np.ndarray:
+        """Returns the spike train as a boolean array."""
+        return np.unpackbits(
+            np.frombuffer(
+                self.bits.to_bytes((self.length + 7) // 8, "little"),
+                dtype=np.uint8,
+            ),
+            count=self.length,
+            bitorder="little",
+        ).astype(bool)
+
+    @typechecked
+    def to_string(self) -> str:
+        """Returns the spike train as a string of 0s and 1s, in time order."""
+        return (
+            format(self.bits, f"0{self.length}b")[::-1] if self.length else ""
+        )
+
+    @typechecked
+    def get_first_mismatch(self, other: "Spike_pattern") -> Optional[int]:
+        """Returns the first timestep at which the spike trains differ, or
+        None if they are equal.
+
+        If one spike train is a prefix of the other, they differ at the
+        end of the shortest one.
+        """
+        difference: int = (self.bits ^ other.bits) & (
+            (1 << min(self.length, other.length)) - 1
+        )
+        if difference:
+            return (difference & -difference).bit_length() - 1
+        if self.length != other.length:
+            return min(self.length, other.length)
+        return None
+
+    @typechecked
+    def shift(self, k: int) -> "Spike_pattern":
+        """Returns the spike train delayed by k timesteps (advanced for
+        negative k), with the same length.
+
+        The new first k timesteps are silent, and spikes shifted past the
+        end are dropped.
+        """
+        bits: int = self.bits << k if k >= 0 else self.bits >> -k
+        return Spike_pattern(
+            bits=bits & ((1 << self.length) - 1), length=self.length
+        )
+
+
+@typechecked
+def get_spike_pattern(spikes: List[bool]) -> Spike_pattern:
+    """Returns the spike pattern of a list of spikes."""
+    return Spike_pattern(
+        bits=int.from_bytes(
+            np.packbits(
+                np.asarray(spikes, dtype=bool), bitorder="little"
+            ).tobytes(),
+            "little",
+        ),
+        length=len(spikes),
+    )
@@ -0,0 +1,63 @@
+"""Switches the runtime type checks of the functions in the hot path of a
+search, which are called per candidate or per timestep, on or off.
+
+The decorators are applied when a module is imported, so the switch
+should be set before the search modules are imported. The environment
+variable is inherited by the worker processes of a parallel search.
+"""
+
+import contextlib
+import os
+from typing import Callable, Iterator
+
+from typeguard import typechecked
+
+# Set to "0" to skip the type checks of the hot path functions.
+hot_path_type_checks_env_var: str = "NEURONDISCOVERY_HOT_PATH_TYPECHECKS"
+
+
+@typechecked
+def hot_path_type_checks_enabled() -> bool:
+    """Returns False if the environment variable disables the hot path type
+    checks, they are enabled by default."""
+    return os.environ.get(hot_path_type_checks_env_var, "1") != "0"
+
+
+@typechecked
+def set_hot_path_type_checks(*, enabled: bool) -> None:
+    """Enables or disables the type checks of the hot path functions that are
+    imported afterwards, also in processes started afterwards."""
+    os.environ[hot_path_type_checks_env_var] = "1" if enabled else "0"
+
+
+@contextlib.contextmanager
+@typechecked
+def child_process_hot_path_type_checks(*, enabled: bool) -> Iterator[None]:
+    """Enables or disables the hot path type checks of the processes that
+    are started within the context, and restores the previous setting
+    afterwards.
+
+    It has no effect on this process, as its modules apply their
+    decorators when they are imported, and only sets the environment
+    variable that spawned processes read when they import them.
+    """
+    previous: str = os.environ.get(hot_path_type_checks_env_var, "1")
+    set_hot_path_type_checks(enabled=enabled)
+    try:
+        yield
+    finally:
+        os.environ[hot_path_type_checks_env_var] = previous
+
+
+@typechecked
+def hot_path_typechecked(func: Callable) -> Callable:
+    """Decorator that applies typechecked to a hot path function, or returns
+    the function unchanged if the hot path type checks are disabled.
+
+    Example usage:
+    @hot_path_typechecked
+    def simulate_neuron(...) -> bool:
+    """
+    if hot_path_type_checks_enabled():
+        return typechecked(func)
+    return func
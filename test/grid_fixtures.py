@@ -0,0 +1,71 @@
+"""Contains the small grid that the tests search, and a test case that creates
+neuron types on it in a temporary directory."""
+
+import tempfile
+import unittest
+from typing import Dict, List, Optional
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Custom_range import Custom_range
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+
+# The values are exact in binary, such that the fixed-point engine shows the
+# same behaviour as the float engines. The weights are floats, like those of
+# the Discovery ranges.
+test_ranges: Dict[str, List[float]] = {
+    "bias_range": [0.0, 0.25, 0.5],
+    "du_range": [0.0, 0.5, 1.0],
+    "dv_range": [0.0, 0.5],
+    "vth_range": [0.0, 0.5, 1.0],
+    "weight_range": [-1.0, 0.0, 1.0],
+    "a_in_range": [0.0, 0.5, 1.0],
+}
+
+
+@typechecked
+def get_test_disco(**ranges: List[float]) -> Custom_range:
+    """Returns the test grid, with the given ranges instead of those of the
+    test grid, e.g. get_test_disco(vth_range=[1.0])."""
+    return Custom_range(**{**test_ranges, **ranges}, name="test_grid")
+
+
+class Grid_test_case(unittest.TestCase):
+    """Test case with the test grid, whose neuron types write their files in
+    a temporary directory that is removed after each test."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the test grid and the temporary directory."""
+        # pylint: disable=R1732
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.disco: Custom_range = get_test_disco()
+
+    @typechecked
+    def tearDown(self) -> None:
+        """Removes the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    # pylint: disable=R0913
+    @typechecked
+    def get_neuron_type(
+        self,
+        *,
+        a_in_time: int = 2,
+        disco: Optional[Custom_range] = None,
+        max_time: int = 8,
+        name: str = "test_type",
+        spike_output_type: str = "continuous",
+    ) -> Neuron_type:
+        """Returns a neuron type with one input spike, on the test grid by
+        default."""
+        return Neuron_type(
+            a_in_time=a_in_time,
+            grid_spec=self.disco if disco is None else disco,
+            max_time=max_time,
+            name=name,
+            spike_input_type="one_spike",
+            spike_output_type=spike_output_type,
+            output_dir=self.tmp_dir.name,
+            wait_after_input=1,
+        )
@@ -0,0 +1,87 @@
+"""Tests the mapping of equivalent grid candidates onto one candidate."""
+
+import unittest
+from test.grid_fixtures import get_test_disco
+from typing import List, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.canonical_grid import get_canonical_indices
+
+
+class Test_canonical_grid(unittest.TestCase):
+    """Tests get_canonical_indices."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a grid with a duplicate dv value, and silent and spiking
+        candidates."""
+        # With vth=1, the neuron with bias 0.25 does not spike before t=4,
+        # the neuron with bias 1.5 spikes at t=1.
+        self.grid: Parameter_grid = Parameter_grid(
+            disco=get_test_disco(
+                bias_range=[0.25, 1.5],
+                du_range=[0.0],
+                dv_range=[0.0, 0],
+                vth_range=[1.0],
+                weight_range=[-1, 0, 1],
+                a_in_range=[0.0, 2.0],
+            )
+        )
+        self.indices: np.ndarray = np.arange(len(self.grid))
+        self.expected_spikes: List[bool] = [False, False, True, False]
+
+    @typechecked
+    def get_canonical_params(
+        self, *, a_in_time: int, merge_silent: bool
+    ) -> List[Tuple[Union[float, int], ...]]:
+        """Returns the parameters of the canonical candidate of each
+        candidate."""
+        return [
+            self.grid.get_params(int(index))
+            for index in get_canonical_indices(
+                a_in_time=a_in_time,
+                expected_spikes=self.expected_spikes,
+                grid=self.grid,
+                indices=self.indices,
+                merge_silent=merge_silent,
+            )
+        ]
+
+    @typechecked
+    def test_equal_properties(self) -> None:
+        """Verifies that candidates are only merged with the first candidate
+        with equal properties, if silent candidates are not merged."""
+        for index, params in enumerate(
+            self.get_canonical_params(a_in_time=1, merge_silent=False)
+        ):
+            self.assertEqual(params, self.grid.get_params(index))
+            self.assertLessEqual(self.grid.get_index(params), index)
+
+    @typechecked
+    def test_unused_a_in_and_weight(self) -> None:
+        """Verifies that the a_in is merged without input spike, and that the
+        weight is merged for candidates that do not spike before the first
+        expected spike."""
+        for a_in_time in [0, 1]:
+            for index, params in enumerate(
+                self.get_canonical_params(
+                    a_in_time=a_in_time, merge_silent=True
+                )
+            ):
+                du, _, bias, vth, weight, a_in = self.grid.get_params(index)
+                # The input spike of 2 at t=2 makes the neuron spike.
+                silent: bool = bias == 0.25 and (a_in_time == 0 or a_in == 0)
+                self.assertEqual(
+                    params,
+                    (
+                        du,
+                        0.0,
+                        bias,
+                        vth,
+                        -1 if silent else weight,
+                        0.0 if a_in_time == 0 else a_in,
+                    ),
+                )
@@ -0,0 +1,113 @@
+"""Tests resuming an interrupted static neuron search from its checkpoint."""
+
+import json
+import os
+from test.grid_fixtures import Grid_test_case
+from typing import Any, Dict, List, Union
+from unittest import mock
+
+from typeguard import typechecked
+
+from neurondiscovery.import_export import load_dict_from_file
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.search import discover
+from neurondiscovery.search.checkpoint import Search_checkpoint
+from neurondiscovery.search.manage_search import find_non_changing_neurons
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_checkpoint(Grid_test_case):
+    """Tests the resume option of find_non_changing_neurons."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a neuron type on the test grid, which is searched in
+        chunks of 50 candidates."""
+        super().setUp()
+        self.neuron_type: Neuron_type = self.get_neuron_type()
+        self.options: Search_options = Search_options(
+            engine="numpy", chunk_size=50
+        )
+        self.static_filepath: str = f"{self.neuron_type.type_dir}/static.jsonl"
+        self.checkpoint_filepath: str = (
+            f"{self.neuron_type.type_dir}/static.checkpoint.json"
+        )
+
+    @typechecked
+    def search(
+        self, *, options: Search_options, resume: bool, max_nr_of_chunks: int
+    ) -> int:
+        """Searches the static neurons, writes the checkpoint after every
+        chunk, and interrupts the search before it simulates more than
+        max_nr_of_chunks chunks. Returns the nr of simulated chunks."""
+        update = Search_checkpoint.update
+        simulate_chunk = discover.simulate_chunk
+        nr_of_chunks: int = 0
+
+        def interrupting_simulate_chunk(**kwargs: Any) -> List[int]:
+            nonlocal nr_of_chunks
+            if nr_of_chunks == max_nr_of_chunks:
+                raise KeyboardInterrupt
+            nr_of_chunks += 1
+            return simulate_chunk(**kwargs)
+
+        with mock.patch.object(
+            Search_checkpoint,
+            "update",
+            autospec=True,
+            side_effect=lambda checkpoint, **kwargs: update(
+                checkpoint, **{**kwargs, "force": True}
+            ),
+        ), mock.patch.object(
+            discover,
+            "simulate_chunk",
+            side_effect=interrupting_simulate_chunk,
+        ):
+            find_non_changing_neurons(
+                neuron_type=self.neuron_type,
+                overwrite=True,
+                verbose=False,
+                options=options,
+                resume=resume,
+            )
+        return nr_of_chunks
+
+    @typechecked
+    def test_resume_after_interrupt(self) -> None:
+        """Verifies that a search that is interrupted after 3 chunks stores
+        the same neurons after its resume as an uninterrupted search, and
+        only simulates the remaining chunks, and that a search with another
+        fingerprint does not resume its checkpoint."""
+        nr_of_chunks: int = self.search(
+            options=self.options, resume=False, max_nr_of_chunks=-1
+        )
+        self.assertGreater(nr_of_chunks, 3)
+        uninterrupted_neurons: List[
+            Dict[str, Union[float, int, str]]
+        ] = load_dict_from_file(self.static_filepath)
+        self.assertNotEqual(uninterrupted_neurons, [])
+        os.remove(self.static_filepath)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.search(options=self.options, resume=False, max_nr_of_chunks=3)
+        self.assertFalse(os.path.exists(self.static_filepath))
+        with open(self.checkpoint_filepath, encoding="utf-8") as some_file:
+            self.assertEqual(json.load(some_file)["next_position"], 3 * 50)
+
+        with self.assertRaises(ValueError):
+            self.search(
+                options=Search_options(engine="tree", chunk_size=50),
+                resume=True,
+                max_nr_of_chunks=-1,
+            )
+
+        self.assertEqual(
+            self.search(
+                options=self.options, resume=True, max_nr_of_chunks=-1
+            ),
+            nr_of_chunks - 3,
+        )
+        self.assertEqual(
+            load_dict_from_file(self.static_filepath), uninterrupted_neurons
+        )
+        self.assertFalse(os.path.exists(self.checkpoint_filepath))
@@ -0,0 +1,127 @@
+"""Tests that the simulation engines, and the options that skip simulations,
+find the hand-computed neurons, and the same neurons on the test grid."""
+
+from test.grid_fixtures import Grid_test_case, get_test_disco
+from typing import Dict, List, Tuple, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Custom_range import Custom_range
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.search.discover import get_satisfactory_neurons
+from neurondiscovery.search.search_options import Search_options
+
+# Each engine, each option that skips simulations, and parallel workers.
+engine_options: Dict[str, Search_options] = {
+    "numpy": Search_options(engine="numpy"),
+    "networkx": Search_options(engine="networkx"),
+    "tree": Search_options(engine="tree"),
+    "fixed_point": Search_options(
+        engine="fixed_point", fixed_point_format=Fixed_point_format()
+    ),
+    "no_prefilter": Search_options(engine="numpy", prefilter=False),
+    "detect_cycles": Search_options(engine="numpy", detect_cycles=True),
+    "canonicalize": Search_options(engine="numpy", canonicalize=True),
+    "workers": Search_options(engine="numpy", workers=2, chunk_size=50),
+}
+
+
+class Test_engines(Grid_test_case):
+    """Tests get_satisfactory_neurons with all engines."""
+
+    @typechecked
+    def get_neurons(
+        self,
+        *,
+        disco: Custom_range,
+        expected_spikes: List[bool],
+        options: Search_options,
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the neurons of the grid that show the expected spikes, with
+        an input spike at t=2."""
+        return get_satisfactory_neurons(
+            a_in_time=2,
+            disco=disco,
+            expected_spikes=expected_spikes,
+            max_neuron_props={"vth": 100},
+            min_neuron_props={"vth": -100},
+            verbose=False,
+            options=options,
+        )
+
+    @typechecked
+    def test_hand_computed_neurons(self) -> None:
+        """Verifies that each engine finds the neurons whose spikes are
+        computed by hand.
+
+        With du=dv=0, bias=0.25 and vth=0.5, v reaches 0.75 and spikes
+        at t=3, and every third timestep after each reset. The input
+        spike of a_in=1 arrives at t=3, after which u=1 makes the neuron
+        spike at every timestep, unless a weight of -1 cancels it after
+        the first spike. A weight of -1 without input spike keeps v below
+        the vth after the first spike.
+        """
+        disco: Custom_range = get_test_disco(
+            bias_range=[0.25],
+            du_range=[0.0],
+            dv_range=[0.0],
+            vth_range=[0.5],
+            weight_range=[-1.0, 0.0],
+            a_in_range=[0.0, 1.0],
+        )
+        expected_spikes_per_case: Dict[
+            Tuple[bool, ...], List[Tuple[float, float]]
+        ] = {
+            (False, False, False, True, False, False, True): [
+                (-1.0, 1.0),
+                (0.0, 0.0),
+            ],
+            (False, False, False, True, False, False, False): [(-1.0, 0.0)],
+            (False, False, False, True, True, True, True): [(0.0, 1.0)],
+        }
+        for (
+            expected_spikes,
+            weights_and_a_ins,
+        ) in expected_spikes_per_case.items():
+            for name, options in engine_options.items():
+                with self.subTest(name=name, expected_spikes=expected_spikes):
+                    self.assertEqual(
+                        [
+                            (neuron_dict["weight"], neuron_dict["a_in"])
+                            for neuron_dict in self.get_neurons(
+                                disco=disco,
+                                expected_spikes=list(expected_spikes),
+                                options=options,
+                            )
+                        ],
+                        weights_and_a_ins,
+                    )
+
+    @typechecked
+    def test_engines_find_the_same_neurons(self) -> None:
+        """Verifies that each engine and option finds the same neurons, in
+        the same order, as the numpy engine, on the test grid with a
+        duplicate a_in value for the canonicalize option."""
+        disco: Custom_range = get_test_disco(a_in_range=[0.0, 0.5, 1.0, 1.0])
+        for expected_spikes in [
+            [False, False, False, True, False, False],
+            [False, False, False, True, True, True],
+        ]:
+            numpy_neurons: List[
+                Dict[str, Union[float, int]]
+            ] = self.get_neurons(
+                disco=disco,
+                expected_spikes=expected_spikes,
+                options=engine_options["numpy"],
+            )
+            self.assertNotEqual(numpy_neurons, [])
+            for name, options in engine_options.items():
+                with self.subTest(name=name, expected_spikes=expected_spikes):
+                    self.assertEqual(
+                        self.get_neurons(
+                            disco=disco,
+                            expected_spikes=expected_spikes,
+                            options=options,
+                        ),
+                        numpy_neurons,
+                    )
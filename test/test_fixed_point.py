@@ -0,0 +1,154 @@
+"""Tests the fixed-point engine on a candidate that only shows the expected
+spikes in fixed-point arithmetic."""
+
+import tempfile
+import unittest
+from test.grid_fixtures import get_test_disco
+from typing import Any, Dict, List, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Custom_range import Custom_range
+from neurondiscovery.grid_settings.Fixed_point_format import Fixed_point_format
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.checkpoint import (
+    Search_checkpoint,
+    get_search_fingerprint,
+)
+from neurondiscovery.search.discover import get_satisfactory_neurons
+from neurondiscovery.search.fixed_point import get_fixed_point_discrepancies
+from neurondiscovery.search.print_behaviour import get_parameter_neuron_dict
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_fixed_point(unittest.TestCase):
+    """Tests the fixed_point engine of get_satisfactory_neurons."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a grid with a candidate that only shows the expected
+        spikes in fixed-point arithmetic."""
+        # With 1 fraction bit, the bias of 0.7 is represented as 0.5, so v
+        # reaches the vth of 0.5 one timestep later than in floats.
+        self.disco: Custom_range = get_test_disco(
+            bias_range=[0.0, 0.7],
+            du_range=[0.0],
+            dv_range=[0.0],
+            vth_range=[0.5],
+            weight_range=[0.0],
+            a_in_range=[0.0],
+        )
+        self.expected_spikes: List[bool] = [False, False, True]
+
+    @typechecked
+    def test_print_behaviour_of_fixed_point_only_neuron(self) -> None:
+        """Verifies that a fixed-point search that prints the behaviour of its
+        found neurons completes, although their float snns deviate."""
+        neuron_dicts: List[
+            Dict[str, Union[float, int]]
+        ] = get_satisfactory_neurons(
+            a_in_time=0,
+            disco=self.disco,
+            expected_spikes=self.expected_spikes,
+            max_neuron_props={},
+            min_neuron_props={},
+            verbose=True,
+            print_behaviour=True,
+            options=Search_options(
+                engine="fixed_point",
+                fixed_point_format=Fixed_point_format(fraction_bits=1),
+            ),
+        )
+        self.assertEqual(
+            [neuron_dict["bias"] for neuron_dict in neuron_dicts], [0.7]
+        )
+        self.assertEqual(
+            get_satisfactory_neurons(
+                a_in_time=0,
+                disco=self.disco,
+                expected_spikes=self.expected_spikes,
+                max_neuron_props={},
+                min_neuron_props={},
+                verbose=False,
+                options=Search_options(engine="numpy"),
+            ),
+            [],
+        )
+
+    @typechecked
+    def test_discrepancies(self) -> None:
+        """Verifies that the discrepancies are the neurons that only one of
+        the searches found, in grid order."""
+        grid: Parameter_grid = Parameter_grid(disco=self.disco)
+        float_only, fixed_point_only = [
+            get_parameter_neuron_dict(
+                a_in_time=0, **grid.get_param_dict(index)
+            )
+            for index in range(len(grid))
+        ]
+        self.assertEqual(
+            get_fixed_point_discrepancies(
+                fixed_point_neuron_dicts=[fixed_point_only],
+                float_neuron_dicts=[float_only],
+                grid=grid,
+            ),
+            [
+                {**float_only, "fixed_point_accepted": False},
+                {**fixed_point_only, "fixed_point_accepted": True},
+            ],
+        )
+        self.assertEqual(
+            get_fixed_point_discrepancies(
+                fixed_point_neuron_dicts=[fixed_point_only, float_only],
+                float_neuron_dicts=[float_only, fixed_point_only],
+                grid=grid,
+            ),
+            [],
+        )
+
+    @typechecked
+    def test_decay_fits_int64(self) -> None:
+        """Verifies that bit widths whose decay product does not fit an int64
+        raise an error, and that the widest that fit use an int64."""
+        with self.assertRaises(ValueError):
+            Fixed_point_format(bit_widths={"u": 32, "du": 32})
+        with self.assertRaises(ValueError):
+            Fixed_point_format(bit_widths={"v": 31, "dv": 32})
+        self.assertEqual(
+            Fixed_point_format(bit_widths={"u": 30, "du": 32}).dtype, np.int64
+        )
+
+    @typechecked
+    def test_checkpoint_of_other_format(self) -> None:
+        """Verifies that a checkpoint of a float search, or of another
+        fixed-point format, is not resumed by a fixed-point search."""
+        fingerprints: List[Dict[str, Any]] = [
+            get_search_fingerprint(
+                a_in_time=0,
+                disco=self.disco,
+                engine=engine,
+                expected_spikes=self.expected_spikes,
+                fixed_point_format=fixed_point_format,
+                max_neuron_props={},
+                min_neuron_props={},
+                min_nr_of_neurons=None,
+            )
+            for engine, fixed_point_format in [
+                ("numpy", None),
+                ("fixed_point", Fixed_point_format()),
+                ("fixed_point", Fixed_point_format(fraction_bits=1)),
+            ]
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath: str = f"{tmp_dir}/static.checkpoint.json"
+            for fingerprint, other_fingerprint in zip(
+                fingerprints, fingerprints[1:]
+            ):
+                Search_checkpoint(
+                    filepath=filepath, fingerprint=fingerprint
+                ).update(next_position=1, found=[], force=True)
+                with self.assertRaises(ValueError):
+                    Search_checkpoint(
+                        filepath=filepath, fingerprint=other_fingerprint
+                    ).load()
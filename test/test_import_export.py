@@ -0,0 +1,98 @@
+"""Tests the streamed export of neuron dicts."""
+
+import os
+import tempfile
+import unittest
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.import_export import (
+    Streaming_writer,
+    iter_dicts_from_file,
+    load_dict_and_checksum_from_file,
+    load_dict_from_file,
+    write_dict_to_file,
+    write_dicts_to_stream,
+)
+
+
+class Test_import_export(unittest.TestCase):
+    """Tests the Streaming_writer object and the footer verification."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a temporary directory for the written files."""
+        # pylint: disable=R1732
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath: str = f"{self.tmp_dir.name}/static.jsonl"
+        self.neuron_dicts: List[Dict[str, Union[float, int, str]]] = [
+            {"bias": 0.5, "du": 0.0, "vth": 1.0, "weight": -1},
+            {"bias": 1.0, "du": 0.25, "vth": 2.0, "weight": 0},
+        ]
+
+    @typechecked
+    def tearDown(self) -> None:
+        """Removes the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    @typechecked
+    def write_stream(self) -> None:
+        """Streams the neuron dicts into the file."""
+        with Streaming_writer(filepath=self.filepath) as writer:
+            for neuron_dict in self.neuron_dicts:
+                writer.write(neuron_dict)
+
+    @typechecked
+    def test_round_trip(self) -> None:
+        """Verifies that the streamed neuron dicts are read back, and that the
+        .partial file is renamed."""
+        self.write_stream()
+        self.assertFalse(os.path.exists(f"{self.filepath}.partial"))
+        self.assertEqual(load_dict_from_file(self.filepath), self.neuron_dicts)
+
+    @typechecked
+    def test_incomplete_stream(self) -> None:
+        """Verifies that a stream that is interrupted is not completed, and
+        that a file without footer raises an error."""
+        with self.assertRaises(KeyboardInterrupt):
+            with Streaming_writer(filepath=self.filepath) as writer:
+                writer.write(self.neuron_dicts[0])
+                raise KeyboardInterrupt
+        self.assertFalse(os.path.exists(self.filepath))
+        with self.assertRaises(EOFError):
+            list(iter_dicts_from_file(f"{self.filepath}.partial"))
+
+    @typechecked
+    def test_tampered_stream(self) -> None:
+        """Verifies that a file of which a line changed, or was removed, does
+        not match its footer."""
+        self.write_stream()
+        with open(self.filepath, "rb") as some_file:
+            lines: List[bytes] = some_file.readlines()
+        for tampered_lines in [
+            [lines[0].replace(b"0.5", b"0.6")] + lines[1:],
+            lines[1:],
+        ]:
+            with open(self.filepath, "wb") as some_file:
+                some_file.writelines(tampered_lines)
+            with self.assertRaises(LookupError):
+                list(iter_dicts_from_file(self.filepath))
+
+    @typechecked
+    def test_checksum_of_written_file(self) -> None:
+        """Verifies that the checksum that write_dict_to_file returns is the
+        checksum of the file, and that write_dicts_to_stream returns the
+        checksum in the footer."""
+        filepath: str = f"{self.tmp_dir.name}/static.json"
+        for some_filepath, checksum in [
+            (filepath, write_dict_to_file(filepath, self.neuron_dicts)),
+            (
+                self.filepath,
+                write_dicts_to_stream(self.filepath, self.neuron_dicts),
+            ),
+        ]:
+            self.assertEqual(
+                load_dict_and_checksum_from_file(some_filepath),
+                (self.neuron_dicts, checksum),
+            )
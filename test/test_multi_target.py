@@ -0,0 +1,86 @@
+"""Tests searching several neuron types in one pass over their shared grid."""
+
+import sys
+import warnings
+from test.grid_fixtures import Grid_test_case
+from typing import Dict, List, Union
+from unittest import mock
+
+from typeguard import typechecked
+
+from neurondiscovery.arg_parser import parse_cli_args
+from neurondiscovery.import_export import load_dict_from_file
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.search.manage_search import (
+    find_multi_target_non_changing_neurons,
+    find_non_changing_neurons,
+)
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_multi_target(Grid_test_case):
+    """Tests find_multi_target_non_changing_neurons and its cli arguments."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates two neuron types on the test grid that share their
+        a_in_time, and expect spikes for a different nr of timesteps."""
+        super().setUp()
+        self.neuron_types: List[Neuron_type] = [
+            self.get_neuron_type(
+                name=f"continuous_{max_time}", max_time=max_time
+            )
+            for max_time in [3, 8]
+        ]
+
+    @typechecked
+    def load_static_neurons(
+        self, *, neuron_type: Neuron_type
+    ) -> List[Dict[str, Union[float, int, str]]]:
+        """Returns the static neurons that are stored for the neuron type."""
+        return load_dict_from_file(f"{neuron_type.type_dir}/static.jsonl")
+
+    @typechecked
+    def test_equals_single_target_searches(self) -> None:
+        """Verifies that the stored neurons of each neuron type equal those
+        of its single-target search, and that neuron types that share their
+        a_in_time do not raise the warning about separate passes."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            find_multi_target_non_changing_neurons(
+                neuron_types=self.neuron_types, verbose=False
+            )
+        multi_target_neurons: Dict[
+            str, List[Dict[str, Union[float, int, str]]]
+        ] = {
+            neuron_type.name: self.load_static_neurons(neuron_type=neuron_type)
+            for neuron_type in self.neuron_types
+        }
+        self.assertNotEqual(*multi_target_neurons.values())
+        for neuron_type in self.neuron_types:
+            with self.subTest(name=neuron_type.name):
+                self.assertNotEqual(multi_target_neurons[neuron_type.name], [])
+                find_non_changing_neurons(
+                    neuron_type=neuron_type,
+                    overwrite=True,
+                    verbose=False,
+                    options=Search_options(engine="numpy"),
+                )
+                self.assertEqual(
+                    self.load_static_neurons(neuron_type=neuron_type),
+                    multi_target_neurons[neuron_type.name],
+                )
+
+    @typechecked
+    def test_rejects_engine_and_workers(self) -> None:
+        """Verifies that a multi-target search rejects an --engine or
+        --workers argument, also if it is the default value."""
+        for extra_args in [[], ["--engine", "networkx"], ["--workers", "1"]]:
+            with self.subTest(extra_args=extra_args), mock.patch.object(
+                sys, "argv", ["neurondiscovery", "--multi-target", *extra_args]
+            ), mock.patch.object(sys, "stderr"):
+                if extra_args:
+                    with self.assertRaises(SystemExit):
+                        parse_cli_args()
+                else:
+                    self.assertTrue(parse_cli_args().multi_target)
@@ -0,0 +1,136 @@
+"""Tests the stepping of the networkx snns of the candidates."""
+
+from test.grid_fixtures import Grid_test_case
+from typing import Dict, List, Tuple
+from unittest import mock
+
+import networkx as nx
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search import create_snns as create_snns_module
+from neurondiscovery.search import discover
+from neurondiscovery.search.create_snns import create_snns
+from neurondiscovery.search.discover import (
+    get_satisfactory_neurons,
+    simulate_neuron,
+)
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_networkx_engine(Grid_test_case):
+    """Tests the validation policies and simulate_neuron."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the grid of the test grid specification."""
+        super().setUp()
+        self.grid: Parameter_grid = Parameter_grid(disco=self.disco)
+        self.expected_spikes: List[bool] = [
+            False,
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+
+    @typechecked
+    def get_snns(self) -> List[nx.DiGraph]:
+        """Returns the snns of all candidates of the grid, with an input spike
+        at t=2."""
+        return list(
+            create_snns(
+                a_in_time=2,
+                grid=self.grid,
+                input_node_name="input_spike",
+                indices=list(range(len(self.grid))),
+                node_name="0",
+            )
+        )
+
+    @typechecked
+    def test_history_is_not_needed(self) -> None:
+        """Verifies that stepping the snns in two slots yields the same
+        outcomes and spike trains as keeping their history."""
+        nr_of_behaving: int = 0
+        for with_history, without_history in zip(
+            self.get_snns(), self.get_snns()
+        ):
+            outcomes: List[bool] = [
+                simulate_neuron(
+                    a_in_time=2,
+                    expected_spikes=self.expected_spikes,
+                    input_node_name="input_spike",
+                    max_neuron_props={"vth": 100},
+                    min_neuron_props={"vth": -100},
+                    node_name="0",
+                    snn_graph=snn_graph,
+                    verbose=False,
+                    keep_history=keep_history,
+                )
+                for snn_graph, keep_history in [
+                    (with_history, True),
+                    (without_history, False),
+                ]
+            ]
+            self.assertEqual(outcomes[0], outcomes[1])
+            self.assertEqual(
+                with_history.graph["spike_train"],
+                without_history.graph["spike_train"],
+            )
+            self.assertLessEqual(len(without_history.nodes["0"]["nx_lif"]), 2)
+            nr_of_behaving += outcomes[0]
+        self.assertGreater(nr_of_behaving, 0)
+
+    @typechecked
+    def count_validations(
+        self, *, validation: str, validation_sample_rate: float = 0.01
+    ) -> Tuple[int, int]:
+        """Returns the nr of snns that a search creates, and the nr of times
+        it verifies the snn specification, with a validation policy."""
+        with mock.patch.object(
+            create_snns_module,
+            "create_snn",
+            wraps=create_snns_module.create_snn,
+        ) as create_snn, mock.patch.object(
+            discover,
+            "verify_networkx_snn_spec",
+            wraps=discover.verify_networkx_snn_spec,
+        ) as verify_networkx_snn_spec:
+            get_satisfactory_neurons(
+                a_in_time=2,
+                disco=self.disco,
+                expected_spikes=self.expected_spikes,
+                max_neuron_props={"vth": 100},
+                min_neuron_props={"vth": -100},
+                verbose=False,
+                options=Search_options(
+                    validation=validation,
+                    validation_sample_rate=validation_sample_rate,
+                ),
+            )
+        return create_snn.call_count, verify_networkx_snn_spec.call_count
+
+    @typechecked
+    def test_validation_calls(self) -> None:
+        """Verifies that "once" verifies each snn once, that "sample" makes no
+        per-step verifications outside the sample, and that "every_step"
+        verifies each snn at every step."""
+        counts: Dict[str, Tuple[int, int]] = {
+            "once": self.count_validations(validation="once"),
+            "no_sample": self.count_validations(
+                validation="sample", validation_sample_rate=0.0
+            ),
+            "full_sample": self.count_validations(
+                validation="sample", validation_sample_rate=1.0
+            ),
+            "every_step": self.count_validations(validation="every_step"),
+        }
+        nr_of_snns: int = counts["once"][0]
+        self.assertGreater(nr_of_snns, 0)
+        self.assertEqual(counts["once"], (nr_of_snns, nr_of_snns))
+        self.assertEqual(counts["no_sample"], (nr_of_snns, 0))
+        # Each simulated step verifies the snn before and after its copy.
+        self.assertGreaterEqual(counts["every_step"][1], 2 * nr_of_snns)
+        self.assertEqual(counts["full_sample"], counts["every_step"])
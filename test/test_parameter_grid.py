@@ -0,0 +1,66 @@
+"""Tests the mapping between grid indices and candidate parameters."""
+
+import itertools
+from test.grid_fixtures import Grid_test_case
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+
+
+class Test_parameter_grid(Grid_test_case):
+    """Tests the Parameter_grid object."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the grid of the test grid specification."""
+        super().setUp()
+        self.grid: Parameter_grid = Parameter_grid(disco=self.disco)
+
+    @typechecked
+    def test_grid_order(self) -> None:
+        """Verifies that the grid indices follow the Cartesian product of the
+        ranges, in the order of the grid properties."""
+        candidates = list(
+            itertools.product(
+                self.disco.du_range,
+                self.disco.dv_range,
+                self.disco.bias_range,
+                self.disco.vth_range,
+                self.disco.weight_range,
+                self.disco.a_in_range,
+            )
+        )
+        self.assertEqual(len(self.grid), len(candidates))
+        for index, params in enumerate(candidates):
+            self.assertEqual(self.grid.get_params(index), params)
+            self.assertEqual(self.grid.get_index(params), index)
+
+    @typechecked
+    def test_get_values(self) -> None:
+        """Verifies that the vectorised values equal the parameters of each
+        index."""
+        indices: np.ndarray = np.arange(len(self.grid))
+        values = self.grid.get_values(indices=indices)
+        for index in indices.tolist():
+            self.assertEqual(
+                {
+                    the_property: float(values[the_property][index])
+                    for the_property in values
+                },
+                self.grid.get_param_dict(index),
+            )
+
+    @typechecked
+    def test_invalid_index_and_params(self) -> None:
+        """Verifies that an index outside the grid, or parameters that are not
+        in the grid, raise an error."""
+        with self.assertRaises(IndexError):
+            self.grid.get_params(len(self.grid))
+        with self.assertRaises(IndexError):
+            self.grid.get_params(-1)
+        with self.assertRaises(ValueError):
+            self.grid.get_index((0.0, 0.5, 0.0, 1.0, 0))
+        with self.assertRaises(ValueError):
+            self.grid.get_index((0.0, 0.5, 0.0, 3.0, 0, 0.0))
@@ -0,0 +1,122 @@
+"""Tests that the prefilter only discards candidates that the simulation
+rejects."""
+
+import unittest
+from test.grid_fixtures import get_test_disco
+from typing import Dict, List, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search.batch_simulation import (
+    get_batch_first_mismatches,
+    no_mismatch,
+)
+from neurondiscovery.search.prefilter import get_prefiltered_indices
+
+
+class Test_prefilter(unittest.TestCase):
+    """Tests get_prefiltered_indices."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a grid with the boundary values of the prefilter: a bias
+        that equals the vth, and a du and dv of 0 and 1."""
+        self.grid: Parameter_grid = Parameter_grid(
+            disco=get_test_disco(
+                bias_range=[0.0, 0.5, 1.0],
+                du_range=[0.0, 0.5, 1.0],
+                dv_range=[0.0, 0.5, 1.0],
+                vth_range=[0.0, 0.5, 1.0],
+            )
+        )
+
+    @typechecked
+    def get_accepted_indices(
+        self,
+        *,
+        a_in_time: int,
+        expected_spikes: List[bool],
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+        prefilter: bool,
+    ) -> np.ndarray:
+        """Returns the grid indices that show the expected spikes, simulated
+        in chunks of 10 candidates, such that chunks start and stop within
+        the fan-out of 9 weight and a_in values of a LIF neuron."""
+        accepted: List[np.ndarray] = []
+        for start, stop in self.grid.iter_chunks(chunk_size=10):
+            indices: np.ndarray = (
+                get_prefiltered_indices(
+                    a_in_time=a_in_time,
+                    expected_spikes=expected_spikes,
+                    grid=self.grid,
+                    max_neuron_props=max_neuron_props,
+                    min_neuron_props=min_neuron_props,
+                    start=start,
+                    stop=stop,
+                )
+                if prefilter
+                else np.arange(start, stop, dtype=np.int64)
+            )
+            accepted.append(
+                indices[
+                    get_batch_first_mismatches(
+                        a_in_time=a_in_time,
+                        expected_spikes=expected_spikes,
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props=min_neuron_props,
+                        **self.grid.get_values(indices=indices),
+                    )
+                    == no_mismatch
+                ]
+            )
+        return np.concatenate(accepted)
+
+    @typechecked
+    def test_prefilter_keeps_accepted_candidates(self) -> None:
+        """Verifies that the prefilter does not change the accepted indices,
+        with and without input spike, and with neuron property bounds on a
+        static property and on the state, whilst it discards candidates."""
+        nr_of_discarded: int = 0
+        for a_in_time, expected_spikes in [
+            (0, [False] * 6),
+            (0, [False, True, False, True, False, True]),
+            (2, [False, False, False, True, True, True]),
+            (2, [False, False, True, False, False, True]),
+            (4, [False] * 5 + [True]),
+        ]:
+            for max_neuron_props, min_neuron_props in [
+                ({}, {}),
+                ({"vth": 0.5, "v": 1.0}, {"bias": 0.5}),
+            ]:
+                with self.subTest(
+                    a_in_time=a_in_time,
+                    expected_spikes=expected_spikes,
+                    max_neuron_props=max_neuron_props,
+                ):
+                    accepted: List[np.ndarray] = [
+                        self.get_accepted_indices(
+                            a_in_time=a_in_time,
+                            expected_spikes=expected_spikes,
+                            max_neuron_props=max_neuron_props,
+                            min_neuron_props=min_neuron_props,
+                            prefilter=prefilter,
+                        )
+                        for prefilter in [False, True]
+                    ]
+                    self.assertGreater(len(accepted[0]), 0)
+                    np.testing.assert_array_equal(accepted[1], accepted[0])
+                nr_of_discarded += len(self.grid) - len(
+                    get_prefiltered_indices(
+                        a_in_time=a_in_time,
+                        expected_spikes=expected_spikes,
+                        grid=self.grid,
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props=min_neuron_props,
+                        start=0,
+                        stop=len(self.grid),
+                    )
+                )
+        self.assertGreater(nr_of_discarded, 0)
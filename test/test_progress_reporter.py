@@ -0,0 +1,123 @@
+"""Tests the throttled progress reports of a search."""
+
+import contextlib
+import io
+import json
+import sys
+from test.grid_fixtures import Grid_test_case
+from typing import Any, Dict, List, Union
+from unittest import mock
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.search import progress_reporter
+from neurondiscovery.search.manage_search import find_non_changing_neurons
+from neurondiscovery.search.progress_reporter import Progress_reporter
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_progress_reporter(Grid_test_case):
+    """Tests the log mode of Progress_reporter."""
+
+    @typechecked
+    def get_log_lines(self, *, log_file: io.StringIO) -> List[Dict[str, Any]]:
+        """Returns the JSON lines that were written to the log file."""
+        return [json.loads(line) for line in log_file.getvalue().splitlines()]
+
+    @typechecked
+    def test_log_is_throttled(self) -> None:
+        """Verifies that the log mode reports at most once per interval, that
+        events are always written, and that close reports the final counts
+        once."""
+        log_file: io.StringIO = io.StringIO()
+        clock: mock.Mock = mock.Mock()
+        with mock.patch.object(progress_reporter, "time", clock):
+            clock.monotonic.return_value = 0.0
+            reporter: Progress_reporter = Progress_reporter(
+                name="static", total=10, mode="log", log_file=log_file
+            )
+            for now, position in [
+                (0.0, 1),
+                (0.5, 2),
+                (0.9, 3),
+                (1.0, 4),
+                (1.5, 5),
+                (1.9, 6),
+            ]:
+                clock.monotonic.return_value = now
+                reporter.update(position=position, nr_found=position // 2)
+            reporter.event("found", nr_of_neurons=1)
+            clock.monotonic.return_value = 2.5
+            reporter.close()
+            reporter.close()
+        self.assertEqual(
+            self.get_log_lines(log_file=log_file),
+            [
+                {
+                    "search": "static",
+                    "event": "progress",
+                    "elapsed_s": elapsed_s,
+                    "position": position,
+                    "total": 10,
+                    "nr_found": position // 2,
+                }
+                for elapsed_s, position in [(0.0, 1), (1.0, 4)]
+            ]
+            + [
+                {
+                    "search": "static",
+                    "event": "found",
+                    "elapsed_s": 1.9,
+                    "nr_of_neurons": 1,
+                },
+                {
+                    "search": "static",
+                    "event": "progress",
+                    "elapsed_s": 2.5,
+                    "position": 6,
+                    "total": 10,
+                    "nr_found": 3,
+                },
+            ],
+        )
+
+    @typechecked
+    def test_search_log(self) -> None:
+        """Verifies that a search in log mode writes JSON lines to stderr,
+        of which the last reports the whole grid and the found neurons, and
+        that a silent search writes nothing."""
+        for progress in ["log", "silent"]:
+            with self.subTest(progress=progress), mock.patch.object(
+                sys, "stderr", io.StringIO()
+            ) as stderr, contextlib.redirect_stdout(io.StringIO()):
+                neuron_dicts: List[
+                    Dict[str, Union[float, int]]
+                ] = find_non_changing_neurons(
+                    neuron_type=self.get_neuron_type(),
+                    overwrite=True,
+                    verbose=True,
+                    options=Search_options(engine="numpy", chunk_size=50),
+                    progress=progress,
+                )
+                log_lines: List[Dict[str, Any]] = self.get_log_lines(
+                    log_file=stderr
+                )
+                if progress == "silent":
+                    self.assertEqual(log_lines, [])
+                    continue
+                self.assertTrue(
+                    all(line["search"] == "static" for line in log_lines)
+                )
+                self.assertEqual(
+                    {
+                        key: log_lines[-1][key]
+                        for key in ["event", "position", "total", "nr_found"]
+                    },
+                    {
+                        "event": "progress",
+                        "position": len(Parameter_grid(disco=self.disco)),
+                        "total": len(Parameter_grid(disco=self.disco)),
+                        "nr_found": len(neuron_dicts),
+                    },
+                )
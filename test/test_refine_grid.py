@@ -0,0 +1,84 @@
+"""Tests the coarse-to-fine search of a Discovery specification."""
+
+import unittest
+from test.grid_fixtures import get_test_disco
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Custom_range import Custom_range
+from neurondiscovery.search.refine_grid import (
+    get_coarse_axis,
+    get_refined_neurons,
+)
+
+
+class Test_refine_grid(unittest.TestCase):
+    """Tests get_refined_neurons."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the test grid with evenly spaced (du, dv, bias, vth)
+        ranges of 2**2+1 values, with exact midpoints."""
+        fine_range: List[float] = [0.0, 0.25, 0.5, 0.75, 1.0]
+        self.disco: Custom_range = get_test_disco(
+            bias_range=fine_range,
+            du_range=fine_range,
+            dv_range=fine_range,
+            vth_range=fine_range,
+        )
+
+    @typechecked
+    def get_neurons(
+        self, *, depth: int, coarse_step: int
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the refined neurons that spike after the input spike."""
+        return get_refined_neurons(
+            a_in_time=2,
+            coarse_step=coarse_step,
+            depth=depth,
+            disco=self.disco,
+            expected_spikes=[False, False, False, True, True, True],
+            max_neuron_props={},
+            min_neuron_props={},
+            verbose=False,
+        )
+
+    @typechecked
+    def test_coarse_axis(self) -> None:
+        """Verifies that the coarse axis takes every step-th value, and keeps
+        the last value."""
+        values: List[float] = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(get_coarse_axis(step=1, values=values), values)
+        self.assertEqual(
+            get_coarse_axis(step=2, values=values), [0.0, 2.0, 4.0, 5.0]
+        )
+        self.assertEqual(get_coarse_axis(step=5, values=values), [0.0, 5.0])
+        self.assertEqual(get_coarse_axis(step=2, values=[1.0]), [1.0])
+
+    @typechecked
+    def test_refined_neurons_on_grid(self) -> None:
+        """Verifies that by default, the refinement starts from a coarse grid,
+        and only finds neurons of the full grid."""
+        full_grid_neurons: List[
+            Dict[str, Union[float, int]]
+        ] = self.get_neurons(depth=0, coarse_step=1)
+        self.assertTrue(full_grid_neurons)
+        coarse_neurons: List[Dict[str, Union[float, int]]] = self.get_neurons(
+            depth=0, coarse_step=4
+        )
+        self.assertLess(len(coarse_neurons), len(full_grid_neurons))
+        refined_neurons: List[
+            Dict[str, Union[float, int]]
+        ] = get_refined_neurons(
+            a_in_time=2,
+            depth=2,
+            disco=self.disco,
+            expected_spikes=[False, False, False, True, True, True],
+            max_neuron_props={},
+            min_neuron_props={},
+            verbose=False,
+        )
+        self.assertTrue(refined_neurons)
+        for neuron_dict in refined_neurons:
+            self.assertIn(neuron_dict, full_grid_neurons)
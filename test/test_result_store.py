@@ -0,0 +1,78 @@
+"""Tests querying the found neurons from the result store."""
+
+from test.grid_fixtures import Grid_test_case
+from typing import Any, List, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.result_store import Result_store
+
+
+class Test_result_store(Grid_test_case):
+    """Tests Result_store.iter_neuron_dicts."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Stores neuron dicts with three vth values of a neuron type in an
+        in-memory store."""
+        super().setUp()
+        self.store: Result_store = Result_store(":memory:")
+        self.store.insert(
+            neuron_dicts=[
+                {
+                    "a_in": 1.0,
+                    "a_in_time": 2,
+                    "bias": 0.0,
+                    "du": 0.5,
+                    "dv": 0.5,
+                    "vth": vth,
+                    "weight": 1,
+                }
+                for vth in [1.0, 5.0, 9.0]
+            ],
+            neuron_type=self.get_neuron_type(),
+            search="static",
+        )
+
+    @typechecked
+    def tearDown(self) -> None:
+        """Closes the store and removes the temporary directory."""
+        self.store.close()
+        super().tearDown()
+
+    @typechecked
+    def get_vths(self, **query: Any) -> List[Union[float, int, str]]:
+        """Returns the vth of the neurons that match the query."""
+        return [
+            neuron_dict["vth"]
+            for neuron_dict in self.store.iter_neuron_dicts(**query)
+        ]
+
+    @typechecked
+    def test_inclusive_bounds(self) -> None:
+        """Verifies that the max and min neuron props are inclusive."""
+        self.assertEqual(
+            self.get_vths(max_neuron_props={"vth": 5}), [1.0, 5.0]
+        )
+        self.assertEqual(
+            self.get_vths(min_neuron_props={"vth": 5}), [5.0, 9.0]
+        )
+
+    @typechecked
+    def test_conditions(self) -> None:
+        """Verifies that the conditions apply their own operator, together
+        with the bounds."""
+        self.assertEqual(self.get_vths(conditions=[("vth", "<", 5)]), [1.0])
+        self.assertEqual(
+            self.get_vths(conditions=[("vth", "!=", 5)]), [1.0, 9.0]
+        )
+        self.assertEqual(
+            self.get_vths(
+                min_neuron_props={"vth": 5}, conditions=[("vth", ">", 5)]
+            ),
+            [9.0],
+        )
+        with self.assertRaises(NotImplementedError):
+            self.get_vths(conditions=[("vth", "LIKE", 5)])
+        with self.assertRaises(ValueError):
+            self.get_vths(conditions=[("property", "=", 5)])
@@ -0,0 +1,121 @@
+"""Tests the metrics that a static neuron search exports."""
+
+import json
+from test.grid_fixtures import Grid_test_case
+from typing import Any, Dict, List, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import Parameter_grid
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.search.manage_search import find_non_changing_neurons
+from neurondiscovery.search.search_metrics import Search_metrics
+from neurondiscovery.search.search_options import Search_options
+
+
+class Test_search_metrics(Grid_test_case):
+    """Tests the JSON and Prometheus export of Search_metrics."""
+
+    @typechecked
+    def test_prometheus_histogram(self) -> None:
+        """Verifies the cumulative buckets, sum and count of the rejection
+        histogram of hand-recorded rejections."""
+        metrics: Search_metrics = Search_metrics()
+        for reason, t in [
+            ("spike_mismatch", 1),
+            ("spike_mismatch", 1),
+            ("spike_mismatch", 3),
+            ("property_bounds", 2),
+        ]:
+            metrics.reject(reason=reason, t=t)
+        metrics.accept(4)
+        lines: List[str] = metrics.to_prometheus().splitlines()
+        for expected_line in [
+            'neurondiscovery_candidates_total{outcome="accepted"} 4',
+            'neurondiscovery_rejection_timestep_bucket{reason="spike_mismatch"'
+            + ',le="0"} 0',
+            'neurondiscovery_rejection_timestep_bucket{reason="spike_mismatch"'
+            + ',le="2"} 2',
+            'neurondiscovery_rejection_timestep_bucket{reason="spike_mismatch"'
+            + ',le="+Inf"} 3',
+            'neurondiscovery_rejection_timestep_sum{reason="spike_mismatch"} 5',
+            'neurondiscovery_rejection_timestep_count{reason="spike_mismatch"}'
+            + " 3",
+            "neurondiscovery_rejection_timestep_bucket"
+            + '{reason="property_bounds",le="1"} 0',
+            "neurondiscovery_rejection_timestep_bucket"
+            + '{reason="property_bounds",le="3"} 1',
+        ]:
+            self.assertIn(expected_line, lines)
+        self.assertEqual(
+            metrics.to_dict()["rejections"],
+            {"spike_mismatch": {"1": 2, "3": 1}, "property_bounds": {"2": 1}},
+        )
+
+    @typechecked
+    def test_search_accounts_for_every_candidate(self) -> None:
+        """Verifies that the exported metrics of a search account for every
+        candidate of the grid once, and that the Prometheus textfile holds
+        the totals of the JSON file."""
+        neuron_type: Neuron_type = self.get_neuron_type()
+        grid_size: int = len(Parameter_grid(disco=self.disco))
+        for engine in ["numpy", "networkx", "tree"]:
+            for canonicalize in [False, True]:
+                with self.subTest(engine=engine, canonicalize=canonicalize):
+                    neuron_dicts: List[
+                        Dict[str, Union[float, int]]
+                    ] = find_non_changing_neurons(
+                        neuron_type=neuron_type,
+                        overwrite=True,
+                        verbose=False,
+                        options=Search_options(
+                            engine=engine, canonicalize=canonicalize
+                        ),
+                        export_metrics=True,
+                    )
+                    with open(
+                        f"{neuron_type.type_dir}/metrics.json",
+                        encoding="utf-8",
+                    ) as json_file:
+                        exported: Dict[str, Any] = json.load(json_file)
+                    with open(
+                        f"{neuron_type.type_dir}/metrics.prom",
+                        encoding="utf-8",
+                    ) as prometheus_file:
+                        lines: List[str] = prometheus_file.read().splitlines()
+                    nr_rejected: Dict[str, int] = {
+                        reason: sum(histogram.values())
+                        for reason, histogram in exported["rejections"].items()
+                    }
+                    self.assertEqual(
+                        exported["nr_accepted"], len(neuron_dicts)
+                    )
+                    self.assertGreater(exported["nr_prefiltered"], 0)
+                    self.assertEqual(
+                        exported["nr_deduplicated"] > 0, canonicalize
+                    )
+                    if engine == "tree":
+                        # The tree engine prunes branches of candidates, so
+                        # it does not record their rejections.
+                        self.assertEqual(sum(nr_rejected.values()), 0)
+                    else:
+                        self.assertEqual(
+                            exported["nr_accepted"]
+                            + exported["nr_prefiltered"]
+                            + exported["nr_deduplicated"]
+                            + sum(nr_rejected.values()),
+                            grid_size,
+                        )
+                    for outcome in ["accepted", "prefiltered", "deduplicated"]:
+                        self.assertIn(
+                            "neurondiscovery_candidates_total"
+                            + f'{{outcome="{outcome}"}} '
+                            + f"{exported[f'nr_{outcome}']}",
+                            lines,
+                        )
+                    for reason, count in nr_rejected.items():
+                        self.assertIn(
+                            "neurondiscovery_rejection_timestep_count"
+                            + f'{{reason="{reason}"}} {count}',
+                            lines,
+                        )
@@ -0,0 +1,100 @@
+"""Tests dividing the static neuron search over shards, and merging them."""
+
+import os
+from test.grid_fixtures import Grid_test_case
+from typing import Dict, List, Optional, Tuple, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.import_export import (
+    load_dict_from_file,
+    write_dicts_to_stream,
+)
+from neurondiscovery.neuron_types.Neuron_type import Neuron_type
+from neurondiscovery.search.manage_search import find_non_changing_neurons
+from neurondiscovery.search.search_options import Search_options
+from neurondiscovery.search.shards import get_shard_filepath, merge_shards
+
+
+class Test_shards(Grid_test_case):
+    """Tests merge_shards."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates a neuron type on the test grid, and finds its static
+        neurons without shards."""
+        super().setUp()
+        self.nr_of_shards: int = 3
+        self.neuron_type: Neuron_type = self.get_neuron_type()
+        self.static_neurons: List[
+            Dict[str, Union[float, int]]
+        ] = self.find_static_neurons()
+
+    @typechecked
+    def find_static_neurons(
+        self, shard: Optional[Tuple[int, int]] = None, engine: str = "numpy"
+    ) -> List[Dict[str, Union[float, int]]]:
+        """Returns the static neurons of the neuron type, or of a shard, found
+        with the engine."""
+        return find_non_changing_neurons(
+            neuron_type=self.neuron_type,
+            overwrite=True,
+            verbose=False,
+            options=Search_options(engine=engine),
+            shard=shard,
+        )
+
+    @typechecked
+    def test_merge_shards(self) -> None:
+        """Verifies that the merged shards equal the search without shards,
+        regardless of the order in which the shards complete."""
+        self.assertNotEqual(self.static_neurons, [])
+        for shard in reversed(range(self.nr_of_shards)):
+            self.find_static_neurons(shard=(shard, self.nr_of_shards))
+        self.assertEqual(
+            merge_shards(neuron_type=self.neuron_type), self.static_neurons
+        )
+        self.assertEqual(
+            load_dict_from_file(f"{self.neuron_type.type_dir}/static.jsonl"),
+            self.static_neurons,
+        )
+        self.assertFalse(
+            os.path.exists(f"{self.neuron_type.type_dir}/static.json")
+        )
+
+    @typechecked
+    def test_incomplete_shards(self) -> None:
+        """Verifies that a missing, tampered or foreign shard, or a shard of
+        another engine, raises an error."""
+        for shard in range(self.nr_of_shards):
+            self.find_static_neurons(shard=(shard, self.nr_of_shards))
+        os.remove(
+            get_shard_filepath(
+                neuron_type=self.neuron_type, shard=1, suffix="manifest.json"
+            )
+        )
+        with self.assertRaises(FileNotFoundError):
+            merge_shards(neuron_type=self.neuron_type)
+
+        self.find_static_neurons(shard=(1, self.nr_of_shards))
+        write_dicts_to_stream(
+            get_shard_filepath(
+                neuron_type=self.neuron_type, shard=1, suffix="jsonl"
+            ),
+            [],
+        )
+        with self.assertRaises(LookupError):
+            merge_shards(neuron_type=self.neuron_type)
+
+        self.find_static_neurons(shard=(1, self.nr_of_shards - 1))
+        with self.assertRaises(ValueError):
+            merge_shards(neuron_type=self.neuron_type)
+
+        # A shard of the fixed_point engine belongs to a different search.
+        self.find_static_neurons(shard=(1, self.nr_of_shards))
+        merge_shards(neuron_type=self.neuron_type)
+        self.find_static_neurons(
+            shard=(1, self.nr_of_shards), engine="fixed_point"
+        )
+        with self.assertRaises(ValueError):
+            merge_shards(neuron_type=self.neuron_type)
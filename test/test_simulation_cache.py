@@ -0,0 +1,125 @@
+"""Tests the cache of single parameter point simulations."""
+
+import unittest
+from typing import Dict, List, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.search.batch_simulation import no_mismatch
+from neurondiscovery.search.simulation_cache import (
+    Simulation_cache,
+    simulated_properties,
+)
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
+)
+
+
+class Test_simulation_cache(unittest.TestCase):
+    """Tests the Simulation_cache object."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the parameter point, its expected pattern and the
+        bounds."""
+        # v reaches the vth of 1 at t=2, after which the neuron resets.
+        self.neuron_dict: Dict[str, Union[float, int]] = {
+            "a_in": 0.0,
+            "bias": 0.5,
+            "du": 0.0,
+            "dv": 0.0,
+            "vth": 0.9,
+            "weight": 0,
+        }
+        self.pattern: Spike_pattern = get_spike_pattern(
+            spikes=[False, False, True, False, True]
+        )
+        self.bounds: Dict[str, Dict[str, Union[float, int]]] = {
+            "max_neuron_props": {"vth": 100},
+            "min_neuron_props": {"vth": -100},
+        }
+
+    @typechecked
+    def test_outcome_is_cached(self) -> None:
+        """Verifies the outcome of a parameter point, and that a second lookup,
+        also of a point that only differs by a rounding error, is a hit."""
+        cache: Simulation_cache = Simulation_cache()
+        outcome = cache.get_outcome(
+            a_in_time=0,
+            expected_pattern=self.pattern,
+            neuron_dict=self.neuron_dict,
+            **self.bounds,
+        )
+        self.assertEqual(outcome, (True, None))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(
+            cache.get_outcome(
+                a_in_time=0,
+                expected_pattern=self.pattern,
+                neuron_dict={**self.neuron_dict, "bias": 0.2 + 0.3},
+                **self.bounds,
+            ),
+            outcome,
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # A different expected pattern is a different entry.
+        self.assertEqual(
+            cache.get_outcome(
+                a_in_time=0,
+                expected_pattern=self.pattern.shift(1),
+                neuron_dict=self.neuron_dict,
+                **self.bounds,
+            ),
+            (False, 2),
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    @typechecked
+    def test_batch_deduplication(self) -> None:
+        """Verifies that duplicate points in a batch are simulated once, and
+        yield the same outcome."""
+        cache: Simulation_cache = Simulation_cache()
+        rows: List[Dict[str, Union[float, int]]] = [
+            self.neuron_dict,
+            {**self.neuron_dict, "vth": 0.4},
+            self.neuron_dict,
+        ]
+        first_mismatches: np.ndarray = cache.get_first_mismatches(
+            a_in_time=0,
+            neuron_props={
+                attr: np.asarray([row[attr] for row in rows], dtype=np.float64)
+                for attr in simulated_properties
+            },
+            pattern_indices=np.zeros(len(rows), dtype=np.int64),
+            patterns=[self.pattern],
+            **self.bounds,
+        )
+        self.assertEqual(
+            first_mismatches.tolist(), [no_mismatch, 1, no_mismatch]
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    @typechecked
+    def test_least_recently_used_entry_is_dropped(self) -> None:
+        """Verifies that the cache holds at most max_size entries, and drops
+        the least recently used one."""
+        cache: Simulation_cache = Simulation_cache(max_size=2)
+        for vth in [0.9, 0.4, 0.9, 0.3]:
+            cache.get_outcome(
+                a_in_time=0,
+                expected_pattern=self.pattern,
+                neuron_dict={**self.neuron_dict, "vth": vth},
+                **self.bounds,
+            )
+        self.assertEqual(len(cache.outcomes), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        cache.get_outcome(
+            a_in_time=0,
+            expected_pattern=self.pattern,
+            neuron_dict=self.neuron_dict,
+            **self.bounds,
+        )
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
@@ -0,0 +1,131 @@
+"""Tests finding the neurons of a spike pattern in a spike archive instead of
+simulating the grid."""
+
+from test.grid_fixtures import Grid_test_case, get_test_disco
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from neurondiscovery.search.batch_simulation import no_mismatch
+from neurondiscovery.search.discover import get_satisfactory_neurons
+from neurondiscovery.search.search_options import Search_options
+from neurondiscovery.search.spike_archive import (
+    Spike_archive,
+    create_spike_archive,
+    get_archived_neurons,
+)
+
+
+class Test_spike_archive(Grid_test_case):
+    """Tests get_archived_neurons and Spike_archive.verify_compatible."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Archives 8 timesteps of the test grid, with an input spike at t=2,
+        with the extremes, and with a bound on u that the candidates with a
+        weight and a_in of 1 and a du of 0 leave."""
+        super().setUp()
+        self.archive_bounds: Dict[str, Dict[str, Union[float, int]]] = {
+            "max_neuron_props": {"u": 2.0},
+            "min_neuron_props": {},
+        }
+        self.archive: Spike_archive = create_spike_archive(
+            a_in_time=2,
+            archive_dir=f"{self.tmp_dir.name}/archive",
+            disco=self.disco,
+            nr_of_timesteps=8,
+            extremes=True,
+            **self.archive_bounds,
+        )
+
+    @typechecked
+    def assert_equals_numpy_engine(
+        self,
+        *,
+        expected_spikes: List[bool],
+        max_neuron_props: Dict[str, Union[float, int]],
+        min_neuron_props: Dict[str, Union[float, int]],
+    ) -> int:
+        """Asserts that the archive finds the neurons of the numpy engine, and
+        returns their nr."""
+        numpy_neurons: List[
+            Dict[str, Union[float, int]]
+        ] = get_satisfactory_neurons(
+            a_in_time=2,
+            disco=self.disco,
+            expected_spikes=expected_spikes,
+            max_neuron_props=max_neuron_props,
+            min_neuron_props=min_neuron_props,
+            verbose=False,
+            options=Search_options(engine="numpy"),
+        )
+        self.assertEqual(
+            get_archived_neurons(
+                a_in_time=2,
+                archive=self.archive,
+                disco=self.disco,
+                expected_spikes=expected_spikes,
+                max_neuron_props=max_neuron_props,
+                min_neuron_props=min_neuron_props,
+            ),
+            numpy_neurons,
+        )
+        return len(numpy_neurons)
+
+    @typechecked
+    def test_equals_numpy_engine(self) -> None:
+        """Verifies that the archive finds the neurons of the numpy engine,
+        for shorter patterns with the bounds of the archive, and for patterns
+        of all archived timesteps with other bounds, via the extremes."""
+        self.assertTrue(
+            (self.archive.first_out_of_bounds != no_mismatch).any()
+        )
+        other_bounds: List[Dict[str, Dict[str, Union[float, int]]]] = [
+            {
+                "max_neuron_props": {"u": 1.0, "vth": 0.5},
+                "min_neuron_props": {"u": -0.5, "v": 0.0},
+            },
+            {"max_neuron_props": {}, "min_neuron_props": {}},
+        ]
+        nr_of_neurons: int = 0
+        for expected_spikes, bounds in [
+            ([False, False, False, True, True, True], [self.archive_bounds]),
+            ([False, False, False, True, False, False], [self.archive_bounds]),
+        ] + [
+            (expected_spikes, [self.archive_bounds] + other_bounds)
+            for expected_spikes in [
+                [False, False, False, True, True, True, True, True],
+                [False, False, False, True, False, False, True, False],
+                [False] * 8,
+            ]
+        ]:
+            for some_bounds in bounds:
+                with self.subTest(
+                    expected_spikes=expected_spikes, bounds=some_bounds
+                ):
+                    nr_of_neurons += self.assert_equals_numpy_engine(
+                        expected_spikes=expected_spikes, **some_bounds
+                    )
+        self.assertGreater(nr_of_neurons, 0)
+
+    @typechecked
+    def test_incompatible_search(self) -> None:
+        """Verifies that a search with another grid or a_in_time, a longer
+        pattern, or other bounds for a shorter pattern, raises an error."""
+        expected_spikes: List[bool] = [False, False, False, True, True, True]
+        for a_in_time, disco, spikes, max_neuron_props in [
+            (2, get_test_disco(vth_range=[1.0]), expected_spikes, {"u": 2.0}),
+            (3, self.disco, expected_spikes, {"u": 2.0}),
+            (2, self.disco, expected_spikes + [True] * 3, {"u": 2.0}),
+            (2, self.disco, expected_spikes, {"u": 1.0}),
+        ]:
+            with self.subTest(a_in_time=a_in_time, spikes=spikes):
+                with self.assertRaises(ValueError):
+                    get_archived_neurons(
+                        a_in_time=a_in_time,
+                        archive=self.archive,
+                        disco=disco,
+                        expected_spikes=spikes,
+                        max_neuron_props=max_neuron_props,
+                        min_neuron_props={},
+                    )
@@ -0,0 +1,107 @@
+"""Tests the queries of the index over the spike trains of a spike archive."""
+
+from test.grid_fixtures import Grid_test_case
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from neurondiscovery.grid_settings.Parameter_grid import (
+    Parameter_grid,
+    grid_properties,
+)
+from neurondiscovery.search.batch_simulation import no_mismatch
+from neurondiscovery.search.spike_archive import (
+    Spike_archive,
+    create_spike_archive,
+)
+from neurondiscovery.search.spike_index import Spike_index
+
+
+class Test_spike_index(Grid_test_case):
+    """Tests Spike_index against a brute-force scan of the archive."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Archives 10 timesteps of the test grid, of which the candidates
+        that leave the u bound are not indexed, and indexes 9 of them."""
+        super().setUp()
+        self.archive: Spike_archive = create_spike_archive(
+            a_in_time=2,
+            archive_dir=f"{self.tmp_dir.name}/archive",
+            disco=self.disco,
+            max_neuron_props={"u": 2.0},
+            min_neuron_props={},
+            nr_of_timesteps=10,
+        )
+        self.grid: Parameter_grid = Parameter_grid(disco=self.disco)
+        self.index: Spike_index = Spike_index(
+            archive=self.archive, disco=self.disco, nr_of_timesteps=9
+        )
+        self.spike_trains: np.ndarray = np.unpackbits(
+            self.archive.spike_trains, axis=1, count=9, bitorder="little"
+        ).astype(bool)
+        self.indexed: np.ndarray = (
+            self.archive.first_out_of_bounds == no_mismatch
+        ) | (self.archive.first_out_of_bounds >= 9)
+
+    @typechecked
+    def get_index(self, *, neuron_dict: Dict[str, Union[float, int]]) -> int:
+        """Returns the grid index of a neuron dict."""
+        return self.grid.get_index(
+            tuple(
+                neuron_dict[the_property] for the_property in grid_properties
+            )
+        )
+
+    @typechecked
+    def get_distances(self, *, spikes: List[bool]) -> np.ndarray:
+        """Returns the Hamming distance of each candidate to the spikes."""
+        return (self.spike_trains != np.asarray(spikes)).sum(axis=1)
+
+    @typechecked
+    def test_exact(self) -> None:
+        """Verifies that the exact query returns the indexed candidates with
+        the spikes, in grid order."""
+        self.assertFalse(self.indexed.all())
+        for train in np.unique(self.spike_trains[self.indexed], axis=0):
+            spikes: List[bool] = train.tolist()
+            self.assertEqual(
+                [
+                    self.get_index(neuron_dict=neuron_dict)
+                    for neuron_dict in self.index.get_exact(spikes=spikes)
+                ],
+                np.flatnonzero(
+                    self.indexed & (self.get_distances(spikes=spikes) == 0)
+                ).tolist(),
+            )
+
+    @typechecked
+    def test_nearest_equals_brute_force(self) -> None:
+        """Verifies that the nearest candidates have the k smallest Hamming
+        distances of a brute-force scan, with their own distance."""
+        rng: np.random.Generator = np.random.default_rng(seed=7)
+        for query in range(20):
+            spikes: List[bool] = [
+                bool(spike) for spike in rng.random(9) < query / 20
+            ]
+            distances: np.ndarray = self.get_distances(spikes=spikes)
+            for k in [1, 5, 50]:
+                with self.subTest(spikes=spikes, k=k):
+                    nearest: List[
+                        Tuple[int, Dict[str, Union[float, int]]]
+                    ] = self.index.get_nearest(k=k, spikes=spikes)
+                    indices: List[int] = [
+                        self.get_index(neuron_dict=neuron_dict)
+                        for _, neuron_dict in nearest
+                    ]
+                    self.assertEqual(len(set(indices)), k)
+                    self.assertTrue(self.indexed[indices].all())
+                    self.assertEqual(
+                        [distance for distance, _ in nearest],
+                        distances[indices].tolist(),
+                    )
+                    self.assertEqual(
+                        [distance for distance, _ in nearest],
+                        np.sort(distances[self.indexed])[:k].tolist(),
+                    )
@@ -0,0 +1,78 @@
+"""Tests the integer representation of spike trains."""
+
+import unittest
+from typing import List
+
+from typeguard import typechecked
+
+from neurondiscovery.spike_patterns.Spike_pattern import (
+    Spike_pattern,
+    get_spike_pattern,
+)
+
+
+class Test_spike_pattern(unittest.TestCase):
+    """Tests the Spike_pattern object."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Creates the spike pattern of the spikes."""
+        self.spikes: List[bool] = [False, True, True, False, False, True]
+        self.pattern: Spike_pattern = get_spike_pattern(spikes=self.spikes)
+
+    @typechecked
+    def test_round_trip(self) -> None:
+        """Verifies that a spike pattern returns the spikes it was created
+        from."""
+        self.assertEqual(self.pattern.to_list(), self.spikes)
+        self.assertEqual(
+            [self.pattern[t] for t in range(len(self.pattern))], self.spikes
+        )
+        self.assertEqual(self.pattern.to_string(), "011001")
+        self.assertEqual(get_spike_pattern(spikes=[]).to_list(), [])
+        with self.assertRaises(IndexError):
+            self.pattern[len(self.spikes)]  # pylint: disable=W0104
+
+    @typechecked
+    def test_equality(self) -> None:
+        """Verifies that spike patterns are equal, and hash equally, if and
+        only if their spikes and lengths are equal."""
+        self.assertEqual(self.pattern, get_spike_pattern(spikes=self.spikes))
+        self.assertEqual(
+            hash(self.pattern), hash(get_spike_pattern(spikes=self.spikes))
+        )
+        self.assertNotEqual(
+            self.pattern, get_spike_pattern(spikes=self.spikes + [False])
+        )
+
+    @typechecked
+    def test_first_mismatch(self) -> None:
+        """Verifies the first timestep at which spike patterns differ."""
+        self.assertIsNone(self.pattern.get_first_mismatch(self.pattern))
+        self.assertEqual(
+            self.pattern.get_first_mismatch(
+                get_spike_pattern(spikes=[False, True, False, False])
+            ),
+            2,
+        )
+        self.assertEqual(
+            self.pattern.get_first_mismatch(
+                get_spike_pattern(spikes=self.spikes[:4])
+            ),
+            4,
+        )
+
+    @typechecked
+    def test_shift(self) -> None:
+        """Verifies that shifting delays or advances the spikes, and keeps the
+        length."""
+        self.assertEqual(
+            self.pattern.shift(2).to_list(),
+            [False, False, False, True, True, False],
+        )
+        self.assertEqual(
+            self.pattern.shift(-1).to_list(),
+            [True, True, False, False, True, False],
+        )
+        with self.assertRaises(ValueError):
+            Spike_pattern(bits=1 << 3, length=3)
@@ -0,0 +1,75 @@
+"""Tests switching the type checks of the hot path functions off."""
+
+import os
+import subprocess  # nosec
+import sys
+import unittest
+from typing import Dict
+
+from typeguard import typechecked
+
+from neurondiscovery.type_checks import (
+    child_process_hot_path_type_checks,
+    hot_path_type_checks_enabled,
+    hot_path_type_checks_env_var,
+    hot_path_typechecked,
+)
+
+# Prints whether the hot path functions of the batch engine and of the
+# networkx engine are wrapped by typechecked, after their import.
+wrapped_check: str = """
+from neurondiscovery.search.batch_simulation import simulate_batch_timestep
+from neurondiscovery.search.discover import simulate_neuron
+print(all(
+    hasattr(func, "__wrapped__")
+    for func in [simulate_batch_timestep, simulate_neuron]
+))
+"""
+
+
+class Test_type_checks(unittest.TestCase):
+    """Tests hot_path_typechecked and the environment variable."""
+
+    @typechecked
+    def setUp(self) -> None:
+        """Stores the environment, of which the tests change the variable."""
+        self.previous: Dict[str, str] = dict(os.environ)
+
+    @typechecked
+    def tearDown(self) -> None:
+        """Restores the environment."""
+        os.environ.clear()
+        os.environ.update(self.previous)
+
+    @typechecked
+    def test_decorator(self) -> None:
+        """Verifies that the decorator returns the function itself if the
+        environment variable is 0, and a type checked function otherwise."""
+
+        def get_double(value: int) -> int:
+            return 2 * value
+
+        os.environ[hot_path_type_checks_env_var] = "0"
+        self.assertIs(hot_path_typechecked(get_double), get_double)
+        self.assertEqual(hot_path_typechecked(get_double)("a"), "aa")
+        os.environ[hot_path_type_checks_env_var] = "1"
+        with self.assertRaises(TypeError):
+            hot_path_typechecked(get_double)("a")
+
+    @typechecked
+    def test_imported_modules(self) -> None:
+        """Verifies that the hot path functions of a process that imports the
+        search modules with the environment variable at 0, are not wrapped,
+        and that the context manager restores the enabled type checks of
+        this process."""
+        for enabled in [False, True]:
+            with self.subTest(enabled=enabled):
+                with child_process_hot_path_type_checks(enabled=enabled):
+                    output: str = subprocess.run(  # nosec
+                        [sys.executable, "-c", wrapped_check],
+                        capture_output=True,
+                        check=True,
+                        text=True,
+                    ).stdout
+                self.assertEqual(output.strip(), str(enabled))
+                self.assertTrue(hot_path_type_checks_enabled())